@@ -0,0 +1,129 @@
+"""
+Movement benchmark: batched NumPy movement against the per-unit Python update.
+
+Every unit walks between random waypoints; when it reaches one it gets the
+next, like a unit following its path. Reports milliseconds per tick and whether
+the tick fits the budget of the target rate. The steered run packs the units
+into a crowd (about one unit per two tiles) with separation and obstacle
+avoidance on.
+
+Run from the repository root:
+    python -m Benchmarks.movement_benchmark
+    python -m Benchmarks.movement_benchmark --units 10000 --hz 30
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.AI.pathfinding import PassabilityGrid
+from Core.Game.movement_system import MovementSystem
+from Core.Game.steering import Steering
+from Core.Utils.directions import EIGHT_DIRECTIONS
+
+
+class ScalarUnit:
+    """The per-unit update Unit.move_toward_target used to do."""
+
+    def __init__(self, x, y, speed):
+        self.x = x
+        self.y = y
+        self.speed = speed
+        self.target = (x, y)
+        self.direction = 0
+
+    def update(self, dt):
+        dx = self.target[0] - self.x
+        dy = self.target[1] - self.y
+        distance = math.sqrt(dx * dx + dy * dy)
+        if distance <= self.speed * dt:
+            self.x, self.y = self.target
+            return True
+        self.x += dx / distance * self.speed * dt
+        self.y += dy / distance * self.speed * dt
+        angle = (math.degrees(math.atan2(-dy, dx)) + 90 + 360) % 360
+        self.direction = min(EIGHT_DIRECTIONS, key=lambda d: min(abs(d - angle), 360 - abs(d - angle)))
+        return False
+
+
+def random_waypoint(rng, x, y):
+    """One of the eight neighbouring tiles, like a path step."""
+    return x + rng.choice((-1, 0, 1)), y + rng.choice((-1, 1))
+
+
+def run_batched(units, ticks, dt, seed, steered=False):
+    rng = random.Random(seed)
+    if steered:
+        side = int(math.sqrt(units * 2)) + 2
+        system = MovementSystem(steering=Steering(PassabilityGrid(side + 2, side + 2)))
+    else:
+        side = 1000
+        system = MovementSystem()
+    entities = []
+    for i in range(units):
+        entity = {'id': i, 'x': rng.randrange(2, side - 1), 'y': rng.randrange(2, side - 1)}
+        system.add(entity, entity['x'], entity['y'], 4.0)
+        entity['x'], entity['y'] = random_waypoint(rng, entity['x'], entity['y'])
+        system.set_waypoint(entity, entity['x'], entity['y'])
+        entities.append(entity)
+
+    arrivals = 0
+    start_time = time.perf_counter()
+    for _ in range(ticks):
+        arrived, turned = system.step(dt)
+        for entity, direction in turned:
+            entity['direction'] = direction
+        for entity in arrived:
+            x, y = random_waypoint(rng, entity['x'], entity['y'])
+            if steered:
+                # Stay inside the crowd area
+                x, y = min(max(x, 2), side - 2), min(max(y, 2), side - 2)
+            entity['x'], entity['y'] = x, y
+            system.set_waypoint(entity, x, y)
+        arrivals += len(arrived)
+    return (time.perf_counter() - start_time) * 1000.0 / ticks, arrivals
+
+
+def run_scalar(units, ticks, dt, seed):
+    rng = random.Random(seed)
+    scalar_units = []
+    for _ in range(units):
+        unit = ScalarUnit(rng.randrange(1000), rng.randrange(1000), 4.0)
+        unit.target = random_waypoint(rng, unit.x, unit.y)
+        scalar_units.append(unit)
+
+    arrivals = 0
+    start_time = time.perf_counter()
+    for _ in range(ticks):
+        for unit in scalar_units:
+            if unit.update(dt):
+                unit.target = random_waypoint(rng, unit.x, unit.y)
+                arrivals += 1
+    return (time.perf_counter() - start_time) * 1000.0 / ticks, arrivals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Unit movement benchmark")
+    parser.add_argument("--units", type=int, default=5000, help="moving units")
+    parser.add_argument("--hz", type=float, default=30.0, help="simulation rate")
+    parser.add_argument("--ticks", type=int, default=150, help="ticks to run")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    args = parser.parse_args()
+
+    dt = 1.0 / args.hz
+    budget_ms = 1000.0 / args.hz
+    print(f"{args.units} units, {args.hz:.0f} Hz (budget {budget_ms:.1f} ms per tick)")
+    print(f"{'system':<12}{'ms/tick':>10}{'arrivals':>10}{'budget':>9}")
+    runs = (("batched", run_batched), ("steered", lambda *a: run_batched(*a, steered=True)), ("per-unit", run_scalar))
+    for name, run in runs:
+        tick_ms, arrivals = run(args.units, args.ticks, dt, args.seed)
+        print(f"{name:<12}{tick_ms:>10.2f}{arrivals:>10}{tick_ms * 100.0 / budget_ms:>8.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Pathfinding benchmark: A* and hierarchical (HPA*) queries per second, group
+moves with a shared flow field, and connectivity regions, on the shipped map and
+on synthetic maps.
+
+Run from the repository root:
+    python -m Benchmarks.pathfinding_benchmark
+    python -m Benchmarks.pathfinding_benchmark --queries 500 --size 1024 --seed 7
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.AI.pathfinding import PassabilityGrid, PathFinder
+from Core.AI.hierarchical_pathfinding import HierarchicalPathFinder
+from Core.AI.flow_field import FlowField
+from Core.AI.connectivity import ConnectivityMap
+
+
+def load_shipped_grid() -> PassabilityGrid:
+    """Build the passability grid of Maps/Battle/map.map the same way the game does."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    from Core.Game.game import Game
+
+    pygame.init()
+    screen = pygame.display.set_mode((1024, 768))
+    game = Game(screen)
+    return game.passability
+
+
+def build_synthetic_grid(size: int, density: float, seed: int) -> PassabilityGrid:
+    """
+    Build a square map with random water blobs and scattered single-tile obstacles.
+
+    Args:
+        size: Width and height in tiles
+        density: Fraction of tiles covered by scattered obstacles
+        seed: Random seed
+    """
+    rng = random.Random(seed)
+    map_data = [[0] * size for _ in range(size)]
+    # Lakes: water tile index 4
+    for _ in range(size * size // 2000):
+        cx, cy = rng.randrange(size), rng.randrange(size)
+        radius = rng.randint(3, 12)
+        for y in range(max(0, cy - radius), min(size, cy + radius + 1)):
+            for x in range(max(0, cx - radius), min(size, cx + radius + 1)):
+                if (x - cx) ** 2 + (y - cy) ** 2 <= radius * radius:
+                    map_data[y][x] = 4
+    # Trees and rocks
+    for _ in range(int(size * size * density)):
+        map_data[rng.randrange(size)][rng.randrange(size)] = 6
+    return PassabilityGrid.from_map(map_data)
+
+
+def random_queries(grid: PassabilityGrid, count: int, seed: int) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """Pick random pairs of walkable tiles."""
+    rng = random.Random(seed)
+    walkable = [(i % grid.width, i // grid.width) for i, cell in enumerate(grid.cells) if cell]
+    return [(rng.choice(walkable), rng.choice(walkable)) for _ in range(count)]
+
+
+def run_queries(name: str, grid: PassabilityGrid, count: int, seed: int) -> None:
+    pathfinder = PathFinder(grid)
+    queries = random_queries(grid, count, seed)
+    found = 0
+    expanded = 0
+    waypoints = 0
+
+    start_time = time.perf_counter()
+    for start, goal in queries:
+        path = pathfinder.find_path(start, goal)
+        expanded += pathfinder.last_expanded
+        if path:
+            found += 1
+            waypoints += len(path)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"{name:<24}{grid.width}x{grid.height:<6}{count:>8}{count / elapsed:>10.1f}"
+          f"{elapsed * 1000.0 / count:>10.2f}{expanded / count:>12.0f}{found:>8}"
+          f"{(waypoints / found if found else 0):>11.1f}")
+
+
+def run_hierarchical(name: str, grid: PassabilityGrid, count: int, seed: int) -> None:
+    """Time cluster graph construction, plans, full refinement and incremental updates."""
+    start_time = time.perf_counter()
+    finder = HierarchicalPathFinder(grid)
+    build_ms = (time.perf_counter() - start_time) * 1000.0
+
+    # The first pass also builds the clusters it walks through; the second runs on a warm graph
+    start_time = time.perf_counter()
+    for start, goal in random_queries(grid, count, seed + 1):
+        finder.find_path(start, goal)
+    cold_elapsed = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    finder.build_all_clusters()
+    warm_ms = (time.perf_counter() - start_time) * 1000.0
+
+    queries = random_queries(grid, count, seed)
+    start_time = time.perf_counter()
+    plans = [finder.find_path(start, goal) for start, goal in queries]
+    plan_elapsed = time.perf_counter() - start_time
+
+    # Refining every hop is what a unit does over its whole walk, spread over many frames
+    start_time = time.perf_counter()
+    for plan in plans:
+        while plan is not None and not plan.is_finished():
+            if plan.next_steps() is None:
+                break
+    refine_elapsed = time.perf_counter() - start_time
+
+    # Toggle random tiles and time the incremental cluster rebuild
+    rng = random.Random(seed)
+    update_elapsed = 0.0
+    rebuilt = 0
+    updates = 50
+    for _ in range(updates):
+        x, y = rng.randrange(grid.width), rng.randrange(grid.height)
+        grid.set_terrain(x, y, 4 if grid.terrain[y * grid.width + x] else 0)
+        start_time = time.perf_counter()
+        rebuilt += finder.update()
+        update_elapsed += time.perf_counter() - start_time
+
+    found = sum(1 for plan in plans if plan is not None)
+    print(f"{name:<24}{grid.width}x{grid.height:<6}{build_ms:>10.0f}{cold_elapsed * 1000.0 / count:>10.2f}{warm_ms:>10.0f}"
+          f"{count / plan_elapsed:>10.1f}{plan_elapsed * 1000.0 / count:>10.3f}{refine_elapsed * 1000.0 / count:>10.2f}"
+          f"{update_elapsed * 1000.0 / updates:>10.2f}{rebuilt / updates:>9.1f}{found:>8}")
+
+
+def run_group_moves(name: str, grid: PassabilityGrid, group_size: int, seed: int) -> None:
+    """Time one flow field plus a step lookup per unit against one A* search per unit."""
+    queries = random_queries(grid, group_size, seed + 2)
+    goal = queries[0][1]
+    starts = [start for start, _ in queries]
+
+    start_time = time.perf_counter()
+    field = FlowField(grid, goal)
+    field_ms = (time.perf_counter() - start_time) * 1000.0
+
+    start_time = time.perf_counter()
+    for x, y in starts:
+        field.next_tile(x, y)
+    lookup_us = (time.perf_counter() - start_time) * 1e6 / group_size
+
+    pathfinder = PathFinder(grid)
+    start_time = time.perf_counter()
+    for start in starts:
+        pathfinder.find_path(start, goal)
+    search_ms = (time.perf_counter() - start_time) * 1000.0
+
+    reachable = sum(1 for x, y in starts if field.is_reachable(x, y))
+    print(f"{name:<24}{grid.width}x{grid.height:<6}{group_size:>8}{field_ms:>10.1f}{lookup_us:>12.2f}"
+          f"{search_ms:>12.1f}{search_ms / field_ms:>9.1f}{reachable:>11}")
+
+
+def run_connectivity(name: str, grid: PassabilityGrid, count: int, seed: int) -> None:
+    """Time region labeling, incremental updates, and unreachable queries with and without it."""
+    start_time = time.perf_counter()
+    connectivity = ConnectivityMap(grid)
+    label_ms = (time.perf_counter() - start_time) * 1000.0
+    regions = connectivity.region_count
+
+    # Queries whose goal lies in another region than the start
+    rng = random.Random(seed)
+    walkable = [(i % grid.width, i // grid.width) for i, cell in enumerate(grid.cells) if cell]
+    unreachable = []
+    for _ in range(count * 50):
+        start, goal = rng.choice(walkable), rng.choice(walkable)
+        if not connectivity.is_reachable(start, goal):
+            unreachable.append((start, goal))
+            if len(unreachable) == count:
+                break
+
+    timings = []
+    for pathfinder in (PathFinder(grid), PathFinder(grid, connectivity)):
+        start_time = time.perf_counter()
+        for start, goal in unreachable:
+            pathfinder.find_path(start, goal)
+        timings.append((time.perf_counter() - start_time) * 1000.0 / max(1, len(unreachable)))
+
+    updates = 200
+    start_time = time.perf_counter()
+    for _ in range(updates):
+        x, y = rng.randrange(grid.width), rng.randrange(grid.height)
+        grid.set_terrain(x, y, 4 if grid.terrain[y * grid.width + x] else 0)
+    update_ms = (time.perf_counter() - start_time) * 1000.0 / updates
+
+    print(f"{name:<24}{grid.width}x{grid.height:<6}{label_ms:>10.1f}{regions:>9}{update_ms:>10.3f}"
+          f"{len(unreachable):>8}{timings[0]:>12.2f}{timings[1]:>12.4f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="A* pathfinding benchmark")
+    parser.add_argument("--queries", type=int, default=200, help="queries per map")
+    parser.add_argument("--size", type=int, default=512, help="synthetic map size in tiles")
+    parser.add_argument("--density", type=float, default=0.15, help="synthetic obstacle density")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    parser.add_argument("--group", type=int, default=100, help="units in the flow field group move")
+    parser.add_argument("--skip-shipped", action="store_true", help="only run the synthetic map")
+    args = parser.parse_args()
+
+    grids = []
+    if not args.skip_shipped:
+        grids.append(("Maps/Battle/map.map", load_shipped_grid()))
+    grids.append((f"synthetic {args.size}", build_synthetic_grid(args.size, args.density, args.seed)))
+
+    print("A*")
+    print(f"{'map':<24}{'size':<11}{'queries':>8}{'q/s':>10}{'ms/q':>10}{'expanded':>12}{'found':>8}{'waypoints':>11}")
+    for name, grid in grids:
+        run_queries(name, grid, args.queries, args.seed)
+
+    print("\nHPA* (build = entrances; cold = first plans, building clusters on the way;\n"
+          "      warm = building the remaining clusters; plan = abstract path on the warm graph;\n"
+          "      walk = refining all hops to tile steps; upd = one tile change)")
+    print(f"{'map':<24}{'size':<11}{'build ms':>10}{'cold ms':>10}{'warm ms':>10}{'plans/s':>10}{'ms/plan':>10}{'ms/walk':>10}"
+          f"{'ms/upd':>10}{'clusters':>9}{'found':>8}")
+    for name, grid in grids:
+        run_hierarchical(name, grid, args.queries, args.seed)
+
+    print("\nGroup move (field = flow field build; lookup = next step per unit; A* = one search per unit)")
+    print(f"{'map':<24}{'size':<11}{'units':>8}{'field ms':>10}{'lookup us':>12}{'A* ms':>12}{'speedup':>9}{'reachable':>11}")
+    for name, grid in grids:
+        run_group_moves(name, grid, args.group, args.seed)
+
+    print("\nConnectivity regions (label = whole map at load; upd = one tile change;\n"
+          "      unreach = queries across regions, answered by searching vs by region ids)")
+    print(f"{'map':<24}{'size':<11}{'label ms':>10}{'regions':>9}{'ms/upd':>10}{'unreach':>8}{'ms/q A*':>12}{'ms/q ids':>12}")
+    for name, grid in grids:
+        run_connectivity(name, grid, args.queries, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Spatial index benchmark: SpatialIndex queries against the linear scans over
+Game.objects they replace.
+
+Objects are spread over a square map with the shipped mix of sprite sizes (32,
+64 and 128 px). For each kind of lookup the same random queries run through a
+scan of the whole object list and through the index, and both must return the
+same objects. Also reports bulk rebuild and move update costs.
+
+Run from the repository root:
+    python -m Benchmarks.spatial_index_benchmark
+    python -m Benchmarks.spatial_index_benchmark --objects 20000 --size 512
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.Game.spatial_index import SpatialIndex
+
+TILE_SIZE = 32
+SCREEN_TILES = (32, 24)  # 1024x768 screen
+
+
+class SpriteSize:
+    """Stand-in for a pygame surface: the index only needs the sprite size."""
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def get_width(self) -> int:
+        return self.size
+
+    def get_height(self) -> int:
+        return self.size
+
+
+def build_objects(count: int, size: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    sizes = [SpriteSize(32), SpriteSize(64), SpriteSize(128)]
+    objects = []
+    for i in range(count):
+        image = rng.choices(sizes, weights=(6, 3, 1))[0]
+        objects.append({
+            'unique_id': i,
+            'x': rng.randrange(size),
+            'y': rng.randrange(size),
+            'image': image,
+            'offset': 64 if image.size == 128 else 32,
+            'is_unit': rng.random() < 0.3,
+        })
+    return objects
+
+
+# region Linear scans (what Game did before the index)
+def linear_at_tile(objects, x, y):
+    return [obj for obj in objects if obj['x'] == x and obj['y'] == y]
+
+
+def linear_adjacent_huge(objects, x, y):
+    found = []
+    for adj_x, adj_y in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+        for obj in objects:
+            if obj['x'] == adj_x and obj['y'] == adj_y and obj['image'].get_width() == 128:
+                found.append(obj)
+    return found
+
+
+def linear_rect(objects, index, min_x, min_y, max_x, max_y):
+    result = []
+    for obj in objects:
+        left, top, right, bottom = index.get_bounds(obj)
+        if left <= max_x and right >= min_x and top <= max_y and bottom >= min_y:
+            result.append(obj)
+    return result
+
+
+def linear_radius(objects, x, y, radius):
+    radius_squared = radius * radius
+    return [obj for obj in objects if (obj['x'] - x) ** 2 + (obj['y'] - y) ** 2 <= radius_squared]
+
+
+def linear_nearest(objects, x, y, k, filter):
+    candidates = [obj for obj in objects if filter(obj)]
+    candidates.sort(key=lambda obj: (obj['x'] - x) ** 2 + (obj['y'] - y) ** 2)
+    return candidates[:k]
+# endregion
+
+
+def time_queries(queries: List[tuple], run: Callable) -> tuple:
+    results = []
+    start_time = time.perf_counter()
+    for query in queries:
+        results.append(run(*query))
+    return (time.perf_counter() - start_time) * 1000.0 / len(queries), results
+
+
+def same_objects(first: List[list], second: List[list]) -> bool:
+    return all(sorted(id(obj) for obj in a) == sorted(id(obj) for obj in b) for a, b in zip(first, second))
+
+
+def same_distances(first: List[list], second: List[list], x_y: List[tuple]) -> bool:
+    """nearest() ties may pick different objects at the same distance."""
+    def distances(found, x, y):
+        return [(obj['x'] - x) ** 2 + (obj['y'] - y) ** 2 for obj in found]
+    return all(distances(a, q[0], q[1]) == distances(b, q[0], q[1]) for a, b, q in zip(first, second, x_y))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Spatial index benchmark")
+    parser.add_argument("--objects", type=int, default=5000, help="objects on the map")
+    parser.add_argument("--size", type=int, default=256, help="map width and height in tiles")
+    parser.add_argument("--queries", type=int, default=200, help="queries per kind")
+    parser.add_argument("--radius", type=float, default=12.0, help="radius query size in tiles")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    args = parser.parse_args()
+
+    objects = build_objects(args.objects, args.size, args.seed)
+    index = SpatialIndex(TILE_SIZE, 128)
+    start_time = time.perf_counter()
+    index.rebuild(objects)
+    rebuild_ms = (time.perf_counter() - start_time) * 1000.0
+
+    rng = random.Random(args.seed + 1)
+    points = [(rng.randrange(args.size), rng.randrange(args.size)) for _ in range(args.queries)]
+    rects = [(x, y, x + SCREEN_TILES[0], y + SCREEN_TILES[1]) for x, y in points]
+    radii = [(x, y, args.radius) for x, y in points]
+    is_unit = lambda obj: obj['is_unit']
+    nearest = [(x, y, 5, is_unit) for x, y in points]
+
+    kinds = (
+        ("tile", points, lambda x, y: linear_at_tile(objects, x, y), index.objects_at, same_objects),
+        ("adjacent huge", points, lambda x, y: linear_adjacent_huge(objects, x, y),
+         lambda x, y: [obj for ax, ay in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1))
+                       for obj in index.objects_at(ax, ay, lambda o: o['image'].get_width() == 128)], same_objects),
+        ("screen rect", rects, lambda *r: linear_rect(objects, index, *r), index.query_rect, same_objects),
+        ("radius", radii, lambda *q: linear_radius(objects, *q), index.query_radius, same_objects),
+        ("nearest 5 units", nearest, lambda *q: linear_nearest(objects, *q),
+         lambda x, y, k, f: index.nearest(x, y, k, f), lambda a, b: same_distances(a, b, nearest)),
+    )
+
+    print(f"{args.objects} objects on {args.size}x{args.size} tiles, {args.queries} queries per kind")
+    print(f"rebuild: {rebuild_ms:.2f} ms, {len(index.cells)} cells")
+    print(f"{'query':<18}{'linear ms':>11}{'index ms':>10}{'speedup':>9}{'match':>7}")
+    for name, queries, linear, indexed, compare in kinds:
+        linear_ms, linear_results = time_queries(queries, linear)
+        index_ms, index_results = time_queries(queries, indexed)
+        speedup = linear_ms / index_ms if index_ms > 0 else float('inf')
+        match = "yes" if compare(linear_results, index_results) else "NO"
+        print(f"{name:<18}{linear_ms:>11.3f}{index_ms:>10.3f}{speedup:>8.0f}x{match:>7}")
+
+    # Units stepping to a neighbouring tile, as update_unit_movement does on arrival
+    units = [obj for obj in objects if obj['is_unit']]
+    moves = 0
+    start_time = time.perf_counter()
+    for _ in range(10):
+        for unit in units:
+            unit['x'] = min(max(unit['x'] + rng.choice((-1, 0, 1)), 0), args.size - 1)
+            unit['y'] = min(max(unit['y'] + rng.choice((-1, 0, 1)), 0), args.size - 1)
+            index.move(unit)
+            moves += 1
+    move_us = (time.perf_counter() - start_time) * 1e6 / max(moves, 1)
+    print(f"move update: {move_us:.2f} us per unit step")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Connected regions of the passability grid.
+
+Every walkable tile gets the id of the region it belongs to (0 on blocked
+tiles); two tiles are mutually reachable exactly when their ids are equal, so a
+path request to an island or enclosed area can be rejected in O(1) instead of
+searching the whole map before failing.
+
+Units may only step diagonally when both orthogonal neighbours are free, so
+regions are 4-connected.
+
+The labels are computed with NumPy at map load (min-label sweeps along row and
+column runs plus pointer jumping over the whole grid) and kept up to date from
+the grid's change notifications:
+
+- tiles becoming walkable join the regions around them (merging them if needed)
+- tiles becoming blocked may split their region; if the rest of the region is
+  still connected around the changed area nothing else happens, otherwise flood
+  fills from its pieces find out which of them got cut off
+"""
+
+from collections import deque
+from typing import List, Tuple
+import numpy as np
+from Core.AI.pathfinding import PassabilityGrid
+
+NO_REGION = 0
+
+# 4-connected neighbour offsets
+_ORTHOGONAL = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+def _run_layout(passable: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start index and length of every run of equal walkability along the rows of a mask."""
+    height, width = passable.shape
+    flat = passable.ravel()
+    change = np.ones(flat.size, dtype=bool)
+    change[1:] = flat[1:] != flat[:-1]
+    change[::width] = True  # Runs never continue onto the next row
+    starts = np.flatnonzero(change)
+    lengths = np.diff(np.append(starts, flat.size))
+    return starts, lengths
+
+
+def _sweep(labels: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Give every run of a row the smallest label found in it (blocked runs stay 0)."""
+    return np.repeat(np.minimum.reduceat(labels.ravel(), starts), lengths).reshape(labels.shape)
+
+
+def label_regions(passable: np.ndarray, first_label: int = 1) -> Tuple[np.ndarray, int]:
+    """
+    Label the 4-connected regions of a walkable mask.
+
+    Labels spread along whole row runs, then whole column runs, and are then
+    collapsed by pointer jumping, until nothing changes; the number of rounds
+    depends on how winding the regions are, not on their size.
+
+    Args:
+        passable: bool array of shape (height, width)
+        first_label: Id given to the first region
+
+    Returns:
+        Tuple[np.ndarray, int]: int32 labels (NO_REGION where blocked, ids numbered
+                                consecutively from first_label) and the number of regions
+    """
+    height, width = passable.shape
+    size = height * width
+    # Every tile starts as its own region: 1 + its flat index
+    labels = np.where(passable, np.arange(1, size + 1, dtype=np.int32).reshape(height, width), 0).astype(np.int32)
+    row_runs = _run_layout(passable)
+    column_runs = _run_layout(np.ascontiguousarray(passable.T))
+
+    while True:
+        swept = _sweep(labels, *row_runs)
+        swept = np.ascontiguousarray(_sweep(np.ascontiguousarray(swept.T), *column_runs).T)
+
+        # Pointer jumping: a label is the flat index + 1 of a tile of the same region,
+        # so following labels through that tile collapses chains of regions
+        flat = swept.ravel()
+        while True:
+            jumped = flat[np.maximum(flat - 1, 0)]
+            jumped[flat == 0] = 0
+            if np.array_equal(jumped, flat):
+                break
+            flat = jumped
+        swept = flat.reshape(height, width)
+
+        if np.array_equal(swept, labels):
+            break
+        labels = swept
+
+    # Renumber to consecutive ids
+    roots, inverse = np.unique(labels, return_inverse=True)
+    inverse = inverse.reshape(height, width).astype(np.int32)
+    if roots.size and roots[0] == 0:
+        count = roots.size - 1
+        labels = np.where(inverse > 0, inverse + (first_label - 1), 0).astype(np.int32)
+    else:
+        count = roots.size
+        labels = (inverse + first_label).astype(np.int32)
+    return labels, count
+
+
+class ConnectivityMap:
+    """Region id of every tile of a PassabilityGrid, kept in sync with it."""
+
+    def __init__(self, grid: PassabilityGrid):
+        self.grid = grid
+        self.passable = self._read_cells(0, 0, grid.width - 1, grid.height - 1)
+        self.labels, count = label_regions(self.passable)
+        self.next_label = count + 1
+        self.version = grid.version
+        self.relabels = 0  # Regions created by splits, for metrics
+        grid.add_listener(self.on_grid_changed)
+
+    def _read_cells(self, min_x: int, min_y: int, max_x: int, max_y: int) -> np.ndarray:
+        width = self.grid.width
+        cells = np.frombuffer(self.grid.cells, dtype=np.uint8).reshape(self.grid.height, width)
+        return cells[min_y:max_y + 1, min_x:max_x + 1].astype(bool)
+
+    def region_of(self, x: int, y: int) -> int:
+        """Region id of a tile (NO_REGION if blocked or outside the map)."""
+        if not (0 <= x < self.grid.width and 0 <= y < self.grid.height):
+            return NO_REGION
+        return self.labels.item(y, x)
+
+    def is_reachable(self, start: Tuple[int, int], goal: Tuple[int, int]) -> bool:
+        """Check in O(1) whether a unit on start can walk to goal."""
+        region = self.region_of(*start)
+        return region != NO_REGION and region == self.region_of(*goal)
+
+    @property
+    def region_count(self) -> int:
+        return int(np.unique(self.labels[self.labels > 0]).size)
+
+    def on_grid_changed(self, min_x: int, min_y: int, max_x: int, max_y: int) -> None:
+        """PassabilityGrid listener: apply the tiles that changed in the area."""
+        passable = self._read_cells(min_x, min_y, max_x, max_y)
+        previous = self.passable[min_y:max_y + 1, min_x:max_x + 1]
+        opened = np.argwhere(passable & ~previous)
+        closed = np.argwhere(previous & ~passable)
+        previous[...] = passable
+        self.version = self.grid.version
+
+        # Regions that lost tiles may have been cut in two
+        split_regions = {self.labels.item(min_y + int(y), min_x + int(x)) for y, x in closed}
+        for y, x in closed:
+            self.labels[min_y + y, min_x + x] = NO_REGION
+        if split_regions:
+            # Anything that walked through the changed area entered and left it through the
+            # one tile border around it: if the region is still in one piece inside that
+            # window, it cannot have been cut in two
+            window = self.labels[max(0, min_y - 1):max_y + 2, max(0, min_x - 1):max_x + 2]
+            top, left = max(0, min_y - 1), max(0, min_x - 1)
+            for region in split_regions:
+                pieces, count = label_regions(window == region)
+                if count > 1:
+                    seeds = []
+                    for piece in range(1, count + 1):
+                        y, x = np.argwhere(pieces == piece)[0]
+                        seeds.append((top + int(y)) * self.grid.width + left + int(x))
+                    self._split(region, seeds)
+
+        for y, x in opened:
+            self._open(min_x + int(x), min_y + int(y))
+
+    def _open(self, x: int, y: int) -> None:
+        """Give a tile that became walkable a region, merging the regions it now connects."""
+        neighbours = {self.region_of(x + dx, y + dy) for dx, dy in _ORTHOGONAL} - {NO_REGION}
+        if not neighbours:
+            self.labels[y, x] = self.next_label
+            self.next_label += 1
+            return
+        region = min(neighbours)
+        self.labels[y, x] = region
+        for other in neighbours - {region}:
+            self.labels[self.labels == other] = region
+
+    def _split(self, region: int, seeds: List[int]) -> None:
+        """
+        Find out whether pieces of a region that lost tiles are still connected.
+
+        One flood fill per piece runs in lockstep; fills that meet are merged,
+        and a fill that runs out of tiles first is a region of its own and gets
+        a new id. The work is bounded by the size of the smaller pieces, so
+        cutting a small island off a huge region stays cheap.
+
+        Args:
+            region: Region id that lost tiles
+            seeds: Flat index of one tile per piece, as seen around the changed area
+        """
+        width, height = self.grid.width, self.grid.height
+        labels = self.labels.reshape(-1)
+        group_of = list(range(len(seeds)))
+        owner = {seed: group for group, seed in enumerate(seeds)}
+        frontiers = [deque([seed]) for seed in seeds]
+        members = [[seed] for seed in seeds]
+        active = list(range(len(seeds)))
+
+        def find(group: int) -> int:
+            while group_of[group] != group:
+                group_of[group] = group_of[group_of[group]]
+                group = group_of[group]
+            return group
+
+        while len(active) > 1:
+            for group in list(active):
+                if group_of[group] != group:
+                    continue  # Merged into another fill during this round
+                frontier = frontiers[group]
+                if not frontier:
+                    # Closed off: this piece is a separate region now
+                    labels[members[group]] = self.next_label
+                    self.next_label += 1
+                    self.relabels += 1
+                    active.remove(group)
+                    if len(active) == 1:
+                        return
+                    continue
+                index = frontier.popleft()
+                x, y = index % width, index // width
+                for dx, dy in _ORTHOGONAL:
+                    nx, ny = x + dx, y + dy
+                    if not (0 <= nx < width and 0 <= ny < height):
+                        continue
+                    neighbour = ny * width + nx
+                    if labels[neighbour] != region:
+                        continue
+                    other = owner.get(neighbour)
+                    if other is None:
+                        owner[neighbour] = group
+                        members[group].append(neighbour)
+                        frontier.append(neighbour)
+                        continue
+                    other = find(other)
+                    if other == group:
+                        continue
+                    # The fills met: keep the larger one going
+                    keep, drop = (group, other) if len(members[group]) >= len(members[other]) else (other, group)
+                    group_of[drop] = keep
+                    frontiers[keep].extend(frontiers[drop])
+                    members[keep].extend(members[drop])
+                    active.remove(drop)
+                    if drop == group:
+                        # The kept fill looks at the neighbours of this tile not visited yet
+                        frontiers[keep].append(index)
+                        break
+                    if len(active) == 1:
+                        return
@@ -0,0 +1,172 @@
+"""
+Flow fields for group move orders.
+
+A flow field is computed once per goal tile and then shared by every unit
+heading there: each unit reads the direction stored at its tile in O(1) instead
+of running its own search.
+
+- integration field: walking distance from every tile to the goal, computed by
+  NumPy wavefront expansion (each pass relaxes all 8 neighbour directions of the
+  whole grid at once, until no distance improves)
+- direction field: for every tile, the index in NEIGHBOURS of the step that
+  leads downhill in the integration field (-1 at the goal and on tiles that
+  cannot reach it)
+
+FlowFieldCache keeps the most recently used fields per goal and drops all of
+them when the passability grid changes.
+"""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+import numpy as np
+from Core.AI.pathfinding import PassabilityGrid, NEIGHBOURS
+from config import PATHFINDING
+
+NO_DIRECTION = -1
+
+
+class FlowField:
+    """Integration and direction fields towards one goal tile."""
+
+    def __init__(self, grid: PassabilityGrid, goal: Tuple[int, int]):
+        self.grid = grid
+        self.goal = goal
+        self.version = grid.version
+        masks = self.move_masks(grid)
+        self.integration = self.compute_integration(masks, goal)
+        self.directions = self.compute_directions(masks, self.integration)
+        # Plain list copy: indexing it from Python is much faster than indexing the array
+        self._direction_list = self.directions.ravel().tolist()
+
+    @staticmethod
+    def move_masks(grid: PassabilityGrid) -> np.ndarray:
+        """
+        Which moves are allowed from every tile.
+
+        Returns:
+            np.ndarray: bool array of shape (8, height, width); mask[d, y, x] is True when
+                        a unit on (x, y) may step in direction NEIGHBOURS[d]
+        """
+        height, width = grid.height, grid.width
+        passable = np.frombuffer(bytes(grid.cells), dtype=np.uint8).reshape(height, width).astype(bool)
+        padded = np.zeros((height + 2, width + 2), dtype=bool)
+        padded[1:-1, 1:-1] = passable
+
+        def shifted(dx: int, dy: int) -> np.ndarray:
+            return padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+
+        masks = np.empty((len(NEIGHBOURS), height, width), dtype=bool)
+        for d, (dx, dy, _) in enumerate(NEIGHBOURS):
+            mask = passable & shifted(dx, dy)
+            if dx and dy:
+                # No corner cutting, same rule as the A* search
+                mask &= shifted(dx, 0) & shifted(0, dy)
+            masks[d] = mask
+        return masks
+
+    @staticmethod
+    def compute_integration(masks: np.ndarray, goal: Tuple[int, int]) -> np.ndarray:
+        """
+        Walking distance from every tile to the goal (inf where unreachable).
+
+        Moves are symmetric, so the distance from a tile to the goal is the
+        distance the wavefront travels from the goal to that tile.
+
+        Args:
+            masks: Allowed moves, from move_masks()
+            goal: Goal tile
+        """
+        _, height, width = masks.shape
+        integration = np.full((height + 2, width + 2), np.inf, dtype=np.float32)
+        integration[1 + goal[1], 1 + goal[0]] = 0.0
+        inner = integration[1:-1, 1:-1]
+
+        costs = [np.float32(cost) for _, _, cost in NEIGHBOURS]
+        for _ in range(PATHFINDING['flow_field_max_passes']):
+            improved = False
+            for d, (dx, dy, _) in enumerate(NEIGHBOURS):
+                # Distance through the neighbour in direction d
+                candidate = integration[1 + dy:1 + dy + height, 1 + dx:1 + dx + width] + costs[d]
+                better = masks[d] & (candidate < inner)
+                if better.any():
+                    np.copyto(inner, candidate, where=better)
+                    improved = True
+            if not improved:
+                break
+        return inner.copy()
+
+    @staticmethod
+    def compute_directions(masks: np.ndarray, integration: np.ndarray) -> np.ndarray:
+        """Index of the downhill neighbour of every tile (NO_DIRECTION at the goal or if unreachable)."""
+        height, width = integration.shape
+        padded = np.full((height + 2, width + 2), np.inf, dtype=np.float32)
+        padded[1:-1, 1:-1] = integration
+
+        through = np.empty((len(NEIGHBOURS), height, width), dtype=np.float32)
+        for d, (dx, dy, cost) in enumerate(NEIGHBOURS):
+            through[d] = np.where(masks[d], padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width] + np.float32(cost), np.inf)
+        # argmin keeps the first minimum, so orthogonal steps win ties
+        directions = through.argmin(axis=0).astype(np.int8)
+        directions[~np.isfinite(integration) | (integration == 0.0)] = NO_DIRECTION
+        return directions
+
+    def is_reachable(self, x: int, y: int) -> bool:
+        """Check whether a unit on (x, y) can walk to the goal."""
+        return bool(np.isfinite(self.integration[y, x]))
+
+    def next_tile(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """
+        Next tile towards the goal for a unit standing on (x, y).
+
+        Returns:
+            Optional[Tuple[int, int]]: The tile, or None at the goal or if the goal cannot be reached
+        """
+        if not (0 <= x < self.grid.width and 0 <= y < self.grid.height):
+            return None
+        direction = self._direction_list[y * self.grid.width + x]
+        if direction == NO_DIRECTION:
+            return None
+        dx, dy, _ = NEIGHBOURS[direction]
+        return x + dx, y + dy
+
+
+class FlowFieldCache:
+    """Least recently used flow fields, keyed by goal tile."""
+
+    def __init__(self, grid: PassabilityGrid, capacity: Optional[int] = None):
+        self.grid = grid
+        self.capacity = capacity or PATHFINDING['flow_field_cache_size']
+        self.fields: 'OrderedDict[Tuple[int, int], FlowField]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, goal: Tuple[int, int]) -> Optional[FlowField]:
+        """
+        Get the flow field towards a goal, computing it if needed.
+
+        A blocked goal is replaced by the closest walkable tile.
+
+        Returns:
+            Optional[FlowField]: The field, or None if no walkable tile is near the goal
+        """
+        if not self.grid.is_passable(*goal):
+            goal = self.grid.nearest_passable(goal[0], goal[1])
+            if goal is None:
+                return None
+
+        if self.fields and next(reversed(self.fields.values())).version != self.grid.version:
+            # The grid changed since the cached fields were computed: all of them are stale
+            self.fields.clear()
+
+        field = self.fields.get(goal)
+        if field is not None:
+            self.fields.move_to_end(goal)
+            self.hits += 1
+            return field
+
+        self.misses += 1
+        field = FlowField(self.grid, goal)
+        self.fields[goal] = field
+        while len(self.fields) > self.capacity:
+            self.fields.popitem(last=False)
+        return field
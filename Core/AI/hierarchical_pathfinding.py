@@ -0,0 +1,479 @@
+"""
+Hierarchical pathfinding (HPA*) on top of the tile grid.
+
+The map is split into square clusters (PATHFINDING['cluster_size'] tiles). Where
+two neighbouring clusters share a run of walkable border tiles, one or two
+entrances are placed on it; every entrance contributes a node on each side of
+the border, joined by an inter-cluster edge of cost 1. Inside a cluster all of
+its nodes are joined by intra-cluster edges whose cost is the walking distance
+between them without leaving the cluster.
+
+A query only inserts the start and goal into their clusters and runs A* on this
+small abstract graph. The result is a HierarchicalPath: a list of abstract
+waypoints that is refined into tile steps one hop at a time, as the unit walks,
+with a tile A* bounded to a single cluster.
+
+Entrances are placed for the whole map up front. The intra-cluster edges come
+from per-node distance fields (walking distance from the node to every tile of
+its cluster), which are built the first time a search enters the cluster; the
+same fields connect a query's start and goal to their clusters in O(nodes).
+
+Changes to the PassabilityGrid mark the touched clusters dirty; before the next
+query only the borders of those clusters are recomputed, and only they (and the
+neighbours sharing a changed border) lose their edges and are rebuilt on demand.
+"""
+
+import heapq
+from array import array
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+from Core.AI.pathfinding import PassabilityGrid, PathFinder, NEIGHBOURS, OCTILE_DIAGONAL
+from config import PATHFINDING
+
+if TYPE_CHECKING:
+    from Core.AI.connectivity import ConnectivityMap
+
+Tile = Tuple[int, int]
+Cluster = Tuple[int, int]
+BorderKey = Tuple[int, int, str]  # (cluster_x, cluster_y, 'E' or 'S')
+
+INFINITY = float('inf')
+DISTANCE_SCALE = 16  # Distance fields store walking distance in 1/16 tile units
+UNREACHABLE = 0xFFFF
+
+
+class HierarchicalPath:
+    """An abstract path that is turned into tile steps one hop at a time."""
+
+    def __init__(self, finder: 'HierarchicalPathFinder', waypoints: List[Tile], version: int,
+                 first_steps: Optional[List[Tile]] = None):
+        self.finder = finder
+        self.waypoints = waypoints  # Start, entrance nodes..., goal
+        self.index = 0  # Index of the waypoint the unit is currently at
+        self.version = version  # Cluster graph version the plan was made on
+        self.first_steps = first_steps  # Steps of the first hop if the planner already found them
+
+    @property
+    def goal(self) -> Tile:
+        return self.waypoints[-1]
+
+    def is_finished(self) -> bool:
+        return self.index >= len(self.waypoints) - 1
+
+    def next_steps(self) -> Optional[List[Tile]]:
+        """
+        Refine the next hop into single tile steps.
+
+        Returns:
+            Optional[List[Tile]]: The steps (empty when the goal is reached),
+                                  or None if the hop is no longer walkable
+        """
+        if self.is_finished():
+            return []
+        start = self.waypoints[self.index]
+        end = self.waypoints[self.index + 1]
+        if self.index == 0 and self.first_steps is not None:
+            steps, self.first_steps = self.first_steps, None
+            self.index += 1
+            return steps
+        self.index += 1
+        steps = self.finder.refine(start, end)
+        if steps is None:
+            return None
+        return steps
+
+
+class HierarchicalPathFinder:
+    """HPA* planner kept in sync with a PassabilityGrid."""
+
+    def __init__(self, grid: PassabilityGrid, cluster_size: Optional[int] = None,
+                 connectivity: Optional['ConnectivityMap'] = None):
+        self.grid = grid
+        if not cluster_size:
+            # Bigger clusters keep the abstract graph small enough on huge maps
+            large = max(grid.width, grid.height) > PATHFINDING['large_map_tiles']
+            cluster_size = PATHFINDING['large_map_cluster_size' if large else 'cluster_size']
+        self.cluster_size = cluster_size
+        self.clusters_x = (grid.width + self.cluster_size - 1) // self.cluster_size
+        self.clusters_y = (grid.height + self.cluster_size - 1) // self.cluster_size
+        self.tile_finder = PathFinder(grid, connectivity)
+
+        self.borders: Dict[BorderKey, List[Tuple[Tile, Tile]]] = {}  # Entrance tile pairs per border
+        self.inter_edges: Dict[Tile, Dict[Tile, float]] = {}  # Node -> nodes across a border
+        self.intra_edges: Dict[Cluster, Dict[Tile, Dict[Tile, float]]] = {}  # Per cluster: node -> nodes
+        self.adjacency: Dict[Tile, List[Tuple[Tile, float]]] = {}  # Node -> intra and inter neighbours
+        self.distance_fields: Dict[Tile, array] = {}  # Node -> distances to every tile of its cluster
+        self.dirty_clusters: Set[Cluster] = set()
+        self.version = 0  # Incremented whenever clusters are rebuilt
+        self.last_rebuilt = 0  # Clusters rebuilt by the last update, for benchmarks
+
+        self.build()
+        grid.add_listener(self.on_grid_changed)
+
+    # region Construction
+    def cluster_of(self, x: int, y: int) -> Cluster:
+        return x // self.cluster_size, y // self.cluster_size
+
+    def cluster_bounds(self, cluster: Cluster) -> Tuple[int, int, int, int]:
+        """Inclusive (min_x, min_y, max_x, max_y) tile area of a cluster."""
+        size = self.cluster_size
+        min_x = cluster[0] * size
+        min_y = cluster[1] * size
+        return (min_x, min_y, min(self.grid.width, min_x + size) - 1, min(self.grid.height, min_y + size) - 1)
+
+    def build(self) -> None:
+        """Compute every border from scratch; clusters are built the first time a search enters them."""
+        self.borders.clear()
+        self.inter_edges.clear()
+        self.intra_edges.clear()
+        self.adjacency.clear()
+        self.distance_fields.clear()
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                for side in ('E', 'S'):
+                    self._build_border((cx, cy, side))
+        self.dirty_clusters.clear()
+        self.version += 1
+
+    def _build_border(self, key: BorderKey) -> bool:
+        """
+        Place entrances on one border and update the inter-cluster edges.
+
+        Returns:
+            bool: True if the entrances changed
+        """
+        cx, cy, side = key
+        if (side == 'E' and cx + 1 >= self.clusters_x) or (side == 'S' and cy + 1 >= self.clusters_y):
+            return False
+        min_x, min_y, max_x, max_y = self.cluster_bounds((cx, cy))
+        if side == 'E':
+            pairs_along = [((max_x, y), (max_x + 1, y)) for y in range(min_y, max_y + 1)]
+        else:
+            pairs_along = [((x, max_y), (x, max_y + 1)) for x in range(min_x, max_x + 1)]
+
+        is_passable = self.grid.is_passable
+        entrances = []
+        run = []
+        for pair in pairs_along + [None]:
+            if pair is not None and is_passable(*pair[0]) and is_passable(*pair[1]):
+                run.append(pair)
+                continue
+            if run:
+                if len(run) < PATHFINDING['entrance_split']:
+                    entrances.append(run[len(run) // 2])
+                else:
+                    # Long openings get an entrance at each end so paths do not bunch up in the middle
+                    entrances.append(run[0])
+                    entrances.append(run[-1])
+                run = []
+
+        old = self.borders.get(key, [])
+        if old == entrances:
+            return False
+        for a, b in old:
+            self._unlink(a, b)
+        for a, b in entrances:
+            self.inter_edges.setdefault(a, {})[b] = 1.0
+            self.inter_edges.setdefault(b, {})[a] = 1.0
+        self.borders[key] = entrances
+        return True
+
+    def _unlink(self, a: Tile, b: Tile) -> None:
+        for node, other in ((a, b), (b, a)):
+            edges = self.inter_edges.get(node)
+            if edges is not None:
+                edges.pop(other, None)
+                if not edges:
+                    del self.inter_edges[node]
+
+    def cluster_nodes(self, cluster: Cluster) -> List[Tile]:
+        """Entrance nodes that lie inside a cluster."""
+        cx, cy = cluster
+        nodes = set()
+        for key, index in (((cx, cy, 'E'), 0), ((cx, cy, 'S'), 0), ((cx - 1, cy, 'E'), 1), ((cx, cy - 1, 'S'), 1)):
+            for pair in self.borders.get(key, ()):
+                nodes.add(pair[index])
+        return sorted(nodes)
+
+    def build_all_clusters(self) -> None:
+        """Build every cluster that is not built yet (e.g. while a loading screen is shown)."""
+        self.update()
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                if (cx, cy) not in self.intra_edges:
+                    self._build_cluster((cx, cy))
+
+    def _invalidate_cluster(self, cluster: Cluster) -> bool:
+        """Drop the edges and distance fields of a cluster so the next search rebuilds them."""
+        edges = self.intra_edges.pop(cluster, None)
+        if edges is None:
+            return False
+        for node in edges:
+            self.adjacency.pop(node, None)
+            self.distance_fields.pop(node, None)
+        return True
+
+    def _build_cluster(self, cluster: Cluster) -> None:
+        """Recompute the distance fields and intra-cluster edges of all nodes of a cluster."""
+        nodes = self.cluster_nodes(cluster)
+        min_x, min_y, max_x, max_y = bounds = self.cluster_bounds(cluster)
+        local_width = max_x - min_x + 1
+
+        for old_node in self.intra_edges.get(cluster, ()):
+            self.adjacency.pop(old_node, None)
+            self.distance_fields.pop(old_node, None)
+
+        fields = {node: self.distance_field(node, bounds) for node in nodes}
+        edges: Dict[Tile, Dict[Tile, float]] = {node: {} for node in nodes}
+        for node in nodes:
+            field = fields[node]
+            for other in nodes:
+                value = field[(other[1] - min_y) * local_width + other[0] - min_x]
+                if other != node and value != UNREACHABLE:
+                    edges[node][other] = value / DISTANCE_SCALE
+
+        self.distance_fields.update(fields)
+        self.intra_edges[cluster] = edges
+        for node, intra in edges.items():
+            # Flat neighbour lists keep dictionary lookups out of the abstract search
+            adjacency = list(intra.items())
+            adjacency.extend(self.inter_edges.get(node, {}).items())
+            self.adjacency[node] = adjacency
+
+    def distance_field(self, source: Tile, bounds: Tuple[int, int, int, int]) -> array:
+        """
+        Walking distance from source to every tile of its cluster (Dijkstra bounded to the cluster).
+
+        Returns:
+            array: One 'H' entry per tile of the cluster, in DISTANCE_SCALE units
+                   (UNREACHABLE where the source cannot walk to)
+        """
+        min_x, min_y, max_x, max_y = bounds
+        width = self.grid.width
+        cells = self.grid.cells
+        local_width = max_x - min_x + 1
+        size = local_width * (max_y - min_y + 1)
+        best = [INFINITY] * size
+        field = array('H', [UNREACHABLE]) * size
+        heappop = heapq.heappop
+        heappush = heapq.heappush
+
+        start = (source[1] - min_y) * local_width + source[0] - min_x
+        best[start] = 0.0
+        heap = [(0.0, start)]
+        while heap:
+            cost, local = heappop(heap)
+            if field[local] != UNREACHABLE:
+                continue
+            field[local] = min(UNREACHABLE - 1, int(cost * DISTANCE_SCALE + 0.5))
+            y = local // local_width + min_y
+            x = local % local_width + min_x
+            for dx, dy, step in NEIGHBOURS:
+                nx = x + dx
+                ny = y + dy
+                if nx < min_x or ny < min_y or nx > max_x or ny > max_y:
+                    continue
+                if not cells[ny * width + nx]:
+                    continue
+                if dx and dy and (not cells[y * width + nx] or not cells[ny * width + x]):
+                    continue
+                neighbour = local + dy * local_width + dx
+                new_cost = cost + step
+                if new_cost < best[neighbour] and field[neighbour] == UNREACHABLE:
+                    best[neighbour] = new_cost
+                    heappush(heap, (new_cost, neighbour))
+        return field
+
+    def insertion_edges(self, tile: Tile) -> Dict[Tile, float]:
+        """
+        Distances from a tile to the nodes of its cluster, read from their distance fields.
+
+        Returns:
+            Dict[Tile, float]: Node -> walking distance, for the nodes the tile can reach
+        """
+        cluster = self.cluster_of(*tile)
+        if cluster not in self.intra_edges:
+            self._build_cluster(cluster)
+        min_x, min_y, max_x, max_y = self.cluster_bounds(cluster)
+        local = (tile[1] - min_y) * (max_x - min_x + 1) + tile[0] - min_x
+        edges = {}
+        for node in self.intra_edges.get(cluster, ()):
+            value = self.distance_fields[node][local]
+            if value != UNREACHABLE:
+                edges[node] = value / DISTANCE_SCALE
+        return edges
+    # endregion
+
+    # region Updates
+    def on_grid_changed(self, min_x: int, min_y: int, max_x: int, max_y: int) -> None:
+        """PassabilityGrid listener: mark the clusters overlapping the changed area dirty."""
+        first = self.cluster_of(min_x, min_y)
+        last = self.cluster_of(max_x, max_y)
+        for cy in range(first[1], last[1] + 1):
+            for cx in range(first[0], last[0] + 1):
+                self.dirty_clusters.add((cx, cy))
+
+    def update(self) -> int:
+        """
+        Recompute the borders of dirty clusters and invalidate the clusters whose
+        edges changed. Called automatically before each query.
+
+        Returns:
+            int: Number of built clusters that were invalidated
+        """
+        if not self.dirty_clusters:
+            self.last_rebuilt = 0
+            return 0
+        dirty = self.dirty_clusters
+        self.dirty_clusters = set()
+
+        to_rebuild = set(dirty)
+        for cx, cy in dirty:
+            for key, other in (((cx, cy, 'E'), (cx + 1, cy)), ((cx, cy, 'S'), (cx, cy + 1)),
+                               ((cx - 1, cy, 'E'), (cx - 1, cy)), ((cx, cy - 1, 'S'), (cx, cy - 1))):
+                if key[0] < 0 or key[1] < 0:
+                    continue
+                # A neighbour only needs new intra edges if the shared entrances moved
+                if self._build_border(key):
+                    to_rebuild.add(other)
+        self.last_rebuilt = sum(1 for cluster in to_rebuild if self._invalidate_cluster(cluster))
+        self.version += 1
+        return self.last_rebuilt
+    # endregion
+
+    # region Queries
+    def find_path(self, start: Tile, goal: Tile) -> Optional[HierarchicalPath]:
+        """
+        Plan a path on the abstract graph.
+
+        If the goal is blocked the closest walkable tile is used instead.
+
+        Args:
+            start: Start tile
+            goal: Goal tile
+
+        Returns:
+            Optional[HierarchicalPath]: The plan, or None if the goal cannot be reached
+        """
+        grid = self.grid
+        self.update()
+        if not grid.is_passable(*start):
+            return None
+        if not grid.is_passable(*goal):
+            goal = grid.nearest_passable(goal[0], goal[1])
+            if goal is None:
+                return None
+        if start == goal:
+            return HierarchicalPath(self, [start], self.version)
+        if not self.tile_finder.may_reach(start, goal):
+            return None  # Different regions: no need to search
+
+        start_cluster = self.cluster_of(*start)
+        if start_cluster == self.cluster_of(*goal):
+            # Most short orders never need the abstract graph
+            bounds = self.cluster_bounds(start_cluster)
+            steps = self.tile_finder.find_path(start, goal, smooth=False, bounds=bounds)
+            if steps:
+                # The unsmoothed search result already is the single tile steps of the hop
+                return HierarchicalPath(self, [start, goal], self.version, steps)
+
+        # Connect the start and goal to the entrances of their clusters
+        start_edges = self.insertion_edges(start)
+        goal_edges = self.insertion_edges(goal)
+        if not start_edges or not goal_edges:
+            return None
+
+        waypoints = self._abstract_search(start, goal, start_edges, goal_edges)
+        if waypoints is None:
+            return None
+        return HierarchicalPath(self, waypoints, self.version)
+
+    def _abstract_search(self, start: Tile, goal: Tile, start_edges: Dict[Tile, float],
+                         goal_edges: Dict[Tile, float]) -> Optional[List[Tile]]:
+        """
+        A* over the entrance graph with the start and goal temporarily inserted.
+
+        The heuristic is scaled by PATHFINDING['heuristic_weight']: plans are at most
+        that factor longer than the best abstract path, in exchange for expanding
+        far fewer nodes on large open maps.
+        """
+        goal_x, goal_y = goal
+        weight = PATHFINDING['heuristic_weight']
+        diagonal = OCTILE_DIAGONAL
+        adjacency = self.adjacency
+        g_score = {start: 0.0}
+        parent = {start: None}
+        closed = set()
+        heap = [(0.0, 0.0, start)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        start_neighbours = list(start_edges.items())
+        start_neighbours.extend(self.inter_edges.get(start, {}).items())
+
+        while heap:
+            f, g, node = heappop(heap)
+            if node in closed:
+                continue
+            if node == goal:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parent[node]
+                path.reverse()
+                return path
+            closed.add(node)
+
+            if node == start:
+                neighbours = start_neighbours
+            else:
+                neighbours = adjacency.get(node)
+                if neighbours is None:
+                    # First search through this cluster since it was created or invalidated
+                    self._build_cluster(self.cluster_of(*node))
+                    neighbours = adjacency.get(node, ())
+            goal_cost = goal_edges.get(node)
+            if goal_cost is not None:
+                neighbours = list(neighbours)
+                neighbours.append((goal, goal_cost))
+
+            for neighbour, cost in neighbours:
+                new_g = g + cost
+                if new_g >= g_score.get(neighbour, INFINITY) or neighbour in closed:
+                    continue
+                g_score[neighbour] = new_g
+                parent[neighbour] = node
+                hx = goal_x - neighbour[0]
+                hy = goal_y - neighbour[1]
+                if hx < 0:
+                    hx = -hx
+                if hy < 0:
+                    hy = -hy
+                heappush(heap, (new_g + weight * (hx + hy + diagonal * (hx if hx < hy else hy)), new_g, neighbour))
+        return None
+
+    def refine(self, start: Tile, end: Tile) -> Optional[List[Tile]]:
+        """
+        Tile steps for one abstract hop.
+
+        Returns:
+            Optional[List[Tile]]: The steps, or None if the hop is blocked
+        """
+        grid = self.grid
+        if max(abs(end[0] - start[0]), abs(end[1] - start[1])) == 1:
+            if not grid.is_passable(*end):
+                return None
+            # A diagonal step may not cut between two blocked orthogonal tiles, as in the tile search
+            if (end[0] == start[0] or end[1] == start[1]
+                    or (grid.is_passable(end[0], start[1]) and grid.is_passable(start[0], end[1]))):
+                return [end]
+        bounds = self.cluster_bounds(self.cluster_of(*start))
+        end_cluster = self.cluster_of(*end)
+        if end_cluster != self.cluster_of(*start):
+            # A corner cut on a border: walk around it through both clusters
+            end_bounds = self.cluster_bounds(end_cluster)
+            bounds = (min(bounds[0], end_bounds[0]), min(bounds[1], end_bounds[1]),
+                      max(bounds[2], end_bounds[2]), max(bounds[3], end_bounds[3]))
+        steps = self.tile_finder.find_steps(start, end, bounds=bounds)
+        if not steps or steps[-1] != end:
+            return None
+        return steps
+    # endregion
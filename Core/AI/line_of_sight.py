@@ -0,0 +1,212 @@
+"""
+Line-of-sight checks between tiles.
+
+OpacityGrid marks the tiles that block sight: terrain types listed in
+LINE_OF_SIGHT['opaque_tiles'] and the footprints of large static objects
+(trees and buildings, see LINE_OF_SIGHT['opaque_types']). LineOfSight walks a
+Bresenham line over it and caches the answer per (source tile, target tile),
+so checking every engaged attacker and target each tick costs a dictionary
+lookup once the pair has been traced. The cache is dropped whenever the
+opacity grid changes (a tree or building appears or is destroyed).
+
+The footprints of both ends never block their own line: a tower sees out of
+its own 3x3 footprint and can see a building whose anchor tile is behind the
+building's other tiles.
+"""
+
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from Core.AI.pathfinding import footprint_radius, get_footprint
+from config import LINE_OF_SIGHT
+
+
+def blocks_sight(obj: Dict[str, Any]) -> bool:
+    """Whether an object's footprint is opaque."""
+    return not obj.get('is_unit') and obj.get('type') in LINE_OF_SIGHT['opaque_types']
+
+
+class OpacityGrid:
+    """
+    Opaque/clear state of every map tile.
+
+    Terrain and object footprints are tracked separately, like PassabilityGrid,
+    so removing one tree only clears tiles no other opaque object covers.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        size = width * height
+        self.terrain = bytearray(size)  # 1 where the tile type blocks sight
+        self.blockers = array('H', bytes(2 * size))  # Number of opaque footprints per tile
+        self.cells = bytearray(size)  # 1 where opaque (terrain or a footprint)
+        self.version = 0  # Incremented on every change, for caches built on the grid
+        self.listeners: List[Callable[[int, int, int, int], None]] = []
+
+    @classmethod
+    def from_map(cls, map_data: List[List[int]], objects: Iterable[Dict[str, Any]] = (),
+                 tile_size: int = 32) -> 'OpacityGrid':
+        """
+        Build the grid for a loaded map.
+
+        Args:
+            map_data: Rows of tile indices (Game.map)
+            objects: Game objects; only those that block sight are used
+            tile_size: Size of a tile in pixels
+
+        Returns:
+            OpacityGrid: The new grid
+        """
+        height = len(map_data)
+        width = len(map_data[0]) if height else 0
+        grid = cls(width, height)
+        opaque_tiles = set(LINE_OF_SIGHT['opaque_tiles'])
+        if opaque_tiles:
+            terrain = grid.terrain
+            for y, row in enumerate(map_data):
+                base = y * width
+                for x, tile_index in enumerate(row):
+                    if tile_index in opaque_tiles:
+                        terrain[base + x] = 1
+            grid.cells[:] = terrain
+        for obj in objects:
+            grid.add_footprint(obj, tile_size)
+        grid.version = 0
+        return grid
+
+    def add_listener(self, callback: Callable[[int, int, int, int], None]) -> None:
+        """
+        Register a function called with the changed area (min_x, min_y, max_x, max_y, inclusive)
+        whenever tiles change opacity.
+        """
+        self.listeners.append(callback)
+
+    def _notify(self, min_x: int, min_y: int, max_x: int, max_y: int) -> None:
+        self.version += 1
+        for callback in self.listeners:
+            callback(min_x, min_y, max_x, max_y)
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def is_opaque(self, x: int, y: int) -> bool:
+        """Check whether a tile blocks sight (False outside the map)."""
+        return 0 <= x < self.width and 0 <= y < self.height and self.cells[y * self.width + x] == 1
+
+    def _refresh(self, index: int) -> None:
+        self.cells[index] = 1 if self.terrain[index] or self.blockers[index] else 0
+
+    def set_terrain(self, x: int, y: int, tile_index: int) -> None:
+        """Update a tile after its type changed (e.g. in the editor)."""
+        if not self.in_bounds(x, y):
+            return
+        index = y * self.width + x
+        self.terrain[index] = 1 if tile_index in LINE_OF_SIGHT['opaque_tiles'] else 0
+        self._refresh(index)
+        self._notify(x, y, x, y)
+
+    def add_footprint(self, obj: Dict[str, Any], tile_size: int = 32) -> None:
+        """Make the tiles covered by an opaque object block sight."""
+        if blocks_sight(obj):
+            self._change_footprint(obj, tile_size, 1)
+
+    def remove_footprint(self, obj: Dict[str, Any], tile_size: int = 32) -> None:
+        """Clear the tiles covered by an opaque object that was destroyed."""
+        if blocks_sight(obj):
+            self._change_footprint(obj, tile_size, -1)
+
+    def _change_footprint(self, obj: Dict[str, Any], tile_size: int, delta: int) -> None:
+        area = None
+        for x, y in get_footprint(obj, tile_size):
+            if not self.in_bounds(x, y):
+                continue
+            index = y * self.width + x
+            self.blockers[index] = max(0, self.blockers[index] + delta)
+            self._refresh(index)
+            if area is None:
+                area = [x, y, x, y]
+            else:
+                area = [min(area[0], x), min(area[1], y), max(area[2], x), max(area[3], y)]
+        if area is not None:
+            self._notify(*area)
+
+
+class LineOfSight:
+    """Cached Bresenham raycasts over an OpacityGrid."""
+
+    def __init__(self, grid: OpacityGrid, tile_size: int = 32, cache_size: Optional[int] = None):
+        self.grid = grid
+        self.tile_size = tile_size
+        self.cache_size = cache_size if cache_size is not None else LINE_OF_SIGHT['cache_size']
+        self.cache: Dict[Tuple[int, int, int, int], bool] = {}
+        self.cache_version = grid.version
+        self.hits = 0
+        self.misses = 0
+
+    def has_line(self, x0: int, y0: int, x1: int, y1: int, source_radius: int = 0, target_radius: int = 0) -> bool:
+        """
+        Whether nothing opaque lies between two tiles.
+
+        Args:
+            x0, y0: Source tile
+            x1, y1: Target tile
+            source_radius: Footprint radius around the source tile that is ignored
+            target_radius: Footprint radius around the target tile that is ignored
+        """
+        width = self.grid.width
+        start = y0 * width + x0
+        end = y1 * width + x1
+        # Bresenham lines are not symmetric: always trace from the lower index so A sees B iff B sees A
+        if end < start:
+            x0, y0, x1, y1 = x1, y1, x0, y0
+            start, end = end, start
+            source_radius, target_radius = target_radius, source_radius
+
+        if self.cache_version != self.grid.version:
+            self.cache.clear()
+            self.cache_version = self.grid.version
+        key = (start, end, source_radius, target_radius)
+        visible = self.cache.get(key)
+        if visible is not None:
+            self.hits += 1
+            return visible
+
+        self.misses += 1
+        visible = self.trace(x0, y0, x1, y1, source_radius, target_radius)
+        if len(self.cache) >= self.cache_size:
+            self.cache.clear()
+        self.cache[key] = visible
+        return visible
+
+    def between(self, source: Dict[str, Any], target: Dict[str, Any]) -> bool:
+        """has_line() between two game objects, ignoring their own footprints."""
+        tile_size = self.tile_size
+        source_radius = footprint_radius(source, tile_size) if blocks_sight(source) else 0
+        target_radius = footprint_radius(target, tile_size) if blocks_sight(target) else 0
+        return self.has_line(source['x'], source['y'], target['x'], target['y'], source_radius, target_radius)
+
+    def trace(self, x0: int, y0: int, x1: int, y1: int, source_radius: int = 0, target_radius: int = 0) -> bool:
+        """Uncached raycast: walk the Bresenham line and stop at the first opaque tile."""
+        grid = self.grid
+        width = grid.width
+        height = grid.height
+        cells = grid.cells
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        error = dx + dy
+        x, y = x0, y0
+        while x != x1 or y != y1:
+            doubled = 2 * error
+            if doubled >= dy:
+                error += dy
+                x += sx
+            if doubled <= dx:
+                error += dx
+                y += sy
+            if max(abs(x - x0), abs(y - y0)) <= source_radius or max(abs(x - x1), abs(y - y1)) <= target_radius:
+                continue
+            if 0 <= x < width and 0 <= y < height and cells[y * width + x]:
+                return False
+        return True
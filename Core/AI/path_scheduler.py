@@ -0,0 +1,177 @@
+"""
+Time-sliced path requests.
+
+Units do not search when they get an order: they submit a request and wait in
+a "thinking" state. Every tick the scheduler runs queued searches, most urgent
+first, until its microsecond budget (PATHFINDING['request_budget_us']) is used
+up, so a burst of orders is spread over several frames instead of blowing one.
+
+- priorities: player orders before AI orders before re-plans of blocked paths
+- de-duplication: requests from the same cluster and connectivity region to the
+  same goal share one search; every waiter gets the plan re-anchored on its own
+  start tile when its cluster lets it reach the first entrance of that plan
+- metrics: queue depth, requests per tick and wait time from submit to result
+"""
+
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from Core.AI.hierarchical_pathfinding import HierarchicalPathFinder, HierarchicalPath
+from config import PATHFINDING
+
+PRIORITY_PLAYER = 0
+PRIORITY_AI = 1
+PRIORITY_REPLAN = 2
+
+Tile = Tuple[int, int]
+# Called with the waiting unit's plan, or None if its goal cannot be reached
+PathCallback = Callable[[Optional[HierarchicalPath]], None]
+
+
+class PathRequest:
+    """One search, shared by every unit that asked for the same route."""
+
+    def __init__(self, key: Tuple[Any, ...], start: Tile, goal: Tile, priority: int, submitted: float):
+        self.key = key
+        self.start = start
+        self.goal = goal
+        self.priority = priority
+        self.submitted = submitted
+        self.waiters: List[Tuple[Any, Tile, PathCallback]] = []  # (owner, start tile, callback)
+
+
+class PathRequestScheduler:
+    """Queue of path requests processed under a per-tick time budget."""
+
+    def __init__(self, finder: HierarchicalPathFinder, connectivity: Optional[Any] = None,
+                 budget_us: Optional[int] = None):
+        self.finder = finder
+        self.connectivity = connectivity  # Core.AI.connectivity.ConnectivityMap
+        self.budget_us = budget_us or PATHFINDING['request_budget_us']
+        self.queue: List[Tuple[int, int, PathRequest]] = []  # Heap of (priority, order, request)
+        self.pending: Dict[Tuple[Any, ...], PathRequest] = {}
+        self.owners: Dict[int, PathRequest] = {}  # id(owner) -> request it is waiting on
+        self.order = itertools.count()
+
+        # Metrics
+        self.submitted = 0
+        self.deduplicated = 0
+        self.processed = 0
+        self.last_processed = 0  # Searches run in the last tick
+        self.last_wait_ms = 0.0  # Longest wait among requests answered in the last tick
+        self.wait_times = deque(maxlen=PATHFINDING['request_metrics_window'])
+
+    @property
+    def depth(self) -> int:
+        """Number of searches waiting to run."""
+        return len(self.pending)
+
+    def is_waiting(self, owner: Any) -> bool:
+        return id(owner) in self.owners
+
+    def submit(self, owner: Any, start: Tile, goal: Tile, callback: PathCallback,
+               priority: int = PRIORITY_PLAYER) -> None:
+        """
+        Ask for a path; callback runs during a later process() call.
+
+        A new request from the same owner replaces the one it was waiting on.
+
+        Args:
+            owner: Whatever is waiting (a unit); compared by identity
+            start: Start tile
+            goal: Goal tile
+            callback: Receives the plan, or None if the goal cannot be reached
+            priority: PRIORITY_PLAYER, PRIORITY_AI or PRIORITY_REPLAN
+        """
+        self.cancel(owner)
+        self.submitted += 1
+        region = self.connectivity.region_of(*start) if self.connectivity is not None else 0
+        key = (self.finder.cluster_of(*start), region, goal)
+
+        request = self.pending.get(key)
+        if request is None:
+            request = PathRequest(key, start, goal, priority, time.perf_counter())
+            self.pending[key] = request
+            heapq.heappush(self.queue, (priority, next(self.order), request))
+        else:
+            self.deduplicated += 1
+            if priority < request.priority:
+                # A more urgent order joined: queue the request again at the new priority
+                request.priority = priority
+                heapq.heappush(self.queue, (priority, next(self.order), request))
+        request.waiters.append((owner, start, callback))
+        self.owners[id(owner)] = request
+
+    def cancel(self, owner: Any) -> None:
+        """Stop waiting for a result (new order, unit died)."""
+        request = self.owners.pop(id(owner), None)
+        if request is None:
+            return
+        request.waiters = [waiter for waiter in request.waiters if waiter[0] is not owner]
+        if not request.waiters:
+            self.pending.pop(request.key, None)
+
+    def process(self) -> int:
+        """
+        Run queued searches until the time budget of this tick is used up.
+
+        At least one search runs per tick so the queue always drains.
+
+        Returns:
+            int: Number of searches run
+        """
+        deadline = time.perf_counter() + self.budget_us / 1e6
+        processed = 0
+        longest_wait = 0.0
+        while self.queue:
+            priority, _, request = heapq.heappop(self.queue)
+            if self.pending.get(request.key) is not request or priority != request.priority:
+                continue  # Cancelled, or a stale entry of a request that was promoted
+            del self.pending[request.key]
+
+            plan = self.finder.find_path(request.start, request.goal)
+            now = time.perf_counter()
+            wait_ms = (now - request.submitted) * 1000.0
+            self.wait_times.append(wait_ms)
+            longest_wait = max(longest_wait, wait_ms)
+            processed += 1
+
+            for owner, start, callback in request.waiters:
+                self.owners.pop(id(owner), None)
+                callback(self._plan_for(plan, request, start))
+            if now >= deadline:
+                break
+
+        self.processed += processed
+        self.last_processed = processed
+        self.last_wait_ms = longest_wait
+        return processed
+
+    def _plan_for(self, plan: Optional[HierarchicalPath], request: PathRequest,
+                  start: Tile) -> Optional[HierarchicalPath]:
+        """Re-anchor a shared plan on a waiter's own start tile."""
+        if start == request.start or plan is None:
+            return plan
+        waypoints = plan.waypoints
+        if len(waypoints) > 2 and waypoints[1] in self.finder.insertion_edges(start):
+            # The first entrance is reachable from this start inside the cluster
+            rest = waypoints[2:] if waypoints[1] == start else waypoints[1:]
+            return HierarchicalPath(self.finder, [start] + rest, plan.version)
+        # Short same-cluster plan or unreachable entrance: this waiter needs its own search
+        return self.finder.find_path(start, request.goal)
+
+    def metrics(self) -> Dict[str, float]:
+        """Queue depth, throughput and wait times (milliseconds) for the HUD and logs."""
+        waits = sorted(self.wait_times)
+        return {
+            'depth': self.depth,
+            'submitted': self.submitted,
+            'deduplicated': self.deduplicated,
+            'processed': self.processed,
+            'last_processed': self.last_processed,
+            'wait_avg_ms': sum(waits) / len(waits) if waits else 0.0,
+            'wait_p95_ms': waits[int(len(waits) * 0.95)] if waits else 0.0,
+            'wait_max_ms': waits[-1] if waits else 0.0,
+        }
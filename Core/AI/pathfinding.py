@@ -0,0 +1,426 @@
+"""
+Grid pathfinding for units.
+
+PassabilityGrid is built from the map's tile indices (water and shore tiles are
+impassable, see PATHFINDING in config.py) and from the footprints of static
+objects (buildings, trees, resources). PathFinder runs A* on it:
+
+- node state lives in flat arrays indexed by y * width + x and is never cleared;
+  a per-search stamp tells whether a slot belongs to the current search
+- the open set is a binary heap (heapq) with lazy deletion of stale entries
+- 8-way movement without corner cutting, octile distance as heuristic
+- the tile path is smoothed by dropping waypoints that are in straight
+  line-of-walk of an earlier one
+
+Paths are lists of (tile_x, tile_y) waypoints, excluding the start tile.
+"""
+
+import heapq
+import math
+from array import array
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from config import PATHFINDING
+
+if TYPE_CHECKING:
+    from Core.AI.connectivity import ConnectivityMap
+
+SQRT2 = math.sqrt(2.0)
+OCTILE_DIAGONAL = SQRT2 - 2.0
+
+# (dx, dy, cost) for the 8 neighbours; orthogonal moves first
+NEIGHBOURS = (
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, SQRT2), (-1, 1, SQRT2), (1, -1, SQRT2), (-1, -1, SQRT2),
+)
+
+
+def octile_distance(x0: int, y0: int, x1: int, y1: int) -> float:
+    """Exact path length between two tiles on an empty 8-connected grid."""
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    return dx + dy + OCTILE_DIAGONAL * min(dx, dy)
+
+
+def footprint_radius(obj: Dict[str, Any], tile_size: int = 32) -> int:
+    """Tiles a static object covers on each side of its anchor tile (1 for 128x128 sprites, else 0)."""
+    return (obj['image'].get_width() // tile_size - 1) // 2
+
+
+def get_footprint(obj: Dict[str, Any], tile_size: int = 32) -> Iterator[Tuple[int, int]]:
+    """
+    Tiles blocked by a static object.
+
+    Objects are drawn centred on their tile, so a 128x128 building covers its
+    tile and the 8 around it while 32x32 and 64x64 objects block a single tile.
+    Units never block.
+
+    Args:
+        obj: Game object dictionary
+        tile_size: Size of a tile in pixels
+
+    Yields:
+        (tile_x, tile_y) for every blocked tile
+    """
+    if obj.get('is_unit'):
+        return
+    radius = footprint_radius(obj, tile_size)
+    x, y = obj['x'], obj['y']
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            yield x + dx, y + dy
+
+
+def line_cells(x0: int, y0: int, x1: int, y1: int) -> List[Tuple[int, int]]:
+    """
+    Tiles visited walking in a straight line from (x0, y0) to (x1, y1), excluding the start.
+
+    Bresenham stepping: every step moves to one of the 8 neighbours, so the
+    result can be followed tile by tile.
+    """
+    cells = []
+    dx = abs(x1 - x0)
+    dy = -abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    error = dx + dy
+    x, y = x0, y0
+    while x != x1 or y != y1:
+        doubled = 2 * error
+        if doubled >= dy:
+            error += dy
+            x += sx
+        if doubled <= dx:
+            error += dx
+            y += sy
+        cells.append((x, y))
+    return cells
+
+
+class PassabilityGrid:
+    """
+    Walkable/blocked state of every map tile.
+
+    Terrain and object footprints are tracked separately so removing a building
+    only frees tiles whose terrain is walkable and that no other footprint covers.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        size = width * height
+        self.terrain = bytearray(b'\x01') * size  # 1 where the tile type is walkable
+        self.blockers = array('H', bytes(2 * size))  # Number of object footprints per tile
+        self.cells = bytearray(b'\x01') * size  # 1 where walkable (terrain and no footprint)
+        self.version = 0  # Incremented on every change, for caches built on the grid
+        self.listeners: List[Callable[[int, int, int, int], None]] = []
+
+    @classmethod
+    def from_map(cls, map_data: List[List[int]], objects: Iterable[Dict[str, Any]] = (),
+                 tile_size: int = 32) -> 'PassabilityGrid':
+        """
+        Build the grid for a loaded map.
+
+        Args:
+            map_data: Rows of tile indices (Game.map)
+            objects: Game objects whose footprints block movement
+            tile_size: Size of a tile in pixels
+
+        Returns:
+            PassabilityGrid: The new grid
+        """
+        height = len(map_data)
+        width = len(map_data[0]) if height else 0
+        grid = cls(width, height)
+        blocked_tiles = set(PATHFINDING['blocked_tiles'])
+        terrain = grid.terrain
+        for y, row in enumerate(map_data):
+            base = y * width
+            for x, tile_index in enumerate(row):
+                if tile_index in blocked_tiles:
+                    terrain[base + x] = 0
+        grid.cells[:] = terrain
+        for obj in objects:
+            grid.add_footprint(obj, tile_size)
+        grid.version = 0
+        return grid
+
+    def add_listener(self, callback: Callable[[int, int, int, int], None]) -> None:
+        """
+        Register a function called with the changed area (min_x, min_y, max_x, max_y, inclusive)
+        whenever tiles change walkability state.
+        """
+        self.listeners.append(callback)
+
+    def _notify(self, min_x: int, min_y: int, max_x: int, max_y: int) -> None:
+        self.version += 1
+        for callback in self.listeners:
+            callback(min_x, min_y, max_x, max_y)
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def is_passable(self, x: int, y: int) -> bool:
+        """Check whether a unit can stand on a tile (False outside the map)."""
+        return 0 <= x < self.width and 0 <= y < self.height and self.cells[y * self.width + x] == 1
+
+    def _refresh(self, index: int) -> None:
+        self.cells[index] = 1 if self.terrain[index] and not self.blockers[index] else 0
+
+    def set_terrain(self, x: int, y: int, tile_index: int) -> None:
+        """Update a tile after its type changed (e.g. in the editor)."""
+        if not self.in_bounds(x, y):
+            return
+        index = y * self.width + x
+        self.terrain[index] = 0 if tile_index in PATHFINDING['blocked_tiles'] else 1
+        self._refresh(index)
+        self._notify(x, y, x, y)
+
+    def add_footprint(self, obj: Dict[str, Any], tile_size: int = 32) -> None:
+        """Block the tiles covered by a static object."""
+        self._change_footprint(obj, tile_size, 1)
+
+    def remove_footprint(self, obj: Dict[str, Any], tile_size: int = 32) -> None:
+        """Release the tiles covered by a static object that was destroyed."""
+        self._change_footprint(obj, tile_size, -1)
+
+    def _change_footprint(self, obj: Dict[str, Any], tile_size: int, delta: int) -> None:
+        area = None
+        for x, y in get_footprint(obj, tile_size):
+            if not self.in_bounds(x, y):
+                continue
+            index = y * self.width + x
+            self.blockers[index] = max(0, self.blockers[index] + delta)
+            self._refresh(index)
+            if area is None:
+                area = [x, y, x, y]
+            else:
+                area = [min(area[0], x), min(area[1], y), max(area[2], x), max(area[3], y)]
+        if area is not None:
+            self._notify(*area)
+
+    def nearest_passable(self, x: int, y: int, max_radius: int = 8) -> Optional[Tuple[int, int]]:
+        """
+        Closest walkable tile to (x, y), searching square rings outwards.
+
+        Returns:
+            Optional[Tuple[int, int]]: The tile, or None if none within max_radius
+        """
+        if self.is_passable(x, y):
+            return x, y
+        for radius in range(1, max_radius + 1):
+            best = None
+            best_distance = 0.0
+            for dy in range(-radius, radius + 1):
+                step = 1 if abs(dy) == radius else 2 * radius
+                for dx in range(-radius, radius + 1, step):
+                    if self.is_passable(x + dx, y + dy):
+                        distance = octile_distance(0, 0, dx, dy)
+                        if best is None or distance < best_distance:
+                            best = (x + dx, y + dy)
+                            best_distance = distance
+            if best is not None:
+                return best
+        return None
+
+    def is_line_walkable(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        """Check that every step of the straight line between two tiles is walkable without cutting corners."""
+        width = self.width
+        cells = self.cells
+        x, y = x0, y0
+        for nx, ny in line_cells(x0, y0, x1, y1):
+            if not self.is_passable(nx, ny):
+                return False
+            if nx != x and ny != y:
+                # Diagonal step: both orthogonal neighbours must be free as well
+                if not cells[y * width + nx] or not cells[ny * width + x]:
+                    return False
+            x, y = nx, ny
+        return True
+
+
+class PathFinder:
+    """A* search on a PassabilityGrid."""
+
+    def __init__(self, grid: PassabilityGrid, connectivity: Optional['ConnectivityMap'] = None):
+        self.grid = grid
+        self.connectivity = connectivity  # Core.AI.connectivity.ConnectivityMap, to reject unreachable goals early
+        size = grid.width * grid.height
+        self.g_score = array('d', bytes(8 * size))
+        self.parent = array('l', bytes(array('l').itemsize * size))
+        self.seen = array('L', bytes(array('L').itemsize * size))  # Search id that last touched the node
+        self.closed = array('L', bytes(array('L').itemsize * size))  # Search id that expanded the node
+        self.search_id = 0
+        self.last_expanded = 0  # Nodes expanded by the last search, for benchmarks and metrics
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int], smooth: bool = True,
+                  allow_partial: bool = False, max_expansions: Optional[int] = None,
+                  bounds: Optional[Tuple[int, int, int, int]] = None) -> List[Tuple[int, int]]:
+        """
+        Find a path between two tiles.
+
+        If the goal is blocked (e.g. a building) the closest walkable tile is used instead.
+
+        Args:
+            start: Start tile
+            goal: Goal tile
+            smooth: Remove waypoints that are in straight walkable line of each other
+            allow_partial: When the goal is unreachable, return a path to the explored
+                           tile closest to it instead of an empty path
+            max_expansions: Give up after expanding this many nodes
+                            (defaults to PATHFINDING['max_expansions'])
+            bounds: Optional (min_x, min_y, max_x, max_y) area the search may not leave
+
+        Returns:
+            List[Tuple[int, int]]: Waypoints excluding the start, empty if there is no path
+        """
+        grid = self.grid
+        if not grid.in_bounds(*start):
+            return []
+        if not grid.is_passable(*goal):
+            goal = grid.nearest_passable(goal[0], goal[1])
+            if goal is None:
+                return []
+        if start == goal:
+            return []
+        if not allow_partial and not self.may_reach(start, goal):
+            return []
+
+        end_index = self._search(start, goal, allow_partial,
+                                 max_expansions or PATHFINDING['max_expansions'],
+                                 bounds or (0, 0, grid.width - 1, grid.height - 1))
+        if end_index < 0:
+            return []
+        path = self._reconstruct(end_index)
+        if smooth:
+            path = self.smooth_path(start, path)
+        return path
+
+    def may_reach(self, start: Tuple[int, int], goal: Tuple[int, int]) -> bool:
+        """O(1) check against the connectivity regions (always True without them)."""
+        connectivity = self.connectivity
+        if connectivity is None:
+            return True
+        start_region = connectivity.region_of(*start)
+        # A unit standing on a blocked tile (e.g. just spawned) can still step off it
+        return not start_region or start_region == connectivity.region_of(*goal)
+
+    def find_steps(self, start: Tuple[int, int], goal: Tuple[int, int],
+                   bounds: Optional[Tuple[int, int, int, int]] = None) -> List[Tuple[int, int]]:
+        """Find a path and return it as single tile steps (smoothed, then expanded)."""
+        return self.expand_path(start, self.find_path(start, goal, bounds=bounds))
+
+    def _search(self, start: Tuple[int, int], goal: Tuple[int, int], allow_partial: bool,
+                max_expansions: int, bounds: Tuple[int, int, int, int]) -> int:
+        """Run A* and return the index of the final node, or -1."""
+        grid = self.grid
+        width = grid.width
+        min_x, min_y, max_x, max_y = bounds
+        cells = grid.cells
+        g_score = self.g_score
+        parent = self.parent
+        seen = self.seen
+        closed = self.closed
+
+        self.search_id += 1
+        search_id = self.search_id
+        goal_x, goal_y = goal
+        start_index = start[1] * width + start[0]
+        goal_index = goal_y * width + goal_x
+
+        g_score[start_index] = 0.0
+        parent[start_index] = -1
+        seen[start_index] = search_id
+        start_h = octile_distance(start[0], start[1], goal_x, goal_y)
+        open_heap = [(start_h, start_h, start_index)]
+        best_index = start_index
+        best_h = start_h
+        expanded = 0
+        heappop = heapq.heappop
+        heappush = heapq.heappush
+
+        while open_heap:
+            f, h, index = heappop(open_heap)
+            if closed[index] == search_id:
+                continue  # Stale entry, a cheaper one was already expanded
+            closed[index] = search_id
+            if index == goal_index:
+                self.last_expanded = expanded
+                return index
+            if h < best_h:
+                best_h = h
+                best_index = index
+            expanded += 1
+            if expanded >= max_expansions:
+                break
+
+            x = index % width
+            y = index // width
+            g = g_score[index]
+            for dx, dy, cost in NEIGHBOURS:
+                nx = x + dx
+                ny = y + dy
+                if nx < min_x or ny < min_y or nx > max_x or ny > max_y:
+                    continue
+                neighbour = ny * width + nx
+                if not cells[neighbour] or closed[neighbour] == search_id:
+                    continue
+                if dx and dy and (not cells[y * width + nx] or not cells[ny * width + x]):
+                    continue  # No corner cutting
+                new_g = g + cost
+                if seen[neighbour] == search_id and new_g >= g_score[neighbour]:
+                    continue
+                seen[neighbour] = search_id
+                g_score[neighbour] = new_g
+                parent[neighbour] = index
+                hx = abs(goal_x - nx)
+                hy = abs(goal_y - ny)
+                nh = hx + hy + OCTILE_DIAGONAL * (hx if hx < hy else hy)
+                heappush(open_heap, (new_g + nh, nh, neighbour))
+
+        self.last_expanded = expanded
+        if allow_partial and best_index != start_index:
+            return best_index
+        return -1
+
+    def _reconstruct(self, end_index: int) -> List[Tuple[int, int]]:
+        width = self.grid.width
+        parent = self.parent
+        path = []
+        index = end_index
+        while parent[index] != -1:
+            path.append((index % width, index // width))
+            index = parent[index]
+        path.reverse()
+        return path
+
+    def smooth_path(self, start: Tuple[int, int], path: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Drop intermediate waypoints that can be reached in a straight walkable line.
+
+        Args:
+            start: Tile the path starts from
+            path: Waypoints excluding the start
+
+        Returns:
+            List[Tuple[int, int]]: The smoothed waypoints (the last one is kept)
+        """
+        if len(path) < 2:
+            return path
+        grid = self.grid
+        smoothed = []
+        anchor = start
+        for i in range(1, len(path)):
+            if not grid.is_line_walkable(anchor[0], anchor[1], path[i][0], path[i][1]):
+                anchor = path[i - 1]
+                smoothed.append(anchor)
+        smoothed.append(path[-1])
+        return smoothed
+
+    def expand_path(self, start: Tuple[int, int], waypoints: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Turn smoothed waypoints back into single tile steps."""
+        steps = []
+        x, y = start
+        for wx, wy in waypoints:
+            steps.extend(line_cells(x, y, wx, wy))
+            x, y = wx, wy
+        return steps
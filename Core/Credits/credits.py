@@ -1,6 +1,7 @@
 import pygame
 from Core.UI.base_screen import BaseScreen
 from Core.UI.button import Button
+from Core.Utils.asset_cache import AssetCache
 
 class CreditsScreen(BaseScreen):
     def __init__(self, screen):
@@ -10,10 +11,11 @@ class CreditsScreen(BaseScreen):
         self.panel_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
 
         # Load background image based on screen width
+        asset_cache = AssetCache()
         if self.screen_width <= 1024:
-            self.background = pygame.image.load("Images/credits_background.jpg")
+            self.background = asset_cache.get_image("Images/credits_background.jpg")
         else:
-            self.background = pygame.image.load("Images/credits_background_x4.jpg")
+            self.background = asset_cache.get_image("Images/credits_background_x4.jpg")
 
         # Create back button
         button_width = 200
@@ -24,12 +26,15 @@ class CreditsScreen(BaseScreen):
         self.back_button = Button(start_x, start_y, 1, 0, button_width, button_height, "Back", self.go_back, "Images/menu_button.png", "Images/menu_button_glow.png", glow_behind=True)
 
         # Load hover sound effect
-        self.hover_sound = pygame.mixer.Sound("Sounds/hover.wav")
+        self.hover_sound = asset_cache.get_sound("Sounds/hover.wav")
+        self.hovered_button = None
+
+    def resume(self):
+        super().resume()
         self.hovered_button = None
 
     def go_back(self):
-        from Core.Menu.main_menu import MainMenu
-        return MainMenu(self.screen)
+        return "main_menu"
 
     def handle_events(self, event):
         if event.type == pygame.QUIT:
@@ -1,6 +1,10 @@
 import pygame
 import os
 import json
+from Core.Utils import instrumentation
+from Core.Utils import memory_report
+from Core.Utils.asset_cache import AssetCache
+from Core.Utils.rotation_cache import RotationCache
 
 class AnimationManager:
     def __init__(self):
@@ -9,9 +13,9 @@ class AnimationManager:
         self.last_update = {}  # Track last update time for each object
         self.object_metadata = {}  # Cache for object metadata
         self.animation_states = {}  # Track current animation state for each object
-        self.current_directions = {}  # Track current direction for each object
-        self.target_directions = {}  # Track target direction for each object
-        self.rotation_speed = 50  # Time in milliseconds between direction changes
+        self.object_animations = {}  # Track the animation cache keys loaded for each object
+        memory_report.register('AnimationManager.animations', self, 'animations', 'animations',
+                               memory_report.animation_object_type)
 
     def load_object_metadata(self, object_type, object_id):
         """Load and cache object metadata from JSON"""
@@ -27,6 +31,7 @@ class AnimationManager:
                 return metadata
         return None
 
+    @instrumentation.traced("AnimationManager.load_animation", "assets")
     def load_animation(self, object_type, object_id, object_unique_id, animation_type, direction=0):
         """Load animation frames for a specific object and animation type"""
         cache_key = f"{object_type}{object_id}_{object_unique_id}_{animation_type}_{direction}"
@@ -46,8 +51,9 @@ class AnimationManager:
             # For static animations, we just need the single frame for the given direction
             frame_path = os.path.join(base_path, "static", f"{direction}.png")
             if os.path.exists(frame_path):
-                frame = pygame.image.load(frame_path).convert_alpha()
+                frame = AssetCache().get_image(frame_path, alpha=True)
                 self.animations[cache_key] = [frame]
+                self.object_animations.setdefault(object_unique_id, []).append(cache_key)
                 return self.animations[cache_key]
             return None
         else:
@@ -60,11 +66,12 @@ class AnimationManager:
                     frame_path = os.path.join(anim_path, f"{frame_index}.png")
                     if not os.path.exists(frame_path):
                         break
-                    frame = pygame.image.load(frame_path).convert_alpha()
+                    frame = AssetCache().get_image(frame_path, alpha=True)
                     frames.append(frame)
                     frame_index += 1
                 if frames:
                     self.animations[cache_key] = frames
+                    self.object_animations.setdefault(object_unique_id, []).append(cache_key)
                     return self.animations[cache_key]
             return None
 
@@ -75,53 +82,26 @@ class AnimationManager:
             self.animation_states[object_unique_id] = state
             self.reset_animation(object_unique_id)
 
-    def get_current_direction(self, object_unique_id):
-        """Get the current direction for an object"""
-        if object_unique_id not in self.current_directions:
-            self.current_directions[object_unique_id] = 0
-        return self.current_directions[object_unique_id]
-
-    def set_target_direction(self, object_unique_id, target_direction, turret_direction = 0):
-        """Set the target direction for an object"""
-        self.target_directions[object_unique_id] = target_direction
-        if object_unique_id not in self.current_directions:
-            self.current_directions[object_unique_id] = turret_direction
-        if object_unique_id not in self.last_update:
-            self.last_update[object_unique_id] = pygame.time.get_ticks()
+    def get_rotation_steps(self, object_type, object_id):
+        """Directions an object's sprites are rotated to at runtime ("rotation_steps" in its visuals), 0 if none"""
+        metadata = self.load_object_metadata(object_type, object_id)
+        return metadata.get('visuals', {}).get('rotation_steps', 0) if metadata else 0
 
-    def update_rotation(self, object_unique_id):
-        """Update the rotation of an object towards its target direction"""
-        if object_unique_id not in self.target_directions or object_unique_id not in self.current_directions:
-            return
-
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_update[object_unique_id] >= self.rotation_speed:
-            current = self.current_directions[object_unique_id]
-            target = self.target_directions[object_unique_id]
-
-            # Calculate the shortest path to the target direction
-            diff = (target - current) % 360
-            if diff > 180:
-                diff -= 360
-
-            # Move one step (45 degrees) closer to the target
-            if abs(diff) > 45:
-                if diff > 0:
-                    self.current_directions[object_unique_id] = (current + 45) % 360
-                else:
-                    self.current_directions[object_unique_id] = (current - 45) % 360
-                self.last_update[object_unique_id] = current_time
-            else:
-                # If we're within one step, go directly to target
-                self.current_directions[object_unique_id] = target
+    def rotate_frame(self, object_id, object_type, animation_type, frame_index, frame, angle, steps):
+        """Variant of a direction 0 frame closest to angle, from the shared rotation cache"""
+        return RotationCache().get((object_type, object_id, animation_type, frame_index), frame, angle, steps)
 
+    def get_next_frame(self, object_id, object_type, object_unique_id, animation_type="static", direction=0, animation_speed=100,
+                       angle=None):
+        """
+        Get the current animation frame for an object (direction is the turret direction for turrets).
 
-    def get_next_frame(self, object_id, object_type, object_unique_id, animation_type="static", direction=0, animation_speed=100):
-        """Get the current animation frame for an object"""
-        # Update rotation if this is a turret
-        if object_type == 'building' and object_id == 3:
-            self.update_rotation(object_unique_id)
-            direction = self.get_current_direction(object_unique_id)
+        Objects with "rotation_steps" in their visuals are drawn from their direction 0
+        frames rotated to angle instead of the exported direction folders.
+        """
+        steps = self.get_rotation_steps(object_type, object_id) if angle is not None else 0
+        if steps:
+            direction = 0
 
         # Get the current animation state
         current_state = self.animation_states.get(object_unique_id, "static")
@@ -148,6 +128,8 @@ class AnimationManager:
 
         # If it's a static animation or no animation speed, return the first frame
         if animation_type == "static" or animation_speed == 0:
+            if steps:
+                return self.rotate_frame(object_id, object_type, animation_type, 0, frames[0], angle, steps)
             return frames[0]
 
         # For fire animations, use a faster speed (50ms per frame)
@@ -171,11 +153,16 @@ class AnimationManager:
             if animation_type == "destruction" and self.current_frames[object_unique_id] == 0:
                 return "DESTROYED"
 
-        return frames[self.current_frames[object_unique_id]]
+        frame_index = self.current_frames[object_unique_id]
+        if steps:
+            return self.rotate_frame(object_id, object_type, animation_type, frame_index, frames[frame_index], angle, steps)
+        return frames[frame_index]
     
-    def get_current_frame(self, object_id, object_type, object_unique_id):
+    def get_current_frame(self, object_id, object_type, object_unique_id, direction=0, angle=None):
         animation_type = self.animation_states.get(object_unique_id, "static")
-        direction = self.get_current_direction(object_unique_id)
+        steps = self.get_rotation_steps(object_type, object_id) if angle is not None else 0
+        if steps:
+            direction = 0
         cache_key = f"{object_type}{object_id}_{object_unique_id}_{animation_type}_{direction}"
         frames = self.animations.get(cache_key)
         if not frames:
@@ -184,8 +171,18 @@ class AnimationManager:
             if not frames:
                 return None
 
-        return frames[self.current_frames[object_unique_id]]
+        frame_index = self.current_frames[object_unique_id]
+        if steps:
+            return self.rotate_frame(object_id, object_type, animation_type, frame_index, frames[frame_index], angle, steps)
+        return frames[frame_index]
+
 
+    def forget(self, object_unique_id):
+        """Drop the frames and animation state of an object that left the game"""
+        for cache_key in self.object_animations.pop(object_unique_id, ()):
+            self.animations.pop(cache_key, None)
+        for state in (self.current_frames, self.last_update, self.animation_states):
+            state.pop(object_unique_id, None)
 
     def reset_animation(self, object_unique_id):
         """Reset animation state for an object"""
@@ -0,0 +1,328 @@
+"""
+Weapons, engagements and damage.
+
+Weapon stats are resolved once, when an armed object (one with an
+"attack_range" property) enters the game, into a Weapon component: squared
+range in tiles, cooldown, damage, projectile speed and the muzzle offset of
+every turret direction, splash and homing. The attack loop never reads JSON
+metadata.
+
+Active engagements (an attacker firing at a target) live in dense NumPy rows
+like the MovementSystem's. Each tick CombatSystem.update() gathers the tile
+positions of both sides and evaluates range, readiness and target death for
+all engagements in one pass; Python only runs for the engagements that ended
+or have a shot ready. Line of sight is checked for the latter, right before
+firing.
+
+Damage is not applied where it is dealt: hits are queued with queue_damage()
+and apply_damage() subtracts the total per target once per tick, returning
+the objects it killed. A projectile impact (queue_impact()) queues its
+target's damage plus, for weapons with a "splash_radius", falloff damage for
+the hostile objects found by one radius query on the SpatialIndex around the
+impact point, so many simultaneous impacts never scan the object list.
+"""
+
+import math
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from Core.Game.spatial_index import SpatialIndex
+from Core.Game.targeting import is_hostile
+from Core.Utils.directions import EIGHT_DIRECTIONS
+from config import COMBAT
+
+# Where projectiles leave the turret, in pixels from the centre of the attacker's tile, per turret direction
+DEFAULT_MUZZLE_OFFSETS = {
+    0: (0, -7), 45: (13, -8), 90: (32, -16), 135: (21, -32),
+    180: (0, -32), 225: (-21, -32), 270: (-32, -16), 315: (-13, -8)
+}
+
+# Reasons an engagement ends
+ENDED_HALTED = 'halted'
+ENDED_DESTROYED = 'destroyed'  # The target died
+ENDED_OUT_OF_RANGE = 'out_of_range'
+ENDED_NO_LINE_OF_SIGHT = 'no_line_of_sight'
+
+
+class Weapon:
+    """Attack stats of an armed object, resolved from its metadata once."""
+
+    __slots__ = ('range', 'range_sq', 'cooldown', 'damage', 'projectile_speed', 'muzzle_offsets', 'directions',
+                 'splash_radius', 'splash_falloff', 'homing', 'turn_rate')
+
+    def __init__(self, attack_range: float, cooldown: int, damage: int, projectile_speed: float,
+                 muzzle_offsets: Dict[int, Tuple[int, int]], directions: Sequence[int],
+                 splash_radius: float = 0.0, splash_falloff: float = 1.0, homing: bool = False,
+                 turn_rate: float = 0.0):
+        self.range = attack_range  # Tiles
+        self.range_sq = attack_range * attack_range
+        self.cooldown = cooldown  # Milliseconds between shots
+        self.damage = damage
+        self.projectile_speed = projectile_speed  # Pixels per tick
+        self.muzzle_offsets = muzzle_offsets
+        self.directions = tuple(directions)
+        self.splash_radius = splash_radius  # Tiles around the impact hurt by a hit, 0 for no splash
+        self.splash_falloff = splash_falloff  # Fraction of the damage lost from the impact point to the splash edge
+        self.homing = homing  # Projectiles follow the target
+        self.turn_rate = turn_rate  # Degrees per tick a homing projectile can turn
+
+
+def resolve_weapon(obj: Dict[str, Any], metadata: Optional[Dict[str, Any]]) -> Optional[Weapon]:
+    """Weapon of an object, or None if it cannot attack."""
+    properties = (metadata or {}).get('properties', {})
+    attack_range = properties.get('attack_range', 0)
+    if attack_range <= 0:
+        return None
+    muzzle_offsets = dict(DEFAULT_MUZZLE_OFFSETS)
+    for direction, offset in properties.get('muzzle_offsets', {}).items():
+        muzzle_offsets[int(direction)] = (offset[0], offset[1])
+    return Weapon(
+        attack_range,
+        properties.get('cooldown', COMBAT['cooldown']),
+        properties.get('damage', obj.get('damage', COMBAT['damage'])),
+        properties.get('projectile_speed', COMBAT['projectile_speed']),
+        muzzle_offsets,
+        (metadata or {}).get('visuals', {}).get('directions', EIGHT_DIRECTIONS),
+        properties.get('splash_radius', 0.0),
+        min(1.0, max(0.0, properties.get('splash_falloff', COMBAT['splash_falloff']))),
+        properties.get('homing', False),
+        properties.get('turn_rate', COMBAT['turn_rate'])
+    )
+
+
+class CombatSystem:
+    """Weapon components of armed objects, their active engagements and the damage queue."""
+
+    def __init__(self, spatial_index: SpatialIndex, capacity: int = 64):
+        self.spatial_index = spatial_index
+        self.weapons: Dict[int, Weapon] = {}  # id(obj) -> Weapon
+        self.count = 0
+        self.attackers: List[Dict[str, Any]] = []
+        self.targets: List[Dict[str, Any]] = []
+        self.slots: Dict[int, int] = {}  # id(attacker) -> row in the arrays
+        self.damage_queue: List[Tuple[Dict[str, Any], int, Optional[Dict[str, Any]]]] = []  # (target, amount, source)
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """(Re)allocate the arrays, keeping the rows in use."""
+        count = self.count
+        arrays = {
+            'range_sq': np.zeros(capacity, dtype=np.float64),
+            'cooldown': np.zeros(capacity, dtype=np.float64),
+            'last_fire': np.zeros(capacity, dtype=np.float64),  # Time of the attacker's last shot
+            'mortal': np.zeros(capacity, dtype=bool),  # False for targets with infinite health
+        }
+        for name, array in arrays.items():
+            if count:
+                array[:count] = getattr(self, name)[:count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return self.count
+
+    # region Weapons
+    def register(self, obj: Dict[str, Any], metadata: Optional[Dict[str, Any]]) -> Optional[Weapon]:
+        """Resolve and store the weapon of an object that enters the game (nothing for unarmed objects)."""
+        weapon = resolve_weapon(obj, metadata)
+        if weapon is not None:
+            self.weapons[id(obj)] = weapon
+        return weapon
+
+    def weapon(self, obj: Dict[str, Any]) -> Optional[Weapon]:
+        return self.weapons.get(id(obj))
+
+    def forget(self, gone: Set[int]) -> None:
+        """Drop the weapons of objects that left the game (ids in gone) and every engagement involving them."""
+        for key in gone:
+            self.weapons.pop(key, None)
+        ended = [attacker for attacker, target in zip(self.attackers, self.targets)
+                 if id(attacker) in gone or id(target) in gone]
+        for attacker in ended:
+            self.disengage(attacker)
+
+    def clear(self) -> None:
+        self.weapons = {}
+        self.count = 0
+        self.attackers = []
+        self.targets = []
+        self.slots = {}
+        self.damage_queue = []
+
+    def muzzle_position(self, attacker: Dict[str, Any], weapon: Weapon, tile_size: int) -> Tuple[int, int]:
+        """World pixel position projectiles leave the attacker from, for its current turret direction."""
+        offset_x, offset_y = weapon.muzzle_offsets.get(attacker['turret_direction'], (0, 0))
+        return (attacker['x'] * tile_size + tile_size // 2 + offset_x,
+                attacker['y'] * tile_size + tile_size // 2 + offset_y)
+    # endregion
+
+    # region Engagements
+    def engage(self, attacker: Dict[str, Any], target: Dict[str, Any], now: int) -> bool:
+        """
+        Start (or retarget) an attacker's engagement; the first shot is ready at once.
+
+        Returns:
+            bool: False if the attacker has no weapon
+        """
+        weapon = self.weapons.get(id(attacker))
+        if weapon is None:
+            return False
+        slot = self.slots.get(id(attacker))
+        if slot is None:
+            if self.count == self.capacity:
+                self._allocate(self.capacity * 2)
+            slot = self.count
+            self.count += 1
+            self.attackers.append(attacker)
+            self.targets.append(target)
+            self.slots[id(attacker)] = slot
+        else:
+            self.targets[slot] = target
+        self.range_sq[slot] = weapon.range_sq
+        self.cooldown[slot] = weapon.cooldown
+        self.last_fire[slot] = now - weapon.cooldown
+        self.mortal[slot] = target.get('max_health', 100) != -1
+        return True
+
+    def disengage(self, attacker: Dict[str, Any]) -> bool:
+        """End an attacker's engagement; the last row is moved into its slot to keep the arrays dense."""
+        slot = self.slots.pop(id(attacker), None)
+        if slot is None:
+            return False
+        last = self.count - 1
+        if slot != last:
+            moved = self.attackers[last]
+            self.attackers[slot] = moved
+            self.targets[slot] = self.targets[last]
+            self.slots[id(moved)] = slot
+            for array in (self.range_sq, self.cooldown, self.last_fire, self.mortal):
+                array[slot] = array[last]
+        self.attackers.pop()
+        self.targets.pop()
+        self.count = last
+        return True
+
+    def is_engaged(self, attacker: Dict[str, Any]) -> bool:
+        return id(attacker) in self.slots
+
+    def target_of(self, attacker: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        slot = self.slots.get(id(attacker))
+        return self.targets[slot] if slot is not None else None
+
+    def fired(self, attacker: Dict[str, Any], now: int) -> None:
+        """Record a shot; the attacker's next one is ready a cooldown later."""
+        self.last_fire[self.slots[id(attacker)]] = now
+
+    def update(self, now: int, can_see: Optional[Callable[[Dict[str, Any], Dict[str, Any]], bool]] = None
+               ) -> Tuple[List[Tuple[Dict[str, Any], Dict[str, Any], str]], List[Tuple[Dict[str, Any], Dict[str, Any], Weapon]]]:
+        """
+        Evaluate every engagement and end those that cannot go on.
+
+        An engagement ends when the attacker was halted (its 'is_attacking'
+        flag set to False), the target died, the target left the range, or,
+        for a shot that is ready, when the attacker cannot see the target.
+
+        Args:
+            now: Current time in milliseconds
+            can_see: Optional line of sight test, (attacker, target) -> bool
+
+        Returns:
+            Tuple: (attacker, target, reason) for the engagements that ended, and
+                   (attacker, target, weapon) for those with a shot ready
+        """
+        count = self.count
+        if not count:
+            return [], []
+        attackers, targets = self.attackers, self.targets
+        tiles = np.fromiter(chain.from_iterable((attacker['x'], attacker['y'], target['x'], target['y'])
+                                                for attacker, target in zip(attackers, targets)),
+                            dtype=np.int64, count=4 * count).reshape(count, 4)
+        health = np.fromiter((target['health'] for target in targets), dtype=np.float64, count=count)
+        halted = np.fromiter((attacker.get('is_attacking') is False for attacker in attackers), dtype=bool, count=count)
+
+        dx = tiles[:, 2] - tiles[:, 0]
+        dy = tiles[:, 3] - tiles[:, 1]
+        destroyed = ~halted & self.mortal[:count] & (health <= 0)
+        active = ~halted & ~destroyed
+        out_of_range = active & (dx * dx + dy * dy > self.range_sq[:count])
+        ready = active & ~out_of_range & (now - self.last_fire[:count] >= self.cooldown[:count])
+
+        ended = []
+        for reason, mask in ((ENDED_HALTED, halted), (ENDED_DESTROYED, destroyed), (ENDED_OUT_OF_RANGE, out_of_range)):
+            for slot in np.flatnonzero(mask).tolist():
+                ended.append((attackers[slot], targets[slot], reason))
+        shots = []
+        for slot in np.flatnonzero(ready).tolist():
+            attacker, target = attackers[slot], targets[slot]
+            if can_see is not None and not can_see(attacker, target):
+                ended.append((attacker, target, ENDED_NO_LINE_OF_SIGHT))
+            else:
+                shots.append((attacker, target, self.weapons[id(attacker)]))
+        for attacker, _, _ in ended:
+            self.disengage(attacker)
+        return ended, shots
+    # endregion
+
+    # region Damage
+    def queue_damage(self, target: Dict[str, Any], amount: int, source: Optional[Dict[str, Any]] = None) -> None:
+        """Deal damage at the next apply_damage() (targets with infinite health are ignored then)."""
+        self.damage_queue.append((target, amount, source))
+
+    def queue_impact(self, position: Tuple[float, float], tile_size: int, weapon: Weapon,
+                     target: Optional[Dict[str, Any]], source: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Queue the damage of a projectile landing at a world pixel position.
+
+        The target takes the weapon's full damage. With splash, every other
+        object within splash_radius tiles of the impact takes damage falling
+        off linearly with distance, down to (1 - splash_falloff) of it at the
+        edge. Only objects hostile to the source are splashed unless
+        COMBAT['splash_friendly_fire'] is set.
+        """
+        if target is not None:
+            self.queue_damage(target, weapon.damage, source)
+        radius = weapon.splash_radius
+        if radius <= 0:
+            return
+        # Impact point in tile units, on the same grid as object anchors (tile centres)
+        x = position[0] / tile_size - 0.5
+        y = position[1] / tile_size - 0.5
+        friendly_fire = COMBAT['splash_friendly_fire'] or source is None
+        falloff = weapon.splash_falloff / radius
+        for obj in self.spatial_index.query_radius(x, y, radius):
+            if obj is target or obj is source or obj.get('max_health', 100) == -1:
+                continue
+            if not friendly_fire and not is_hostile(source, obj):
+                continue
+            amount = int(round(weapon.damage * (1.0 - falloff * math.hypot(obj['x'] - x, obj['y'] - y))))
+            if amount > 0:
+                self.queue_damage(obj, amount, source)
+
+    def apply_damage(self) -> List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """
+        Apply the queued damage, one subtraction per target.
+
+        Returns:
+            list: (target, source of the killing hit) for every object this killed
+        """
+        if not self.damage_queue:
+            return []
+        totals: Dict[int, List[Any]] = {}  # id(target) -> [target, total damage, last source]
+        for target, amount, source in self.damage_queue:
+            entry = totals.get(id(target))
+            if entry is None:
+                totals[id(target)] = [target, amount, source]
+            else:
+                entry[1] += amount
+                entry[2] = source
+        self.damage_queue = []
+
+        killed = []
+        for target, amount, source in totals.values():
+            if target.get('max_health', 100) == -1 or target['health'] <= 0:
+                continue
+            target['health'] -= amount
+            if target['health'] <= 0:
+                killed.append((target, source))
+        return killed
+    # endregion
@@ -0,0 +1,92 @@
+"""
+Credit income of every faction.
+
+Ore processors (buildings with "is_ore_gold" or "is_ore_iron" and a
+"profit_rate") register when they appear and unregister when they die or turn
+back into a resource, and the registry keeps each faction's income per tick up
+to date as that happens (set_faction() moves a producer to another owner). The income tick itself is then one lookup per
+faction instead of a metadata lookup for every object on the map.
+
+The last ECONOMY['history_ticks'] incomes of each faction are kept for the UI
+and for AI players.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from Core.Game.targeting import FACTION_NEUTRAL
+from config import ECONOMY
+
+
+def get_profit_rate(obj: Dict[str, Any], metadata: Optional[Dict[str, Any]]) -> int:
+    """Credits an ore processor makes per income tick (0 for anything else)."""
+    if obj.get('type') != 'building' or not metadata:
+        return 0
+    properties = metadata.get('properties', {})
+    if not (properties.get('is_ore_gold', False) or properties.get('is_ore_iron', False)):
+        return 0
+    return properties.get('profit_rate', 0)
+
+
+class Economy:
+    """Registry of producing buildings with running income totals per faction."""
+
+    def __init__(self, history_ticks: Optional[int] = None):
+        self.history_ticks = history_ticks if history_ticks is not None else ECONOMY['history_ticks']
+        self.producers: Dict[int, Tuple[int, int]] = {}  # id(obj) -> (faction, profit rate)
+        self.income: Dict[int, int] = {}  # Faction -> credits per tick
+        self.history: Dict[int, Deque[int]] = {}  # Faction -> income of the last ticks, oldest first
+
+    def register(self, obj: Dict[str, Any], metadata: Optional[Dict[str, Any]]) -> None:
+        """Start counting an object's income if it is an ore processor."""
+        rate = get_profit_rate(obj, metadata)
+        if rate <= 0 or id(obj) in self.producers or obj['health'] <= 0:
+            return
+        faction = obj.get('faction', FACTION_NEUTRAL)
+        self.producers[id(obj)] = (faction, rate)
+        self.income[faction] = self.income.get(faction, 0) + rate
+
+    def unregister(self, obj: Dict[str, Any]) -> None:
+        """Stop counting an object's income (destroyed or converted); safe to call more than once."""
+        producer = self.producers.pop(id(obj), None)
+        if producer is None:
+            return
+        faction, rate = producer
+        self.income[faction] -= rate
+
+    def set_faction(self, obj: Dict[str, Any], faction: int) -> None:
+        """Hand an object over to another faction, moving its income along if it produces any."""
+        obj['faction'] = faction
+        producer = self.producers.get(id(obj))
+        if producer is None:
+            return
+        previous, rate = producer
+        self.producers[id(obj)] = (faction, rate)
+        self.income[previous] -= rate
+        self.income[faction] = self.income.get(faction, 0) + rate
+
+    def clear(self) -> None:
+        self.producers = {}
+        self.income = {}
+        self.history = {}
+
+    def get_income(self, faction: int) -> int:
+        """Credits per tick a faction currently makes."""
+        return self.income.get(faction, 0)
+
+    def get_history(self, faction: int) -> List[int]:
+        """Income of the last ticks of a faction, oldest first."""
+        return list(self.history.get(faction, ()))
+
+    def tick(self) -> Dict[int, int]:
+        """
+        Record one income tick.
+
+        Returns:
+            dict: Credits earned by each faction this tick
+        """
+        for faction, income in self.income.items():
+            history = self.history.get(faction)
+            if history is None:
+                history = self.history[faction] = deque(maxlen=self.history_ticks)
+            history.append(income)
+        return self.income
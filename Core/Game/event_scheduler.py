@@ -0,0 +1,106 @@
+"""
+Timed game events.
+
+Things that happen at a known time (a cooldown running out, a building
+finishing production, the once-a-second income) are pushed on a priority
+queue keyed by their due time instead of being polled every tick for every
+object. Each tick EventScheduler.run_due() pops only the events that are due,
+so its cost scales with the number of due events, not with the number of
+objects.
+
+Cooldowns are not ticked at all: an object stores when its cooldown started
+and how long it lasts, and get_charge() computes the charge bar fraction
+when the UI reads it.
+
+Times are in milliseconds (pygame.time.get_ticks()).
+"""
+
+import heapq
+import itertools
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ScheduledEvent:
+    """Handle of a scheduled callback; cancel() keeps it from running."""
+
+    __slots__ = ('due', 'callback', 'args', 'period', 'cancelled')
+
+    def __init__(self, due: int, callback: Callable[..., Any], args: tuple, period: Optional[int]):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.period = period  # Repeat interval in milliseconds, None for one-shot events
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class EventScheduler:
+    """Priority queue of timed callbacks, ordered by due time then scheduling order."""
+
+    def __init__(self):
+        self.queue: List[tuple] = []
+        self.sequence = itertools.count()  # Tie-break: events due at the same time run in scheduling order
+        self.last_run = 0  # Events run by the last run_due(), for metrics
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def schedule(self, due: int, callback: Callable[..., Any], *args: Any) -> ScheduledEvent:
+        """Run callback(*args) once at time due."""
+        event = ScheduledEvent(due, callback, args, None)
+        heapq.heappush(self.queue, (due, next(self.sequence), event))
+        return event
+
+    def schedule_every(self, period: int, first_due: int, callback: Callable[..., Any], *args: Any) -> ScheduledEvent:
+        """Run callback(*args) at first_due and every period milliseconds after it until cancelled."""
+        event = ScheduledEvent(first_due, callback, args, period)
+        heapq.heappush(self.queue, (first_due, next(self.sequence), event))
+        return event
+
+    def run_due(self, now: int) -> int:
+        """
+        Run every event due at or before now.
+
+        A repeating event that fell more than one period behind (e.g. the game
+        was paused) runs once and is rescheduled from now, like a missed timer.
+
+        Returns:
+            int: Number of events run
+        """
+        queue = self.queue
+        run = 0
+        while queue and queue[0][0] <= now:
+            _, _, event = heapq.heappop(queue)
+            if event.cancelled:
+                continue
+            if event.period is not None:
+                event.due += event.period
+                if event.due <= now:
+                    event.due = now + event.period
+                heapq.heappush(queue, (event.due, next(self.sequence), event))
+            event.callback(*event.args)
+            run += 1
+        self.last_run = run
+        return run
+
+
+def start_cooldown(obj: Dict[str, Any], now: int, duration: int) -> None:
+    """Start an object's cooldown (its charge bar empties and refills over duration)."""
+    obj['charge_start'] = now
+    obj['charge_duration'] = max(1, duration)
+
+
+def clear_cooldown(obj: Dict[str, Any]) -> None:
+    """End an object's cooldown early (charge bar full)."""
+    obj.pop('charge_start', None)
+    obj.pop('charge_duration', None)
+
+
+def get_charge(obj: Dict[str, Any], now: int) -> float:
+    """Charge bar fraction of an object at time now (1.0 when it has no cooldown running)."""
+    start = obj.get('charge_start')
+    if start is None:
+        return 1.0
+    return min(1.0, max(0.0, (now - start) / obj['charge_duration']))
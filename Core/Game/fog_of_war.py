@@ -0,0 +1,227 @@
+"""
+Fog of war.
+
+Every faction has a VisibilityGrid: a NumPy array counting, per tile, how many
+of the faction's objects currently see it, plus an 'explored' flag for tiles
+that were ever seen. Each object stamps a precomputed disk of its sight radius
+into the counts (+1 when it appears, -1 when it goes away), so a unit that
+steps to a new tile costs two small array slices and everyone else's sight is
+left alone. A tile is visible while its count is above zero.
+
+For the player's faction the same arrays drive:
+
+- the fog overlay, one small surface per chunk of FOG_OF_WAR['chunk_tiles']
+  tiles, rebuilt only when a stamp touched the chunk (LRU, at most
+  FOG_OF_WAR['cached_chunks'] kept)
+- the minimap darkening, rebuilt when the grid changes
+- which objects update_visible_objects may draw: units on visible tiles,
+  static objects on explored tiles, and everything the player owns
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Set, Tuple
+import numpy as np
+import pygame
+from Core.Game.targeting import FACTION_NEUTRAL
+from Core.Utils import memory_report
+from config import FOG_OF_WAR
+
+HIDDEN = 0
+EXPLORED = 1
+VISIBLE = 2
+
+
+@lru_cache(maxsize=None)
+def sight_disk(radius: int) -> np.ndarray:
+    """(2r+1, 2r+1) int16 mask of the tiles within radius of the centre tile."""
+    offsets = np.arange(-radius, radius + 1)
+    return (offsets[None, :] ** 2 + offsets[:, None] ** 2 <= radius * radius).astype(np.int16)
+
+
+class VisibilityGrid:
+    """Reference counted sight of one faction."""
+
+    def __init__(self, width: int, height: int, chunk_tiles: int):
+        self.width = width
+        self.height = height
+        self.chunk_tiles = chunk_tiles
+        self.counts = np.zeros((height, width), dtype=np.int16)  # Sight disks covering each tile
+        self.explored = np.zeros((height, width), dtype=bool)
+        self.sources: Dict[int, Tuple[int, int, int]] = {}  # id(obj) -> (x, y, radius) stamped
+        self.dirty_chunks: Set[Tuple[int, int]] = set()
+        self.version = 0
+
+    def _stamp(self, x: int, y: int, radius: int, delta: int) -> None:
+        """Add delta to the counts under a sight disk, clipped to the map."""
+        min_x, max_x = max(0, x - radius), min(self.width, x + radius + 1)
+        min_y, max_y = max(0, y - radius), min(self.height, y + radius + 1)
+        if min_x >= max_x or min_y >= max_y:
+            return
+        disk = sight_disk(radius)[min_y - (y - radius):max_y - (y - radius), min_x - (x - radius):max_x - (x - radius)]
+        if delta > 0:
+            self.counts[min_y:max_y, min_x:max_x] += disk
+            self.explored[min_y:max_y, min_x:max_x] |= disk.astype(bool)
+        else:
+            self.counts[min_y:max_y, min_x:max_x] -= disk
+        chunk = self.chunk_tiles
+        for cy in range(min_y // chunk, (max_y - 1) // chunk + 1):
+            for cx in range(min_x // chunk, (max_x - 1) // chunk + 1):
+                self.dirty_chunks.add((cx, cy))
+        self.version += 1
+
+    def add(self, obj: Dict[str, Any], radius: int) -> None:
+        if id(obj) in self.sources or radius <= 0:
+            return
+        self.sources[id(obj)] = (obj['x'], obj['y'], radius)
+        self._stamp(obj['x'], obj['y'], radius, 1)
+
+    def remove(self, obj: Dict[str, Any]) -> None:
+        source = self.sources.pop(id(obj), None)
+        if source is not None:
+            self._stamp(source[0], source[1], source[2], -1)
+
+    def move(self, obj: Dict[str, Any]) -> None:
+        """Re-stamp an object's sight if it changed tile since it was last stamped."""
+        source = self.sources.get(id(obj))
+        if source is None or (source[0], source[1]) == (obj['x'], obj['y']):
+            return
+        self._stamp(source[0], source[1], source[2], -1)
+        self.sources[id(obj)] = (obj['x'], obj['y'], source[2])
+        self._stamp(obj['x'], obj['y'], source[2], 1)
+
+    def is_visible(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height and self.counts[y, x] > 0
+
+    def is_explored(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height and bool(self.explored[y, x])
+
+    def states(self, min_x: int = 0, min_y: int = 0, max_x: Optional[int] = None,
+               max_y: Optional[int] = None) -> np.ndarray:
+        """HIDDEN / EXPLORED / VISIBLE per tile of an area (the whole map by default), as uint8."""
+        max_x = self.width if max_x is None else max_x
+        max_y = self.height if max_y is None else max_y
+        explored = self.explored[min_y:max_y, min_x:max_x].astype(np.uint8)
+        return explored + (self.counts[min_y:max_y, min_x:max_x] > 0)
+
+
+class FogOfWar:
+    """Visibility grids of every faction and the player's fog overlay."""
+
+    def __init__(self, width: int, height: int, viewer_faction: int, tile_size: int = 32):
+        self.width = width
+        self.height = height
+        self.viewer_faction = viewer_faction
+        self.tile_size = tile_size
+        self.chunk_tiles = FOG_OF_WAR['chunk_tiles']
+        self.grids: Dict[int, VisibilityGrid] = {}
+        # Alpha of the overlay for HIDDEN, EXPLORED and VISIBLE tiles
+        self.alpha = np.array([FOG_OF_WAR['hidden_alpha'], FOG_OF_WAR['explored_alpha'], 0], dtype=np.uint8)
+        self.chunks: 'OrderedDict[Tuple[int, int], Optional[pygame.Surface]]' = OrderedDict()
+        self.minimap_overlay: Optional[pygame.Surface] = None
+        self.minimap_version = -1
+        memory_report.register('FogOfWar.chunks', self, 'chunks', 'fog')
+        memory_report.register('FogOfWar.minimap_overlay', self, 'minimap_overlay', 'fog')
+
+    def grid(self, faction: int) -> VisibilityGrid:
+        grid = self.grids.get(faction)
+        if grid is None:
+            grid = self.grids[faction] = VisibilityGrid(self.width, self.height, self.chunk_tiles)
+        return grid
+
+    @property
+    def viewer(self) -> VisibilityGrid:
+        return self.grid(self.viewer_faction)
+
+    # region Sight sources
+    def sight_range(self, obj: Dict[str, Any], metadata: Optional[Dict[str, Any]]) -> int:
+        """Sight radius in tiles: the "sight_range" property, else the default, never less than the attack range."""
+        properties = (metadata or {}).get('properties', {})
+        default = FOG_OF_WAR['unit_sight'] if obj.get('is_unit') else FOG_OF_WAR['building_sight']
+        return int(max(properties.get('sight_range', default), properties.get('attack_range', 0)))
+
+    def add(self, obj: Dict[str, Any], metadata: Optional[Dict[str, Any]]) -> None:
+        """Start stamping an object's sight into its faction's grid (neutral objects see nothing)."""
+        faction = obj.get('faction', FACTION_NEUTRAL)
+        if faction != FACTION_NEUTRAL:
+            self.grid(faction).add(obj, self.sight_range(obj, metadata))
+
+    def remove(self, obj: Dict[str, Any]) -> None:
+        grid = self.grids.get(obj.get('faction', FACTION_NEUTRAL))
+        if grid is not None:
+            grid.remove(obj)
+
+    def move(self, obj: Dict[str, Any]) -> None:
+        grid = self.grids.get(obj.get('faction', FACTION_NEUTRAL))
+        if grid is not None:
+            grid.move(obj)
+    # endregion
+
+    def can_see(self, obj: Dict[str, Any]) -> bool:
+        """
+        Whether the player may see an object: their own objects always, units on
+        visible tiles, static objects (buildings, trees, resources) once explored.
+        """
+        if obj.get('faction') == self.viewer_faction:
+            return True
+        viewer = self.viewer
+        if obj.get('is_unit'):
+            return viewer.is_visible(obj['x'], obj['y'])
+        return viewer.is_explored(obj['x'], obj['y'])
+
+    # region Rendering
+    def _build_chunk(self, cx: int, cy: int) -> Optional[pygame.Surface]:
+        """Overlay of one chunk, or None when every tile of it is visible."""
+        chunk = self.chunk_tiles
+        min_x, min_y = cx * chunk, cy * chunk
+        max_x, max_y = min(self.width, min_x + chunk), min(self.height, min_y + chunk)
+        alpha = self.alpha[self.viewer.states(min_x, min_y, max_x, max_y)]
+        if not alpha.any():
+            return None
+        tiles = pygame.Surface((max_x - min_x, max_y - min_y), pygame.SRCALPHA)
+        tiles.fill((0, 0, 0, 0))
+        pixels = pygame.surfarray.pixels_alpha(tiles)
+        pixels[:] = alpha.T
+        del pixels  # Unlock the surface
+        tile_size = self.tile_size
+        return pygame.transform.scale(tiles, ((max_x - min_x) * tile_size, (max_y - min_y) * tile_size))
+
+    def render(self, screen: pygame.Surface, camera_x: int, camera_y: int) -> None:
+        """Draw the fog over the part of the map on screen."""
+        viewer = self.viewer
+        for chunk_key in viewer.dirty_chunks:
+            self.chunks.pop(chunk_key, None)
+        viewer.dirty_chunks.clear()
+
+        chunk_pixels = self.chunk_tiles * self.tile_size
+        first_cx, first_cy = max(0, camera_x // chunk_pixels), max(0, camera_y // chunk_pixels)
+        last_cx = min((self.width - 1) // self.chunk_tiles, (camera_x + screen.get_width()) // chunk_pixels)
+        last_cy = min((self.height - 1) // self.chunk_tiles, (camera_y + screen.get_height()) // chunk_pixels)
+        for cy in range(first_cy, last_cy + 1):
+            for cx in range(first_cx, last_cx + 1):
+                key = (cx, cy)
+                if key in self.chunks:
+                    self.chunks.move_to_end(key)
+                    overlay = self.chunks[key]
+                else:
+                    overlay = self._build_chunk(cx, cy)
+                    self.chunks[key] = overlay
+                    if len(self.chunks) > FOG_OF_WAR['cached_chunks']:
+                        self.chunks.popitem(last=False)
+                if overlay is not None:
+                    screen.blit(overlay, (cx * chunk_pixels - camera_x, cy * chunk_pixels - camera_y))
+
+    def get_minimap_overlay(self, size: Tuple[int, int]) -> pygame.Surface:
+        """Darkening for the minimap, scaled to its map image and rebuilt when the player's sight changes."""
+        viewer = self.viewer
+        if (self.minimap_overlay is None or self.minimap_version != viewer.version
+                or self.minimap_overlay.get_size() != size):
+            tiles = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            tiles.fill((0, 0, 0, 0))
+            pixels = pygame.surfarray.pixels_alpha(tiles)
+            pixels[:] = self.alpha[viewer.states()].T
+            del pixels
+            self.minimap_overlay = pygame.transform.scale(tiles, size)
+            self.minimap_version = viewer.version
+        return self.minimap_overlay
+    # endregion
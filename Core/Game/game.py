@@ -14,7 +14,31 @@ from Core.Game.unit import Unit
 from Core.UI.cursor_manager import CursorManager
 from Core.Game.animation_manager import AnimationManager
 from Core.Game.vertical_panel import VerticalPanel
+from Core.AI.pathfinding import PassabilityGrid, PathFinder
+from Core.AI.hierarchical_pathfinding import HierarchicalPathFinder
+from Core.AI.flow_field import FlowFieldCache
+from Core.AI.connectivity import ConnectivityMap
+from Core.AI.line_of_sight import OpacityGrid, LineOfSight
+from Core.AI.path_scheduler import PathRequestScheduler, PRIORITY_PLAYER, PRIORITY_REPLAN
+from Core.Game.movement_system import MovementSystem
+from Core.Game.steering import Steering
+from Core.Game.spatial_index import SpatialIndex
+from Core.Game.targeting import TargetingSystem, default_faction, FACTION_NEUTRAL, FACTION_PLAYER
+from Core.Game.fog_of_war import FogOfWar
+from Core.Game.event_scheduler import EventScheduler, start_cooldown, clear_cooldown, get_charge
+from Core.Game.economy import Economy
+from Core.Game.lifecycle import EntityLifecycle
+from Core.Game.combat import CombatSystem, ENDED_HALTED, ENDED_DESTROYED
+from Core.Game.projectiles import ProjectileSystem
+from Core.Game.turrets import TurretSystem
+from Core.Utils.directions import nearest_direction
+from Core.Utils.frame_profiler import FrameProfiler
+from Core.Utils import instrumentation
+from Core.Utils import memory_report
+from Core.Utils.asset_cache import AssetCache
+from Core.Utils.rotation_cache import RotationCache
 from typing import Optional, Any
+from config import PATHFINDING, STEERING, LINE_OF_SIGHT, FOG_OF_WAR, ECONOMY, ROTATION_CACHE, RENDER_SCALE
 
 class Game(BaseScreen):
     def __init__(self, screen):
@@ -23,35 +47,45 @@ class Game(BaseScreen):
         self.screen_width = screen.get_width()
         self.panel_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
 
-        # Initialize music
+        # The world is drawn on this surface; below native scale it is smaller than the screen
+        # and upscaled once per frame, while the panels stay at native resolution
+        self.world_surface = self.create_world_surface()
+        self.world_scale = self.world_surface.get_width() / self.screen_width  # World pixels per screen pixel
+
+        # Initialize music (started in resume())
         pygame.mixer.init()
         self.music_file = "Music/__bertsz__cyberpunk_MULTI.mp3"
-        if pygame.mixer.music.get_busy():
-            pygame.mixer.music.stop()
-        pygame.mixer.music.load(self.music_file)
-        pygame.mixer.music.play(-1, 0.0)
 
         # Initialize credit system
         self.credits = 5000  # Starting credits
-        self.credit_image = pygame.image.load("Images/credit.png").convert_alpha()
+        self.credit_image = AssetCache().get_image("Images/credit.png", alpha=True)
         self.credit_font = pygame.font.Font(None, 32)  # Reduced from 36 to 32 for slightly smaller text
-        self.last_credit_update = pygame.time.get_ticks()  # Track last credit update time
+        # Timed events: cooldown completions and the income tick
+        self.scheduler = EventScheduler()
+        self.cooldown_events = {}  # id(obj) -> ScheduledEvent ending its current cooldown
+        self.scheduler.schedule_every(ECONOMY['income_period_ms'], pygame.time.get_ticks() + ECONOMY['income_period_ms'],
+                                      self.collect_income)
+        self.economy = Economy()  # Ore processors and the income they make, per faction
 
         # Initialize object collection before panels
         self.object_collection = ObjectCollection()
         self.objects = []  # Will be populated in load_map
+        self.lifecycle = EntityLifecycle()  # Spawns and despawns applied once per tick by apply_lifecycle
 
-        # Initialize spatial grid for object culling
+        # Initialize spatial index for object culling and lookups
         self.grid_cell_size = 128  # Size of each grid cell (4 tiles)
-        self.spatial_grid = {}  # Dictionary to store objects by grid cell
+        self.spatial_index = SpatialIndex(32, self.grid_cell_size)  # Tiles are 32x32 pixels
+        self.targeting = TargetingSystem(self.spatial_index)  # Towers engaging enemies on their own
 
-        # Initialize attack state tracking
-        self.active_attacks = {}  # Dictionary to track active attacks: {attacker_id: {'target_id': target_id, 'last_attack_time': time, 'cooldown': cooldown}}
-        self.attack_cooldown = 1000  # Attack cooldown in milliseconds
+        # Weapons of armed objects, active engagements and queued damage
+        self.combat = CombatSystem(self.spatial_index)
+        self.turrets = TurretSystem()  # Turret rotation of every object with has_turret, stepped each tick
+        self.last_turret_time = None
 
         # Initialize missile state tracking
         self.missiles = []  # List to track active missiles
-        self.missiles_images = self.load_missiles_images()
+        self.projectiles = ProjectileSystem(self.spatial_index, 32)  # Flight and collisions of the missiles
+        self.missile_image = self.load_missile_image()
         self.missile_explosion_images = self.load_missile_explosion_images()
         self.active_explosions = []
 
@@ -68,10 +102,13 @@ class Game(BaseScreen):
 
         # Initialize managers
         self.animation_manager = AnimationManager()
+        self.profiler = FrameProfiler()
 
         # Mouse state tracking
         self.last_mouse_pos = None
         self.selected_object = None  # Track the currently selected object
+        self.selected_units = []  # Units added to the selection with shift + click
+        self.selected_unit_ids = set()  # id() of the selected_units: object dicts compare by value
 
         # Define the tile size (32x32 pixels)
         self.tile_size = 32
@@ -89,7 +126,7 @@ class Game(BaseScreen):
             try:
                 tile_path = f"Maps/Common/Tiles/{i:05d}.png"
                 if tile_path not in self.tile_cache:
-                    tile_image = pygame.image.load(tile_path)
+                    tile_image = AssetCache().get_image(tile_path)
                     tile_image = pygame.transform.scale(tile_image, (self.tile_size, self.tile_size))
                     self.tile_cache[tile_path] = tile_image
                 self.tiles.append(self.tile_cache[tile_path])
@@ -106,6 +143,26 @@ class Game(BaseScreen):
         self.map_width = len(self.map[0]) if self.map else 120
         self.map_height = len(self.map) if self.map else 120
 
+        # Walkable tiles for unit pathfinding (terrain + static object footprints)
+        self.passability = PassabilityGrid.from_map(self.map, self.objects, self.tile_size)
+        self.connectivity = ConnectivityMap(self.passability)  # Region ids: O(1) reachability checks
+        self.pathfinder = PathFinder(self.passability, self.connectivity)
+        self.hierarchical_pathfinder = HierarchicalPathFinder(self.passability, connectivity=self.connectivity)
+        self.flow_fields = FlowFieldCache(self.passability)  # Shared by units of a group move
+        self.path_scheduler = PathRequestScheduler(self.hierarchical_pathfinder, self.connectivity)
+        self.movement = MovementSystem(steering=Steering(self.passability))  # Units currently following a path
+        self.last_movement_time = None
+
+        # Tiles that block sight (trees and buildings) for attack line-of-sight checks
+        self.opacity = OpacityGrid.from_map(self.map, self.objects, self.tile_size)
+        self.line_of_sight = LineOfSight(self.opacity, self.tile_size)
+
+        # What each faction sees; the player's sight drives the fog overlay and object culling
+        self.fog = FogOfWar(self.map_width, self.map_height, FACTION_PLAYER, self.tile_size)
+        for obj in self.objects:
+            self.fog.add(obj, self.object_collection.get_object_metadata(obj['type'], obj['id']))
+        self.fog_version = self.fog.viewer.version
+
         # Create a surface to hold the entire map
         self.map_surface = pygame.Surface((self.map_width * self.tile_size, self.map_height * self.tile_size))
 
@@ -128,8 +185,8 @@ class Game(BaseScreen):
         self.camera_x = 0
         self.camera_y = 0
         self.camera_speed = 3
-        self.camera_width = self.screen_width
-        self.camera_height = self.screen_height
+        self.camera_width = self.world_surface.get_width()
+        self.camera_height = self.world_surface.get_height()
 
         # Create vertical panel
         self.vertical_panel = VerticalPanel(self.screen, self)  # Pass self to access minimap
@@ -150,6 +207,19 @@ class Game(BaseScreen):
         self.update_visible_area()
         self.update_visible_objects()
 
+        self.register_memory_caches()
+
+    def register_memory_caches(self):
+        """Register the game's surfaces and caches with the memory report"""
+        memory_report.register('Game.map_surface', self, 'map_surface', 'terrain')
+        memory_report.register('Game.tile_cache', self, 'tile_cache', 'tiles')
+        memory_report.register('Game.tiles', self, 'tiles', 'tiles')
+        memory_report.register('Game.missile_image', self, 'missile_image', 'projectiles')
+        memory_report.register('Game.missile_explosion_images', self, 'missile_explosion_images', 'projectiles')
+        memory_report.register('Game.panel_surface', self, 'panel_surface', 'ui')
+        memory_report.register('Game.background_surface', self, 'background_surface', 'ui')
+        memory_report.register('Game.credit_image', self, 'credit_image', 'ui')
+
     def create_panels(self):
         # Create panels for the game
         panel_width = 200
@@ -171,57 +241,21 @@ class Game(BaseScreen):
         self.object_collections.append(ObjectCollection())  # Large objects
         self.object_collections.append(ObjectCollection())  # Huge objects
 
-    def get_grid_cell(self, x, y):
-        """Get the grid cell coordinates for a world position"""
-        cell_x = int(x // self.grid_cell_size)
-        cell_y = int(y // self.grid_cell_size)
-        return (cell_x, cell_y)
-
-    def add_object_to_grid(self, obj):
-        """Add an object to the spatial grid"""
-        # Get object's world position in pixels
-        obj_world_x = obj['x'] * self.tile_size
-        obj_world_y = obj['y'] * self.tile_size
-        
-        # Get the grid cell for this object
-        cell = self.get_grid_cell(obj_world_x, obj_world_y)
-        
-        # Add object to the grid cell
-        if cell not in self.spatial_grid:
-            self.spatial_grid[cell] = []
-        self.spatial_grid[cell].append(obj)
-
-    def remove_object_from_grid(self, obj):
-        """Remove an object from the spatial grid"""
-        # Get object's world position in pixels
-        obj_world_x = obj['x'] * self.tile_size
-        obj_world_y = obj['y'] * self.tile_size
-        
-        # Get the grid cell for this object
-        cell = self.get_grid_cell(obj_world_x, obj_world_y)
-        
-        # Remove object from the grid cell
-        if cell in self.spatial_grid and obj in self.spatial_grid[cell]:
-            self.spatial_grid[cell].remove(obj)
-            if not self.spatial_grid[cell]:  # If cell is empty, remove it
-                del self.spatial_grid[cell]
-
-    def load_missiles_images(self):
-        # Load missiles from file
-        missile_images = []
-        for i in [0, 45, 90, 135, 180, 225, 270, 315]:
-            missile_image = pygame.image.load(f"Images/Missiles/{str(i)}.png")
-            missile_images.append(missile_image)
-        return missile_images
+    def load_missile_image(self):
+        """Missile sprite facing direction 0; the other directions are rotated from it"""
+        missile_image = AssetCache().get_image("Images/Missiles/0.png", alpha=True)
+        RotationCache().prebuild('missile', missile_image, ROTATION_CACHE['missile_directions'])
+        return missile_image
     
     def load_missile_explosion_images(self):
-        explosion_sheet = pygame.image.load("Images/Missiles/Explosion/spritesheet.png").convert_alpha()
+        explosion_sheet = AssetCache().get_image("Images/Missiles/Explosion/spritesheet.png", alpha=True)
         explosion_images = []
         for i in range(4):
             frame = explosion_sheet.subsurface((i * 32, 0, 32, 32))
             explosion_images.append(frame)
         return explosion_images
 
+    @instrumentation.traced("Game.load_map")
     def load_map(self, file_path):
         try:
             with open(file_path, 'r') as file:
@@ -268,9 +302,9 @@ class Game(BaseScreen):
                 
                 # Read objects (if any)
                 self.objects = []
-                self.spatial_grid = {}  # Clear spatial grid
                 for line in lines[height + 1:]:
-                    # Extract object data from [x][y][type][id][health][z-index] format
+                    # Extract object data from [x][y][type][id][health][z-index][damage] format,
+                    # optionally followed by [faction]
                     obj_data = []
                     i = 0
                     while i < len(line):
@@ -285,7 +319,7 @@ class Game(BaseScreen):
                         else:
                             i += 1
                     
-                    if len(obj_data) != 7:
+                    if len(obj_data) not in (7, 8):
                         continue
                     
                     try:
@@ -296,6 +330,7 @@ class Game(BaseScreen):
                         health = int(obj_data[4])
                         z_index = int(obj_data[5])
                         damage = int(obj_data[6])
+                        faction = int(obj_data[7]) if len(obj_data) == 8 else None
                         current_health = health - damage
                         
                         if 0 <= x < width and 0 <= y < height:
@@ -345,15 +380,26 @@ class Game(BaseScreen):
                                     'direction': metadata.get('direction', 0),
                                     'has_turret': metadata.get('has_turret', False),
                                     'turret_direction': metadata.get('turret_direction', 0),
-                                    'charge_percent': 1.0  # Initialize charge percentage to 0
+                                    'faction': faction if faction is not None else default_faction(obj_type, metadata)
                                 }
                                 self.objects.append(obj)
-                                self.add_object_to_grid(obj)  # Add object to spatial grid
                             else:
                                 print(f"Warning: Could not find object image for {obj_type} {obj_id}")
                     except ValueError as e:
                         print(f"Error parsing object data: {e}")
-                
+
+                self.spatial_index.rebuild(self.objects)
+                self.targeting.clear()
+                self.economy.clear()
+                self.lifecycle.clear()
+                self.combat.clear()
+                self.turrets.clear()
+                for obj in self.objects:
+                    metadata = self.object_collection.get_object_metadata(obj['type'], obj['id'])
+                    self.targeting.register(obj, metadata)
+                    self.economy.register(obj, metadata)
+                    self.combat.register(obj, metadata)
+                    self.turrets.register(obj, metadata)
                 return map_data
                 
         except FileNotFoundError:
@@ -368,6 +414,14 @@ class Game(BaseScreen):
                                  self.minimap.size, self.minimap.size)
         return minimap_rect.collidepoint(pos)
 
+    def create_world_surface(self):
+        """The screen itself at native scale, else an internal resolution surface for the world."""
+        scale = RENDER_SCALE['scale']
+        if RENDER_SCALE['mode'] != 'explicit' or scale >= 1.0:
+            return self.screen
+        size = (max(1, int(self.screen_width * scale)), max(1, int(self.screen_height * scale)))
+        return pygame.Surface(size).convert(self.screen)
+
     def draw_selection_ring(self, center, radius, color, width):
         """
         Draws an elliptical ring around `center`, but split into a back‑half and front‑half
@@ -378,32 +432,28 @@ class Game(BaseScreen):
         rect = pygame.Rect(x - radius, y - radius * 0.7, radius * 2, radius * 1.4)
         
         # Back half: from 90° to 270° (bottom part of circle)
-        pygame.draw.arc(self.screen, color, rect,
+        pygame.draw.arc(self.world_surface, color, rect,
                         math.pi/2,      # start angle (90°)
                         3*math.pi/2,    # end angle   (270°)
                         width)
         
         # Front half: from -90° to +90° (top part of circle)
-        pygame.draw.arc(self.screen, color, rect,
+        pygame.draw.arc(self.world_surface, color, rect,
                         -math.pi/2,     # start angle (-90°)
                         math.pi/2,      # end angle   (+90°)
                         width)
 
     def get_tile_from_screen_pos(self, screen_x, screen_y):
         """Convert screen coordinates to tile coordinates"""
-        world_x = screen_x + self.camera_x
-        world_y = screen_y + self.camera_y
+        world_x = int(screen_x * self.world_scale) + self.camera_x
+        world_y = int(screen_y * self.world_scale) + self.camera_y
         tile_x = world_x // self.tile_size
         tile_y = world_y // self.tile_size
         return tile_x, tile_y
 
     def get_objects_at_tile(self, tile_x, tile_y):
         """Get all objects at a specific tile coordinate"""
-        objects_at_tile = []
-        for obj in self.objects:
-            if obj['x'] == tile_x and obj['y'] == tile_y:
-                objects_at_tile.append(obj)
-        return objects_at_tile
+        return self.spatial_index.objects_at(tile_x, tile_y)
 
     def get_huge_objects_at_adjacent_tiles(self, tile_x, tile_y):
         """Get huge objects (128x128) that might be at adjacent tiles"""
@@ -414,15 +464,12 @@ class Game(BaseScreen):
             (tile_x, tile_y - 1),  # top
             (tile_x, tile_y + 1)   # bottom
         ]
-        
+
         for adj_x, adj_y in adjacent_tiles:
-            for obj in self.objects:
-                # Check if it's a huge object (128x128) at this adjacent tile
-                if (obj['x'] == adj_x and obj['y'] == adj_y and 
-                    obj['image'].get_width() == 128 and 
-                    obj['image'].get_height() == 128):
-                    huge_objects.append(obj)
-        
+            # Check if it's a huge object (128x128) at this adjacent tile
+            huge_objects.extend(self.spatial_index.objects_at(
+                adj_x, adj_y, lambda obj: obj['image'].get_width() == 128 and obj['image'].get_height() == 128))
+
         return huge_objects
 
     def is_click_on_panels(self, mouse_pos):
@@ -478,6 +525,16 @@ class Game(BaseScreen):
             self.camera_height
         )
 
+    def suspend(self) -> None:
+        """Close the in-game menu so the game comes back unobstructed."""
+        self.vertical_panel.hide()
+
+    def resume(self) -> None:
+        """Restart the game music and refresh the view when the game becomes current."""
+        super().resume()
+        AssetCache().play_music(self.music_file, 0.0)
+        self.camera_moved = True  # Rebuild the visible object cache on the next update
+
     def handle_next_action(self) -> Optional[Any]:
         """Handle the next_action string and return the appropriate screen or None."""
         if not self.next_action:
@@ -487,8 +544,8 @@ class Game(BaseScreen):
         self.next_action = None
         
         if action == "main_menu":
-            from Core.Menu.main_menu import MainMenu
-            return MainMenu(self.screen)
+            # The game is suspended, not destroyed, so it can be resumed from the menu
+            return "main_menu"
         elif action == "options":
             raise NotImplementedError("Options menu not yet implemented")
         elif action == "quit":
@@ -497,22 +554,20 @@ class Game(BaseScreen):
             
         return None
 
+    @instrumentation.traced("Game.update_visible_objects")
     def update_visible_objects(self):
         """Update the list of visible objects only when camera moves significantly"""
         if not self.camera_moved:
             return
 
+        start_time = self.profiler.start()
         self.visible_objects_cache = []
         
         # Calculate visible area in world coordinates with padding
         visible_left = self.camera_x - 100
-        visible_right = self.camera_x + self.screen_width + 100
+        visible_right = self.camera_x + self.camera_width + 100
         visible_top = self.camera_y - 100
-        visible_bottom = self.camera_y + self.screen_height + 100
-        
-        # Get the grid cells that intersect with the visible area
-        start_cell = self.get_grid_cell(visible_left, visible_top)
-        end_cell = self.get_grid_cell(visible_right, visible_bottom)
+        visible_bottom = self.camera_y + self.camera_height + 100
         
         # Pre-calculate tile size and half tile size for faster access
         tile_size = self.tile_size
@@ -522,54 +577,49 @@ class Game(BaseScreen):
         camera_x = self.camera_x
         camera_y = self.camera_y
         
-        # Pre-calculate screen dimensions for bounds checking
-        screen_width = self.screen_width
-        screen_height = self.screen_height
+        # Pre-calculate view dimensions (world surface pixels) for bounds checking
+        screen_width = self.camera_width
+        screen_height = self.camera_height
         
-        # Check each grid cell in the visible area
-        for cell_x in range(start_cell[0], end_cell[0] + 1):
-            for cell_y in range(start_cell[1], end_cell[1] + 1):
-                cell = (cell_x, cell_y)
-                if cell in self.spatial_grid:
-                    for obj in self.spatial_grid[cell]:
-                        # Calculate object's world position in pixels
-                        obj_world_x = obj['x'] * tile_size
-                        obj_world_y = obj['y'] * tile_size
-                        
-                        # Get object dimensions
-                        obj_width = obj['image'].get_width()
-                        obj_height = obj['image'].get_height()
-                        
-                        # Quick bounds check for object visibility
-                        if (obj_world_x + obj_width < visible_left or 
-                            obj_world_x > visible_right or
-                            obj_world_y + obj_height < visible_top or
-                            obj_world_y > visible_bottom):
-                            continue
-                        
-                        # Calculate object's screen position
-                        obj_screen_x = obj_world_x - camera_x
-                        obj_screen_y = obj_world_y - camera_y
-                        
-                        # Calculate offset for centering
-                        offset = obj['offset'] - half_tile
-                        
-                        # Final screen position
-                        final_x = obj_screen_x - offset
-                        final_y = obj_screen_y - offset
-                        
-                        # Only add objects that are actually visible on screen
-                        if (final_x + obj_width > 0 and final_x < screen_width and
-                            final_y + obj_height > 0 and final_y < screen_height):
-                            self.visible_objects_cache.append({
-                                'obj': obj,
-                                'screen_x': final_x,
-                                'screen_y': final_y
-                            })
+        # Objects whose sprite overlaps the visible area, each once even when it spans several cells
+        fog = self.fog if FOG_OF_WAR['enabled'] else None
+        for obj in self.spatial_index.query_pixel_rect(visible_left, visible_top, visible_right, visible_bottom):
+            # Skip what the player has not seen
+            if fog is not None and not fog.can_see(obj):
+                continue
+
+            # Calculate object's world position in pixels
+            obj_world_x = obj['x'] * tile_size
+            obj_world_y = obj['y'] * tile_size
+            
+            # Get object dimensions
+            obj_width = obj['image'].get_width()
+            obj_height = obj['image'].get_height()
+            
+            # Calculate object's screen position
+            obj_screen_x = obj_world_x - camera_x
+            obj_screen_y = obj_world_y - camera_y
+            
+            # Calculate offset for centering
+            offset = obj['offset'] - half_tile
+            
+            # Final screen position
+            final_x = obj_screen_x - offset
+            final_y = obj_screen_y - offset
+            
+            # Only add objects that are actually visible on screen
+            if (final_x + obj_width > 0 and final_x < screen_width and
+                final_y + obj_height > 0 and final_y < screen_height):
+                self.visible_objects_cache.append({
+                    'obj': obj,
+                    'screen_x': final_x,
+                    'screen_y': final_y
+                })
 
         # Sort visible objects by z-index, then y, then x
         self.visible_objects_cache.sort(key=lambda x: (x['obj']['z_index'], x['obj']['y'], x['obj']['x']))
         self.camera_moved = False
+        self.profiler.stop('update_visible_objects', start_time)
 
     def calculate_angle(self, start_x, start_y, target_x, target_y):
         """Calculate the angle between two points in degrees"""
@@ -584,37 +634,302 @@ class Game(BaseScreen):
 
     def get_nearest_direction(self, angle, directions):
         """Get the nearest direction from the available directions"""
-        # Find the closest direction by comparing the absolute difference
-        closest = min(directions, key=lambda x: min(abs(x - angle), 360 - abs(x - angle)))
-        return closest
+        # Precomputed per direction list, shared with the movement system
+        return nearest_direction(angle, directions)
 
     def handle_attack_command(self, attack_result):
         """Handle an attack command from the panel"""
         attacker = attack_result['attacker']
         target = attack_result['target']
-        metadata = self.object_collection.get_object_metadata(attacker['type'], attacker['id'])
         if attack_result['in_range']:
-            # Start attack immediately
-            self.active_attacks[attacker['unique_id']] = {
-                'attacker_type': attacker['type'],
-                'attacker_id': attacker['id'],
-                'attacker_unique_id': attacker['unique_id'],
-                'target_type': target['type'],
-                'target_id': target['id'],
-                'target_unique_id': target['unique_id'],
-                'last_attack_time': pygame.time.get_ticks() - metadata.get('properties', {}).get('cooldown', 1000), # Allow immediate first attack
-                'cooldown': metadata.get('properties', {}).get('cooldown', 1000) # Default cooldown in milliseconds
-            }
+            # Start attack immediately (the first shot is ready at once)
+            if not self.combat.engage(attacker, target, pygame.time.get_ticks()):
+                return
             attacker['is_attacking'] = True # Mark the attacker as currently attacking
+            attacker.pop('hold_fire', None)  # An attack order lifts a halt
             # Set attacker's animation state to 'fire'
             # self.animation_manager.set_animation_state(attacker['unique_id'], 'fire')
         elif attack_result['is_unit']:
-            # TODO: Handle unit movement towards target
-            pass
+            # Walk towards the target; the attack starts once it is in range
+            attacker['pending_attack'] = target
+            self.move_unit(attacker, target['x'], target['y'])
         else:
             # Building can't reach target, ignore attack
             pass
 
+    def move_unit(self, unit, tile_x, tile_y, priority=PRIORITY_PLAYER):
+        """
+        Order a unit to walk to a tile.
+
+        The search runs later through the path scheduler; until its result
+        arrives the unit is 'thinking' and stands still.
+
+        Args:
+            unit: Unit object dictionary
+            tile_x: Destination tile x
+            tile_y: Destination tile y
+            priority: Scheduler priority (player orders by default)
+        """
+        unit.pop('path', None)
+        unit.pop('plan', None)
+        unit.pop('flow_field', None)
+        unit['thinking'] = True
+        self.path_scheduler.submit(unit, (unit['x'], unit['y']), (tile_x, tile_y),
+                                   lambda plan: self.start_unit_path(unit, plan, (tile_x, tile_y)),
+                                   priority)
+
+    def start_unit_path(self, unit, plan, goal):
+        """
+        Start walking once the scheduler answered a move order.
+
+        Args:
+            unit: Unit object dictionary
+            plan: HierarchicalPath, or None if the goal cannot be reached
+            goal: Destination tile of the order
+
+        Returns:
+            bool: True if the unit has steps to walk
+        """
+        unit.pop('thinking', None)
+        # The spatial index holds exactly the objects in the game, keyed by identity
+        if unit not in self.spatial_index or unit['health'] <= 0:
+            return False
+        start = (unit['x'], unit['y'])
+        # Only the first hop of the plan is turned into tile steps now
+        if plan is not None:
+            steps = plan.next_steps() or []
+        else:
+            # Unreachable: walk as close as possible with a partial tile search
+            steps = self.pathfinder.expand_path(
+                start, self.pathfinder.find_path(start, goal, allow_partial=True))
+        if not steps:
+            self.stop_unit(unit)
+            return False
+
+        unit['plan'] = plan
+        unit['path'] = steps
+        return self.start_moving(unit)
+
+    def get_unit_speed(self, unit):
+        """Walking speed of a unit in tiles per second."""
+        metadata = self.object_collection.get_object_metadata(unit['type'], unit['id'])
+        return metadata.get('properties', {}).get('speed', PATHFINDING['unit_speed']) if metadata else PATHFINDING['unit_speed']
+
+    def start_moving(self, unit):
+        """Hand a unit with a path or flow field to the movement system."""
+        if unit not in self.movement:
+            self.movement.add(unit, unit['x'], unit['y'], self.get_unit_speed(unit))
+        plan, field = unit.get('plan'), unit.get('flow_field')
+        goal = plan.goal if plan is not None else (field.goal if field is not None else unit['path'][-1])
+        self.movement.set_goal(unit, goal[0], goal[1])
+        if not self.next_waypoint(unit):
+            if not unit.get('thinking'):
+                self.stop_unit(unit)
+            return False
+        return True
+
+    def move_group(self, units, tile_x, tile_y):
+        """
+        Order several units to walk to the same tile.
+
+        Large groups share one flow field towards the goal instead of running
+        one search per unit; each unit then reads its next step in O(1).
+
+        Args:
+            units: Unit object dictionaries
+            tile_x: Destination tile x
+            tile_y: Destination tile y
+        """
+        if len(units) < PATHFINDING['flow_field_min_group']:
+            for unit in units:
+                self.move_unit(unit, tile_x, tile_y)
+            return
+
+        field = self.flow_fields.get((tile_x, tile_y))
+        for unit in units:
+            if field is None or not field.is_reachable(unit['x'], unit['y']):
+                # Cut off from the goal: fall back to a partial search of its own
+                self.move_unit(unit, tile_x, tile_y)
+                continue
+            self.stop_unit(unit)
+            if field.next_tile(unit['x'], unit['y']) is None:
+                continue  # Already there
+            unit['flow_field'] = field
+            unit['path'] = []
+            self.start_moving(unit)
+
+    def stop_unit(self, unit):
+        """Clear a unit's movement order."""
+        unit.pop('path', None)
+        unit.pop('plan', None)
+        unit.pop('flow_field', None)
+        if unit.pop('thinking', None):
+            self.path_scheduler.cancel(unit)
+        unit.pop('pending_attack', None)
+        self.movement.remove(unit)
+
+    def next_waypoint(self, unit):
+        """
+        Give a unit the next tile to walk to, from its flow field, plan or path.
+
+        Returns:
+            bool: True if the unit has a waypoint; False when it arrived, or is re-planning
+        """
+        field = unit.get('flow_field')
+        if field is not None:
+            if field.version != self.passability.version:
+                # The map changed: continue on a field computed for the new grid
+                field = self.flow_fields.get(field.goal)
+                unit['flow_field'] = field
+            next_tile = field.next_tile(unit['x'], unit['y']) if field is not None else None
+            if next_tile is None or not self.passability.is_passable(*next_tile):
+                unit.pop('flow_field', None)
+                return False
+            unit['path'] = [next_tile]
+
+        plan = unit.get('plan')
+        if not unit['path'] and plan is not None and not plan.is_finished():
+            # Refine the next hop of the hierarchical plan
+            steps = plan.next_steps()
+            if steps is None:
+                self.move_unit(unit, plan.goal[0], plan.goal[1], PRIORITY_REPLAN)
+                return False
+            unit['path'] = steps
+        if not unit['path']:
+            return False
+
+        next_x, next_y = unit['path'].pop(0)
+        if not self.passability.is_passable(next_x, next_y):
+            # Something was built on the path since it was planned
+            goal = plan.goal if plan is not None else (unit['path'][-1] if unit['path'] else (next_x, next_y))
+            self.move_unit(unit, goal[0], goal[1], PRIORITY_REPLAN)
+            return False
+        self.movement.set_waypoint(unit, next_x, next_y)
+        return True
+
+    def update_unit_movement(self, current_time):
+        """Advance all moving units in one batched step, then handle the ones that reached a tile."""
+        if self.last_movement_time is None:
+            self.last_movement_time = current_time
+        # Clamped so a long stall does not make units skip tiles
+        dt = min(current_time - self.last_movement_time, 250) / 1000.0
+        self.last_movement_time = current_time
+
+        arrived, turned = self.movement.step(dt)
+        for unit, direction in turned:
+            unit['direction'] = direction
+
+        for unit in arrived:
+            if unit not in self.spatial_index or unit['health'] <= 0:
+                self.stop_unit(unit)
+                continue
+            position = self.movement.get_position(unit)
+            tile_x, tile_y = int(round(position[0])), int(round(position[1]))
+            # The spatial index only touches its buckets when the unit changes cell
+            unit['x'], unit['y'] = tile_x, tile_y
+            self.spatial_index.move(unit)
+            self.fog.move(unit)
+            self.camera_moved = True
+
+            target = unit.get('pending_attack')
+            if target is not None and self.start_pending_attack(unit, target):
+                self.stop_unit(unit)
+                continue
+            if not self.next_waypoint(unit) and not unit.get('thinking') and not self.make_room(unit):
+                self.stop_unit(unit)
+
+    def get_idle_unit_at_tile(self, tile_x, tile_y, exclude=None):
+        """Unit standing still on a tile, looked up in the spatial index."""
+        for obj in self.spatial_index.objects_at(tile_x, tile_y):
+            if obj.get('is_unit') and obj is not exclude and obj not in self.movement:
+                return obj
+        return None
+
+    def make_room(self, unit):
+        """
+        Send a unit that finished its order on an occupied tile to the closest free one.
+
+        Returns:
+            bool: True if the unit got a new waypoint
+        """
+        if self.get_idle_unit_at_tile(unit['x'], unit['y'], unit) is None:
+            return False
+        radius = STEERING['free_tile_radius']
+        candidates = [(dx * dx + dy * dy, unit['x'] + dx, unit['y'] + dy)
+                      for dy in range(-radius, radius + 1) for dx in range(-radius, radius + 1) if dx or dy]
+        for _, tile_x, tile_y in sorted(candidates):
+            if (self.passability.is_passable(tile_x, tile_y)
+                    and self.get_idle_unit_at_tile(tile_x, tile_y) is None
+                    and self.passability.is_line_walkable(unit['x'], unit['y'], tile_x, tile_y)):
+                unit['path'] = self.pathfinder.expand_path((unit['x'], unit['y']), [(tile_x, tile_y)])
+                unit['plan'] = None
+                self.movement.set_goal(unit, tile_x, tile_y)
+                return self.next_waypoint(unit)
+        return False
+
+    def start_pending_attack(self, unit, target):
+        """Start the attack a unit was walking towards once the target is in range."""
+        if target not in self.spatial_index:
+            unit.pop('pending_attack', None)
+            return True
+        weapon = self.combat.weapon(unit)
+        dx = target['x'] - unit['x']
+        dy = target['y'] - unit['y']
+        if weapon is None or dx * dx + dy * dy > weapon.range_sq or not self.has_line_of_sight(unit, target):
+            return False
+        unit.pop('pending_attack', None)
+        self.handle_attack_command({
+            'action': 'attack',
+            'attacker': unit,
+            'target': target,
+            'in_range': True,
+            'is_unit': True
+        })
+        return True
+
+    def get_tile_position(self, obj):
+        """Position of an object in tiles, fractional while a unit walks between tiles."""
+        if obj.get('is_unit') and obj in self.movement:
+            return self.movement.get_position(obj)
+        return obj['x'], obj['y']
+
+    def get_screen_position(self, obj_data):
+        """Where to draw an entry of the visible set; walking units are drawn between tiles."""
+        obj = obj_data['obj']
+        if not obj.get('is_unit') or obj not in self.movement:
+            return obj_data['screen_x'], obj_data['screen_y']
+        x, y = self.movement.get_position(obj)
+        offset = obj['offset'] - self.tile_size // 2
+        return (round(x * self.tile_size) - self.camera_x - offset,
+                round(y * self.tile_size) - self.camera_y - offset)
+
+    def has_line_of_sight(self, source, target):
+        """Whether source can see target (always True with line of sight disabled)."""
+        return not LINE_OF_SIGHT['enabled'] or self.line_of_sight.between(source, target)
+
+    def begin_cooldown(self, obj, duration, now=None):
+        """Start an object's cooldown; a scheduled event ends it, nothing polls it meanwhile."""
+        now = pygame.time.get_ticks() if now is None else now
+        self.end_cooldown(obj)
+        start_cooldown(obj, now, duration)
+        self.cooldown_events[id(obj)] = self.scheduler.schedule(now + duration, self.end_cooldown, obj)
+
+    def end_cooldown(self, obj):
+        """Finish an object's cooldown now (charge bar full) and drop its pending completion event."""
+        event = self.cooldown_events.pop(id(obj), None)
+        if event is not None:
+            event.cancel()
+        clear_cooldown(obj)
+
+    def collect_income(self):
+        """Income tick, scheduled every second: the player's running income from the economy registry."""
+        income = self.economy.tick()
+        self.add_credits(income.get(FACTION_PLAYER, 0))
+
+    def is_idle_tower(self, tower):
+        """Whether an auto-targeting tower may pick a new target: not attacking and not halted."""
+        return not self.combat.is_engaged(tower) and not tower.get('hold_fire')
+
     def handle_target_selection(self, target_object):
         """Handle target selection for attack"""
         if not self.attacker:
@@ -634,7 +949,7 @@ class Game(BaseScreen):
         properties = metadata.get('properties', {})
         attack_range = properties.get('attack_range', 0)
         
-        if distance <= attack_range:
+        if distance <= attack_range and self.has_line_of_sight(self.attacker, target_object):
             return {
                 'action': 'attack',
                 'attacker': self.attacker,
@@ -660,7 +975,7 @@ class Game(BaseScreen):
             return
         
         # Check cooldown
-        if selected_object.get('charge_percent', 1.0) < 1.0:
+        if get_charge(selected_object, pygame.time.get_ticks()) < 1.0:
             print("Building is cooling down.")
             return
         
@@ -678,7 +993,7 @@ class Game(BaseScreen):
                 if (tile_x, tile_y) in excluded_tiles:
                     continue
         
-                if not any(obj['x'] == tile_x and obj['y'] == tile_y for obj in self.objects):
+                if not self.spatial_index.objects_at(tile_x, tile_y):
                     unit_id = 0
                     unit_type = "unit"
                     metadata = self.object_collection.get_object_metadata(unit_type, unit_id)
@@ -711,22 +1026,47 @@ class Game(BaseScreen):
                         'direction': 0,
                         'has_turret': False,
                         'turret_direction': 0,
-                        'charge_percent': 1.0,
+                        'faction': selected_object.get('faction', FACTION_PLAYER),
                         'unique_id': str(uuid.uuid4())
                     }
         
-                    self.objects.append(new_unit)
-                    self.add_object_to_grid(new_unit)
-                    self.camera_moved = True
-                    self.update_visible_objects()
+                    self.queue_spawn(new_unit, metadata)
                     self.credits -= 250
-                    selected_object['charge_percent'] = 0.0
-                    selected_object['last_charge_time'] = pygame.time.get_ticks()
-                    print("Builder unit created at", tile_x, tile_y)
+                    # Production cooldown of the building, ended by a scheduled event
+                    building_metadata = self.object_collection.get_object_metadata(selected_object['type'], selected_object['id'])
+                    cooldown = building_metadata.get('properties', {}).get('cooldown', 1000) if building_metadata else 1000
+                    self.begin_cooldown(selected_object, cooldown)
+                    print("Builder unit queued at", tile_x, tile_y)
                     return
         
         print("No valid tile found for builder unit.")
 
+    def update_unit_group(self, previous_selection, add_to_group):
+        """
+        Maintain the group of selected units after a selection click.
+
+        Shift + click toggles a unit in the group (starting from the previously
+        selected unit); a plain click clears the group.
+        """
+        selected = self.selected_object
+        if not add_to_group or not (selected and selected.get('is_unit')):
+            self.selected_units = []
+            self.selected_unit_ids = set()
+            return
+        if not self.selected_units and previous_selection and previous_selection.get('is_unit'):
+            self.selected_units = [previous_selection]
+            self.selected_unit_ids = {id(previous_selection)}
+        if id(selected) in self.selected_unit_ids:
+            self.selected_units = [unit for unit in self.selected_units if unit is not selected]
+            self.selected_unit_ids.discard(id(selected))
+        else:
+            self.selected_units.append(selected)
+            self.selected_unit_ids.add(id(selected))
+
+    def is_selected(self, obj):
+        """Check whether an object is selected, on its own or as part of the unit group."""
+        return self.selected_object is obj or id(obj) in self.selected_unit_ids
+
     def handle_events(self, event):
         if event.type == pygame.QUIT:
             pygame.quit()
@@ -815,6 +1155,7 @@ class Game(BaseScreen):
                 elif not self.is_click_on_panels(mouse_pos):
                     # Get tile coordinates from mouse position
                     tile_x, tile_y = self.get_tile_from_screen_pos(mouse_pos[0], mouse_pos[1])
+                    previous_selection = self.selected_object
                     
                     # First check for objects at the clicked tile
                     objects_at_tile = self.get_objects_at_tile(tile_x, tile_y)
@@ -832,6 +1173,8 @@ class Game(BaseScreen):
                             # No objects found, clear selection
                             self.selected_object = None
                     
+                    self.update_unit_group(previous_selection, pygame.key.get_mods() & pygame.KMOD_SHIFT)
+                    
                     # Update the panel with the selected object
                     self.panel.set_selected_object(self.selected_object)
             elif event.button == 3:  # Right click
@@ -839,6 +1182,17 @@ class Game(BaseScreen):
                 if self.panel.is_targeting:
                     self.panel.cancel_targeting()
                     self.cursor_manager.set_cursor("normal")
+                # Otherwise move the selected units to the clicked tile
+                elif self.selected_units and not self.is_click_on_panels(mouse_pos):
+                    tile_x, tile_y = self.get_tile_from_screen_pos(mouse_pos[0], mouse_pos[1])
+                    for unit in self.selected_units:
+                        unit.pop('pending_attack', None)
+                    self.move_group(self.selected_units, tile_x, tile_y)
+                elif (self.selected_object and self.selected_object.get('is_unit')
+                      and not self.is_click_on_panels(mouse_pos)):
+                    tile_x, tile_y = self.get_tile_from_screen_pos(mouse_pos[0], mouse_pos[1])
+                    self.selected_object.pop('pending_attack', None)
+                    self.move_unit(self.selected_object, tile_x, tile_y)
 
         elif event.type == pygame.MOUSEBUTTONUP:
             self.is_dragging_minimap = False
@@ -855,23 +1209,11 @@ class Game(BaseScreen):
         # Get mouse position once
         mouse_pos = pygame.mouse.get_pos()
         
-        # Update credits from ore processors
+        # Run the timed events that are due (income, cooldowns ending)
+        start_time = self.profiler.start()
         current_time = pygame.time.get_ticks()
-        if current_time - self.last_credit_update >= 1000:  # Check if a second has passed
-            # Process all buildings that generate credits
-            for obj in self.objects:
-                if obj['type'] == 'building':
-                    # Get building metadata
-                    metadata = self.object_collection.get_object_metadata(obj['type'], obj['id'])
-                    if metadata and 'properties' in metadata:
-                        properties = metadata['properties']
-                        # Check if building is an ore processor
-                        if (properties.get('is_ore_gold', False) or properties.get('is_ore_iron', False)) and obj['health'] > 0:
-                            # Add credits based on profit rate
-                            profit_rate = properties.get('profit_rate', 0)
-                            self.add_credits(profit_rate)
-            
-            self.last_credit_update = current_time
+        self.scheduler.run_due(current_time)
+        self.profiler.stop('update.scheduled', start_time)
 
         # Optimize camera movement with edge detection
         edge_area = 50  # pixels from edge to trigger camera movement
@@ -882,8 +1224,8 @@ class Game(BaseScreen):
         old_camera_y = self.camera_y
         
         # Calculate maximum camera positions
-        max_camera_x = self.map_width * self.tile_size - self.screen_width
-        max_camera_y = self.map_height * self.tile_size - self.screen_height
+        max_camera_x = self.map_width * self.tile_size - self.camera_width
+        max_camera_y = self.map_height * self.tile_size - self.camera_height
         
         # Check horizontal movement
         if mouse_pos[0] < edge_area:
@@ -903,121 +1245,115 @@ class Game(BaseScreen):
             self.update_visible_area()
             self.update_visible_objects()
 
-        # Process active attacks
-        for attack in list(self.active_attacks.items()):
-            attacker_unique_id = attack[0]
-            attack_data = attack[1]
-            target_unique_id = attack_data['target_unique_id']
-            
-            # Get attacker and target objects
-            attacker = None
-            target = None
-            
-            # Find attacker
-            for obj in self.objects:
-                if obj['unique_id'] == attacker_unique_id:
-                    attacker = obj
-                    break
-                    
-            # Find target
-            for obj in self.objects:
-                if obj['unique_id'] == target_unique_id:
-                    target = obj
-                    break
-            
-            if attacker and target:
-                # Check if the halt action was triggered
-                if attacker.get('is_attacking') is False: # Check if explicitly set to False
-                    self.animation_manager.set_animation_state(attacker_unique_id, "static")
-                    if attacker_unique_id in self.active_attacks:
-                         del self.active_attacks[attacker_unique_id]
-                    # Remove the flag after processing to reset state for future commands
-                    attacker.pop('is_attacking', None)
-                    attacker['charge_percent'] = 1.0  # Set charge to 100% when halted
-                    continue # Skip further processing for this attack
-
-                # Check if target is already destroyed
-                if target['health'] <= 0 and target.get('max_health', 100) != -1:
-                    # Stop attacking destroyed target
-                    self.animation_manager.set_animation_state(attacker_unique_id, "static")
-                    del self.active_attacks[attacker_unique_id]
-                    # Set target to destruction animation if not already
-                    self.animation_manager.set_animation_state(target_unique_id, "destruction")
-                    attacker['charge_percent'] = 1.0  # Set charge to 100% when target is destroyed
+        # Turn every turret towards its aim, on screen or not
+        start_time = self.profiler.start()
+        if len(self.turrets):
+            dt = 0.0 if self.last_turret_time is None else (current_time - self.last_turret_time) / 1000.0
+            self.turrets.step(dt)
+        self.last_turret_time = current_time
+        self.profiler.stop('update.turrets', start_time)
+
+        # Evaluate every engagement at once; only ended ones and ready shots reach Python code
+        start_time = self.profiler.start()
+        ended, shots = self.combat.update(current_time, self.has_line_of_sight)
+        for attacker, target, reason in ended:
+            self.animation_manager.set_animation_state(attacker['unique_id'], "static")
+            attacker.pop('is_attacking', None)
+            if reason == ENDED_HALTED:
+                self.end_cooldown(attacker)  # Set charge to 100% when halted
+            elif reason == ENDED_DESTROYED:
+                # Set target to destruction animation if not already
+                self.animation_manager.set_animation_state(target['unique_id'], "destruction")
+                self.end_cooldown(attacker)  # Set charge to 100% when target is destroyed
+                self.queue_despawn(target)
+        for attacker, target, weapon in shots:
+            attacker_unique_id = attacker['unique_id']
+            # Turn the turret towards the target first
+            angle = self.calculate_angle(attacker['x'], attacker['y'], target['x'], target['y'])
+            nearest_direction = self.get_nearest_direction(angle, weapon.directions)
+            if nearest_direction != attacker['turret_direction']:
+                self.turrets.aim(attacker, nearest_direction)
+                if attacker in self.turrets:
                     continue
+                attacker['turret_direction'] = nearest_direction  # Without a turret the whole object faces the target
+            # Perform attack
+            self.animation_manager.set_animation_state(attacker_unique_id, "fire")
+            self.combat.fired(attacker, current_time)
+            self.begin_cooldown(attacker, weapon.cooldown, current_time)
+            target_world_x = target['x'] * self.tile_size + self.tile_size // 2
+            target_world_y = target['y'] * self.tile_size + self.tile_size // 2
+            missile = Missile(self.combat.muzzle_position(attacker, weapon, self.tile_size),
+                              (target_world_x, target_world_y), attacker, target,
+                              weapon.projectile_speed, nearest_direction, weapon)
+            self.missiles.append(missile)
+            self.projectiles.add(missile, weapon.homing, weapon.turn_rate)
+        self.profiler.stop('update.attacks', start_time)
+
+        # Idle towers pick targets on their own, a share of them per tick
+        start_time = self.profiler.start()
+        for tower, target in self.targeting.update(self.is_idle_tower, self.has_line_of_sight):
+            self.handle_attack_command({
+                'action': 'attack',
+                'attacker': tower,
+                'target': target,
+                'in_range': True,
+                'is_unit': False
+            })
+        self.profiler.stop('update.targeting', start_time)
+
+        # Answer queued path requests within the per-tick budget
+        start_time = self.profiler.start()
+        if self.path_scheduler.depth:
+            self.path_scheduler.process()
+        self.profiler.stop('update.pathing', start_time)
+
+        # Move units along their paths
+        start_time = self.profiler.start()
+        if len(self.movement):
+            self.update_unit_movement(current_time)
+        else:
+            self.last_movement_time = None
+        self.profiler.stop('update.movement', start_time)
+
+        # Objects coming into or out of the player's sight change what is drawn
+        if self.fog.viewer.version != self.fog_version:
+            self.fog_version = self.fog.viewer.version
+            self.camera_moved = True
 
-                # Get attacker metadata
-                attacker_metadata = self.object_collection.get_object_metadata(attacker['type'], attacker['id'])
-                if not attacker_metadata:
-                    del self.active_attacks[attacker_unique_id]
-                    continue
-                    
-                # Get attack range from properties
-                properties = attacker_metadata.get('properties', {})
-                attack_range = properties.get('attack_range', 0)
-                
-                # Calculate distance in tiles
-                dx = target['x'] - attacker['x']
-                dy = target['y'] - attacker['y']
-                distance = (dx * dx + dy * dy) ** 0.5
-                
-                # Check if target is still in range
-                if distance > attack_range:
-                    # Stop the attack
-                    self.animation_manager.set_animation_state(attacker_unique_id, "static")
-                    del self.active_attacks[attacker_unique_id]
-                    continue
-                
-                # Update attack cooldown
-                current_time = pygame.time.get_ticks()
-                time_since_last_shot = current_time - attack_data['last_attack_time']
-                attacker_metadata = self.object_collection.get_object_metadata(attacker['type'], attacker['id'])
-                cooldown = attacker_metadata.get('properties', {}).get('cooldown', 1000)
-                attacker['charge_percent'] = min(1.0, time_since_last_shot / cooldown)
-                if time_since_last_shot >= cooldown:
-                    # Calculate angle for projectile
-                    angle = self.calculate_angle(attacker['x'], attacker['y'], target['x'], target['y'])
-                    nearest_direction = self.get_nearest_direction(angle, attacker_metadata['visuals']['directions'])
-                    attacker['turret_direction'] = self.animation_manager.get_current_direction(attacker_unique_id)
-                    if(nearest_direction != attacker['turret_direction']):
-                        self.animation_manager.set_target_direction(attacker_unique_id, nearest_direction)
-                    else:
-                        # Perform attack
-                        self.animation_manager.set_animation_state(attacker_unique_id, "fire")
-                        attack_data['last_attack_time'] = current_time
-                        attacker['last_charge_time'] = current_time
-                        # Convert tile coordinates to world coordinates
-                        attacker_world_x, attacker_world_y = self.calculate_missile_origin(attacker)
-                        target_world_x = target['x'] * self.tile_size + self.tile_size // 2
-                        target_world_y = target['y'] * self.tile_size + self.tile_size // 2
-                        missile = Missile((attacker_world_x, attacker_world_y), (target_world_x, target_world_y), attacker, target, 10, nearest_direction)
-                        self.missiles.append(missile)
-            else:
-                self.animation_manager.set_animation_state(attacker_unique_id, "static")
-                del self.active_attacks[attacker_unique_id]
-        
-        current_time = pygame.time.get_ticks()
-        for obj in self.objects:
-            if obj.get('charge_percent', 1.0) < 1.0:
-                metadata = self.object_collection.get_object_metadata(obj['type'], obj['id'])
-                cooldown_duration = metadata.get('properties', {}).get('cooldown', 1000) if metadata else 1000
-                elapsed = current_time - obj.get('last_charge_time', 0)
-                obj['charge_percent'] = min(1.0, elapsed / cooldown_duration)
 
-        # Process missiles
+        # Process missiles: one batched flight step, then impacts on whatever they hit
+        start_time = self.profiler.start()
+        for missile, hit, point in self.projectiles.step(self.get_tile_position):
+            self.active_explosions.append(Explosion(point, self.missile_explosion_images))
+            self.combat.queue_impact(point, self.tile_size, missile.weapon, hit, missile.origin)
         for missile in self.missiles:
             missile.update()
-            if missile.finished:
-                self.active_explosions.append(Explosion(missile.position, self.missile_explosion_images))
-                if missile.target and missile.target['max_health'] != -1:
-                    missile.target['health'] -= missile.origin.get('damage', 1)
-                    if missile.target['health'] <= 0:
-                        missile.origin['charge_percent'] = 1.0
-                self.missiles.remove(missile)
+        self.missiles = [missile for missile in self.missiles if not missile.finished]
+        self.profiler.stop('update.missiles', start_time)
+
+        # Apply this tick's hits and splash, one subtraction per target
+        start_time = self.profiler.start()
+        for target, source in self.combat.apply_damage():
+            if source is not None:
+                self.end_cooldown(source)
+            self.queue_despawn(target)
+        self.profiler.stop('update.damage', start_time)
 
         # Process explosions
+        start_time = self.profiler.start()
         for explosion in self.active_explosions:
             explosion.update()
+        self.active_explosions = [explosion for explosion in self.active_explosions if not explosion.finished]
+        self.profiler.stop('update.explosions', start_time)
+
+        # Objects created and destroyed during this tick enter and leave the game together
+        start_time = self.profiler.start()
+        if len(self.lifecycle):
+            self.apply_lifecycle()
+        self.profiler.stop('update.lifecycle', start_time)
+
+        # Units that changed tile or came into sight this tick: refresh what is drawn
+        self.update_visible_objects()
 
         # Handle next_action and check for screen transitions
         next_screen = self.handle_next_action()
@@ -1027,13 +1363,120 @@ class Game(BaseScreen):
         # Update panel animations
         self.vertical_panel.update()
 
-    def calculate_missile_origin(self, attacker):
-        angle_map_x = {0: 0, 45: 13, 90: 32, 135: 21, 180: 0, 225: -21, 270: -32, 315: -13}
-        angle_map_y = {0: -7, 45: -8, 90: -16, 135: -32, 180: -32, 225: -32, 270: -16, 315: -8}
-        attacker_world_x = attacker['x'] * self.tile_size + self.tile_size // 2 + angle_map_x[attacker['turret_direction']]
-        attacker_world_y = attacker['y'] * self.tile_size + self.tile_size // 2 + angle_map_y[attacker['turret_direction']]
-        
-        return attacker_world_x,attacker_world_y
+    def queue_spawn(self, obj, metadata=None):
+        """Add an object to the game at the next lifecycle batch."""
+        self.lifecycle.spawn(obj, metadata)
+
+    def queue_despawn(self, obj):
+        """Take a destroyed object out of the game at the next lifecycle batch (objects with infinite health stay)."""
+        if obj.get('max_health', 100) == -1:
+            return
+        if self.lifecycle.despawn(obj):
+            self.animation_manager.set_animation_state(obj['unique_id'], "destruction")
+
+    def apply_lifecycle(self):
+        """
+        Apply the queued despawns, then the queued spawns.
+
+        Every system tracking objects is updated here and nowhere else: the
+        object list, spatial index, targeting, fog, economy, passability and
+        opacity grids, weapons and engagements, turrets, animation state, movement, the visible set
+        and the selection.
+        """
+        spawns, despawns = self.lifecycle.take()
+        if despawns:
+            instrumentation.instant("objects_destroyed")
+            gone = {id(obj) for obj in despawns}
+            self.objects[:] = [obj for obj in self.objects if id(obj) not in gone]
+            self.combat.forget(gone)
+            for obj in despawns:
+                self.spatial_index.remove(obj)
+                self.targeting.unregister(obj)
+                self.fog.remove(obj)
+                self.economy.unregister(obj)
+                self.passability.remove_footprint(obj, self.tile_size)
+                self.opacity.remove_footprint(obj, self.tile_size)
+                self.end_cooldown(obj)
+                self.turrets.unregister(obj)
+                if obj.get('is_unit'):
+                    self.stop_unit(obj)
+                self.animation_manager.forget(obj['unique_id'])
+                # A destroyed ore processor leaves its deposit behind
+                resource = self.create_ore_resource(obj)
+                if resource is not None:
+                    spawns.append((resource, None))
+
+            self.visible_objects_cache = [entry for entry in self.visible_objects_cache if id(entry['obj']) not in gone]
+            self.selected_units = [unit for unit in self.selected_units if id(unit) not in gone]
+            self.selected_unit_ids -= gone
+            if self.selected_object is not None and id(self.selected_object) in gone:
+                self.selected_object = None
+                self.selected_object_image = None
+                self.panel.set_selected_object(None)
+
+        for obj, metadata in spawns:
+            if metadata is None:
+                metadata = self.object_collection.get_object_metadata(obj['type'], obj['id'])
+            self.objects.append(obj)
+            self.spatial_index.insert(obj)
+            self.targeting.register(obj, metadata)
+            self.fog.add(obj, metadata)
+            self.economy.register(obj, metadata)
+            self.combat.register(obj, metadata)
+            self.turrets.register(obj, metadata)
+            self.passability.add_footprint(obj, self.tile_size)
+            self.opacity.add_footprint(obj, self.tile_size)
+        if spawns:
+            # New objects have to be placed in the draw order
+            self.camera_moved = True
+            self.update_visible_objects()
+
+    def create_ore_resource(self, obj):
+        """
+        The resource left behind by a destroyed ore processor.
+
+        Returns:
+            dict: New resource object, or None if obj is not an ore processor
+        """
+        if obj['type'] != 'building':
+            return None
+        metadata = self.object_collection.get_object_metadata(obj['type'], obj['id'])
+        if not metadata or 'properties' not in metadata:
+            return None
+        properties = metadata['properties']
+        # Determine if it's an ore processor and which type
+        if not (properties.get('is_ore_iron', False) or properties.get('is_ore_gold', False)):
+            return None
+        # Create the resource object
+        resource_id = 0 if properties.get('is_ore_iron', False) else 1  # 0 for iron, 1 for gold
+        # Try to load resource image in different sizes
+        resource_image = None
+        for size in ['small', 'large', 'huge']:
+            resource_image = self.object_collection.get_object('resource', resource_id, size)
+            if resource_image:
+                break
+        if not resource_image:
+            return None
+
+        # Get resource metadata
+        resource_metadata = self.object_collection.get_object_metadata('resource', resource_id)
+
+        # New resource object at the same position
+        return {
+            'x': obj['x'],
+            'y': obj['y'],
+            'type': 'resource',
+            'id': resource_id,
+            'health': -1,  # Resources have infinite health
+            'max_health': -1,
+            'z_index': 1,  # Resources should be at ground level
+            'image': resource_image,
+            'offset': 32,  # Resources are typically small objects
+            'damage': 0,
+            'unique_id': f"{obj['x']}_{obj['y']}_resource_{resource_id}",
+            'name': resource_metadata.get('name', 'Unknown Resource') if resource_metadata else 'Unknown Resource',
+            'faction': FACTION_NEUTRAL
+        }
 
     def add_credits(self, amount):
         """Add credits to the player's balance"""
@@ -1060,7 +1503,8 @@ class Game(BaseScreen):
 
     def render(self):
         # Clear the screen before rendering
-        self.screen.fill((0, 0, 0))  # Black background
+        start_time = self.profiler.start()
+        self.world_surface.fill((0, 0, 0))  # Black background
 
         # Clear dirty rectangles from last frame
         self.dirty_rects = []
@@ -1097,41 +1541,26 @@ class Game(BaseScreen):
         )
 
         # Blit the visible portion of the pre-rendered map
-        self.screen.blit(self.map_surface, dest_rect, source_rect)
+        self.world_surface.blit(self.map_surface, dest_rect, source_rect)
+        self.profiler.stop('render.terrain', start_time)
 
         # First pass: Draw all non-selected objects and back parts of selection rings
-        objects_to_remove = []
+        start_time = self.profiler.start()
         for obj_data in self.visible_objects_cache:
             obj = obj_data['obj']
-            screen_x = obj_data['screen_x']
-            screen_y = obj_data['screen_y']
+            screen_x, screen_y = self.get_screen_position(obj_data)
             
             # Get current animation frame
             current_frame = self.animation_manager.get_next_frame(
                 obj['id'],
                 obj['type'],
-                obj['unique_id']
+                obj['unique_id'],
+                direction=obj['turret_direction'] if obj.get('has_turret') else 0,
+                angle=obj.get('turret_angle')
             )
             
-            # Check if object should be destroyed
-            if (current_frame == "DESTROYED" or 
-                (obj['health'] <= 0 and obj.get('max_health', 100) != -1)):  # Don't destroy if infinite health
-                objects_to_remove.append(obj)
-                # Create a dirty rect for the area that needs to be redrawn
-                obj_width = obj['image'].get_width()
-                obj_height = obj['image'].get_height()
-                
-                removal_rect = pygame.Rect(screen_x, screen_y, obj_width, obj_height)
-                self.dirty_rects.append(removal_rect)
-                # Force background redraw for this area
-                map_area = self.map_surface.subsurface(
-                    pygame.Rect(screen_x + self.camera_x, screen_y + self.camera_y, obj_width, obj_height)
-                ).copy()
-                self.screen.blit(map_area, (screen_x, screen_y))
-                
-                # Set destruction animation if not already destroyed
-                if current_frame != "DESTROYED":
-                    self.animation_manager.set_animation_state(obj['unique_id'], "destruction")
+            # Destroyed objects are queued for removal and leave at the next lifecycle batch; don't draw them
+            if current_frame == "DESTROYED" or self.lifecycle.is_despawning(obj):
                 continue
 
             # If no animation frame is available, use the default image
@@ -1146,28 +1575,31 @@ class Game(BaseScreen):
             self.dirty_rects.append(obj_rect)
             
             # Draw selection ring behind the object if it's selected
-            if self.selected_object == obj:
+            if self.is_selected(obj):
                 ring_radius = self.selection_ring_huge_radius if obj_width == 128 else self.selection_ring_radius
                 x, y = screen_x + obj_width // 2, screen_y + obj_height // 2
                 rect = pygame.Rect(x - ring_radius, y - ring_radius * 0.7, ring_radius * 2, ring_radius * 1.4)
-                pygame.draw.arc(self.screen, self.selection_ring_color, rect,
+                pygame.draw.arc(self.world_surface, self.selection_ring_color, rect,
                               math.pi/2, 3*math.pi/2, self.selection_ring_width)
             
             # Render the object
-            self.screen.blit(obj_image, (screen_x, screen_y))
+            self.world_surface.blit(obj_image, (screen_x, screen_y))
+        self.profiler.stop('render.objects', start_time)
 
         # Second pass: Draw front parts of selection rings for selected objects
+        start_time = self.profiler.start()
         for obj_data in self.visible_objects_cache:
             obj = obj_data['obj']
-            if obj not in objects_to_remove and self.selected_object == obj:
-                screen_x = obj_data['screen_x']
-                screen_y = obj_data['screen_y']
+            if self.is_selected(obj) and not self.lifecycle.is_despawning(obj):
+                screen_x, screen_y = self.get_screen_position(obj_data)
                 
                 # Get current animation frame for dimensions
                 current_frame = self.animation_manager.get_current_frame(
                     obj['id'],
                     obj['type'],
-                    obj['unique_id'])
+                    obj['unique_id'],
+                    obj['turret_direction'] if obj.get('has_turret') else 0,
+                    obj.get('turret_angle'))
                 
                 obj_width = current_frame.get_width() if current_frame and current_frame != "DESTROYED" else obj['image'].get_width()
                 obj_height = current_frame.get_height() if current_frame and current_frame != "DESTROYED" else obj['image'].get_height()
@@ -1176,107 +1608,49 @@ class Game(BaseScreen):
                 ring_radius = self.selection_ring_huge_radius if obj_width == 128 else self.selection_ring_radius
                 x, y = screen_x + obj_width // 2, screen_y + obj_height // 2
                 rect = pygame.Rect(x - ring_radius, y - ring_radius * 0.7, ring_radius * 2, ring_radius * 1.4)
-                pygame.draw.arc(self.screen, self.selection_ring_color, rect,
+                pygame.draw.arc(self.world_surface, self.selection_ring_color, rect,
                               -math.pi/2, math.pi/2, self.selection_ring_width)
-
-        # Remove destroyed objects after both rendering passes
-        for obj in objects_to_remove:
-            if obj in self.objects:
-                # Check if this is an ore processor before removing it
-                if obj['type'] == 'building':
-                    metadata = self.object_collection.get_object_metadata(obj['type'], obj['id'])
-                    if metadata and 'properties' in metadata:
-                        properties = metadata['properties']
-                        # Determine if it's an ore processor and which type
-                        if properties.get('is_ore_iron', False) or properties.get('is_ore_gold', False):
-                            # Create the resource object
-                            resource_id = 0 if properties.get('is_ore_iron', False) else 1  # 0 for iron, 1 for gold
-                            # Try to load resource image in different sizes
-                            resource_image = None
-                            for size in ['small', 'large', 'huge']:
-                                resource_image = self.object_collection.get_object('resource', resource_id, size)
-                                if resource_image:
-                                    break
-                            
-                            if resource_image:
-                                # Get resource metadata
-                                resource_metadata = self.object_collection.get_object_metadata('resource', resource_id)
-                                
-                                # Create new resource object at the same position
-                                new_resource = {
-                                    'x': obj['x'],
-                                    'y': obj['y'],
-                                    'type': 'resource',
-                                    'id': resource_id,
-                                    'health': -1,  # Resources have infinite health
-                                    'max_health': -1,
-                                    'z_index': 1,  # Resources should be at ground level
-                                    'image': resource_image,
-                                    'offset': 32,  # Resources are typically small objects
-                                    'damage': 0,
-                                    'unique_id': f"{obj['x']}_{obj['y']}_resource_{resource_id}",
-                                    'name': resource_metadata.get('name', 'Unknown Resource') if resource_metadata else 'Unknown Resource',
-                                    'charge_percent': 1.0  # Initialize charge percentage to 0
-                                }
-                                
-                                # Add the new resource to objects and spatial grid
-                                self.objects.append(new_resource)
-                                self.add_object_to_grid(new_resource)
-
-                                # Calculate screen position for the new resource
-                                world_x = new_resource['x'] * self.tile_size
-                                world_y = new_resource['y'] * self.tile_size
-                                screen_x = world_x - self.camera_x - new_resource['offset'] + self.tile_size // 2
-                                screen_y = world_y - self.camera_y - new_resource['offset'] + self.tile_size // 2
-
-                                # Create a dirty rect for the new resource area
-                                resource_rect = pygame.Rect(
-                                    screen_x,
-                                    screen_y,
-                                    resource_image.get_width(),
-                                    resource_image.get_height()
-                                )
-                                self.dirty_rects.append(resource_rect)
-
-                                # Force immediate redraw of the background in this area
-                                map_area = self.map_surface.subsurface(
-                                    pygame.Rect(world_x, world_y, self.tile_size, self.tile_size)
-                                ).copy()
-                                self.screen.blit(map_area, (screen_x, screen_y))
-
-                                # We need both camera_moved and update_visible_objects because:
-                                # 1. camera_moved = True forces a complete refresh of visible objects on next frame
-                                # 2. update_visible_objects() immediately updates the cache for this frame
-                                self.camera_moved = True
-                                self.update_visible_objects()
-                
-                # Remove the original object
-                self.objects.remove(obj)
-                self.remove_object_from_grid(obj)  # Remove from spatial grid
-                # Also remove from visible objects cache
-                self.visible_objects_cache = [x for x in self.visible_objects_cache if x['obj'] != obj]
-                if obj == self.selected_object:
-                    self.selected_object = None
-                    self.selected_object_image = None
-                    self.panel.set_selected_object(None)
+        self.profiler.stop('render.rings', start_time)
 
         # Render missiles
+        start_time = self.profiler.start()
         for missile in self.missiles:
-            missile.render(self.screen, self.missiles_images[missile.orientation // 45], self.camera_x, self.camera_y)
+            missile_image = RotationCache().get('missile', self.missile_image, missile.angle,
+                                                ROTATION_CACHE['missile_directions'])
+            missile.render(self.world_surface, missile_image, self.camera_x, self.camera_y)
 
         # Process explosions
         for explosion in self.active_explosions:
-            explosion.render(self.screen, self.camera_x, self.camera_y)
-            if explosion.finished:
-                self.active_explosions.remove(explosion)
+            explosion.render(self.world_surface, self.camera_x, self.camera_y)
+        self.profiler.stop('render.projectiles', start_time)
+
+        # Cover what the player cannot see
+        start_time = self.profiler.start()
+        if FOG_OF_WAR['enabled']:
+            self.fog.render(self.world_surface, self.camera_x, self.camera_y)
+        self.profiler.stop('render.fog', start_time)
+
+        # Upscale the internal resolution world to the screen once, under the panels
+        start_time = self.profiler.start()
+        if self.world_surface is not self.screen:
+            size = (self.screen_width, self.screen_height)
+            if RENDER_SCALE['smooth']:
+                pygame.transform.smoothscale(self.world_surface, size, self.screen)
+            else:
+                pygame.transform.scale(self.world_surface, size, self.screen)
+        self.profiler.stop('render.upscale', start_time)
 
         # Render the minimap
-        self.minimap.render(self.screen, self.camera_x, self.camera_y, self.camera_width, self.camera_height)
+        start_time = self.profiler.start()
+        self.minimap.render(self.screen, self.camera_x, self.camera_y, self.camera_width, self.camera_height,
+                            self.fog if FOG_OF_WAR['enabled'] else None)
         minimap_rect = pygame.Rect(self.minimap.x, self.minimap.y, 
                                  self.minimap.size, self.minimap.size)
         self.dirty_rects.append(minimap_rect)
+        self.profiler.stop('render.minimap', start_time)
 
         # Render the panels
+        start_time = self.profiler.start()
         self.vertical_panel.render()
         self.panel.render()
 
@@ -1328,19 +1702,17 @@ class Game(BaseScreen):
             # Render panel text after drawing the selected object
             self.panel.render_text()
 
-            # Render life bar and check if object should be destroyed
+            # Render life bar
             if self.selected_object:
-                if self.panel.render_life_bar(self.selected_object, left_area_rect) and self.selected_object.get('max_health', 100) != -1:  # Don't destroy if infinite health
-                    # Object should be destroyed
-                    self.objects.remove(self.selected_object)
-                    self.remove_object_from_grid(self.selected_object)  # Remove from spatial grid
-                    self.selected_object = None
-                    self.selected_object_image = None
+                self.panel.render_life_bar(self.selected_object, left_area_rect)
+        self.profiler.stop('render.panels', start_time)
 
         # IMPORTANT: Call parent's render method to ensure cursor is rendered on top of everything
         # This is required because BaseScreen handles cursor rendering and we want the cursor
         # to always be visible on top of all game elements
+        start_time = self.profiler.start()
         super().render()
+        self.profiler.stop('render.cursor', start_time)
 
         # Add cursor's dirty rectangle to the update list
         cursor_size = self.cursor_manager.cursor_size
@@ -1353,9 +1725,26 @@ class Game(BaseScreen):
         )
         self.dirty_rects.append(cursor_rect)
 
+        # Report object counts to the trace recorder
+        if instrumentation.is_recording():
+            instrumentation.counter('visible_objects', len(self.visible_objects_cache))
+            instrumentation.counter('missiles', len(self.missiles))
+            instrumentation.counter('explosions', len(self.active_explosions))
+
+        # Report object counts to the frame profiler
+        if self.profiler.enabled:
+            self.profiler.set_count('visible', len(self.visible_objects_cache))
+            self.profiler.set_count('missiles', len(self.missiles))
+            self.profiler.set_count('particles', sum(len(missile.smoke) for missile in self.missiles))
+            self.profiler.set_count('explosions', len(self.active_explosions))
+            self.profiler.set_count('path_queue', self.path_scheduler.depth)
+            self.profiler.set_count('path_wait_ms', int(self.path_scheduler.last_wait_ms))
+
         # Update only the dirty areas of the screen
+        start_time = self.profiler.start()
         if self.dirty_rects:
             pygame.display.update(self.dirty_rects)
         else:
             pygame.display.flip()
+        self.profiler.stop('display.update', start_time)
 
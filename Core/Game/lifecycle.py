@@ -0,0 +1,64 @@
+"""
+Deferred object creation and destruction.
+
+Input handlers, projectiles and the UI never add objects to the game or take
+them out directly: they queue them here. Game.apply_lifecycle() drains both
+queues at one fixed point of the tick (the 'update.lifecycle' stage, after
+missiles and explosions), so every system that tracks objects (the object
+list, spatial index, targeting, fog, economy, passability and opacity grids,
+animation state, visible set and selection) is updated once per batch, and
+rendering never changes which objects exist.
+
+Despawns are applied before spawns, so an object replacing a destroyed one
+(an ore processor turning back into a resource) can take its tile in the
+same batch.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class EntityLifecycle:
+    """Queues of objects waiting to enter or leave the game."""
+
+    def __init__(self):
+        self.spawns: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = []  # (object, metadata)
+        self.despawns: Dict[int, Dict[str, Any]] = {}  # id(obj) -> object, in queueing order
+
+    def __len__(self) -> int:
+        return len(self.spawns) + len(self.despawns)
+
+    def spawn(self, obj: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Queue a new object (metadata is looked up when applied if not given)."""
+        self.spawns.append((obj, metadata))
+
+    def despawn(self, obj: Dict[str, Any]) -> bool:
+        """
+        Queue an object for removal; queueing it again before the batch is applied does nothing.
+
+        Returns:
+            bool: True if the object was not queued yet
+        """
+        if id(obj) in self.despawns:
+            return False
+        self.despawns[id(obj)] = obj
+        return True
+
+    def is_despawning(self, obj: Dict[str, Any]) -> bool:
+        return id(obj) in self.despawns
+
+    def take(self) -> Tuple[List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]], List[Dict[str, Any]]]:
+        """
+        Hand over both queues and start new ones; whatever is queued while a
+        batch is applied waits for the next tick.
+
+        Returns:
+            tuple: (spawns as (object, metadata) pairs, objects to despawn)
+        """
+        spawns, despawns = self.spawns, list(self.despawns.values())
+        self.spawns = []
+        self.despawns = {}
+        return spawns, despawns
+
+    def clear(self) -> None:
+        self.spawns = []
+        self.despawns = {}
@@ -1,11 +1,9 @@
-import math
-
 import pygame
 
 from Core.Game.missile_smoke_particle import SmokeParticle
 
 class Missile:
-    def __init__(self, origin_position, target_position, origin, target, speed=4, orientation=0):
+    def __init__(self, origin_position, target_position, origin, target, speed=4, orientation=0, weapon=None):
         self.origin_position = origin_position
         self.target_position = target_position
         self.origin = origin
@@ -15,26 +13,14 @@ class Missile:
         self.finished = False
         self.smoke = []
         self.orientation = orientation
-        
-        dx = target_position[0] - origin_position[0]
-        dy = target_position[1] - origin_position[1]
-        dist = math.hypot(dx, dy)
-        self.direction = (dx / dist, dy / dist)
+        self.angle = float(orientation)  # Exact facing in degrees, for sprites rotated at runtime
+        self.weapon = weapon  # Weapon that fired it (damage and splash on impact)
 
     def update(self):
+        """Smoke trail; flight and impacts are stepped for all missiles at once by ProjectileSystem"""
         if self.finished:
             return
 
-        # movimentação
-        self.position[0] += self.direction[0] * self.speed
-        self.position[1] += self.direction[1] * self.speed
-
-        # distância até o alvo
-        dx = self.target_position[0] - self.position[0]
-        dy = self.target_position[1] - self.position[1]
-        if math.hypot(dx, dy) < self.speed:
-            self.finished = True
-
         # gera fumaça
         self.smoke.append(SmokeParticle(tuple(self.position)))
 
@@ -53,4 +39,4 @@ class Missile:
             # Adjust missile position for camera offset
             missile_x = self.position[0] - camera_x
             missile_y = self.position[1] - camera_y
-            surface.blit(image, (missile_x - 8, missile_y - 8))
+            surface.blit(image, image.get_rect(center=(missile_x, missile_y)))
@@ -0,0 +1,165 @@
+"""
+Batched movement for every walking unit.
+
+Positions, current waypoints, speeds and facings of all moving units live in
+NumPy arrays, and one step() per tick advances all of them at once. Python
+code only runs for the few units that reached their waypoint this tick (to pick
+the next one) or turned to a new sprite direction.
+
+Positions are in tiles (floats); a unit's tile coordinates in its object
+dictionary change when it reaches a waypoint, which is also the only time the
+owner needs to update the spatial index.
+
+With a Steering attached, units no longer walk the exact line to their
+waypoint: they keep apart, slide along obstacles and slow down near their
+goal, and count as arrived within STEERING['waypoint_radius'] of a waypoint.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from Core.Game.steering import Steering
+from Core.Utils.directions import EIGHT_DIRECTIONS, nearest_directions, screen_angles
+from config import STEERING
+
+
+class MovementSystem:
+    """Dense arrays of moving units, advanced together."""
+
+    def __init__(self, capacity: int = 256, directions: Sequence[int] = EIGHT_DIRECTIONS,
+                 steering: Optional[Steering] = None):
+        self.directions = tuple(directions)
+        self.steering = steering
+        self.count = 0
+        self.entities: List[Any] = []
+        self.slots: Dict[int, int] = {}  # id(entity) -> row in the arrays
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """(Re)allocate the arrays, keeping the rows in use."""
+        count = self.count
+        arrays = {
+            'position': np.zeros((capacity, 2), dtype=np.float32),
+            'waypoint': np.zeros((capacity, 2), dtype=np.float32),
+            'goal': np.full((capacity, 2), np.nan, dtype=np.float32),  # Final destination, for arrival slowing
+            'speed': np.zeros(capacity, dtype=np.float32),  # Tiles per second
+            'carry': np.zeros(capacity, dtype=np.float32),  # Distance left over after reaching a waypoint
+            'facing': np.full(capacity, -1, dtype=np.int16),
+        }
+        for name, array in arrays.items():
+            if count:
+                array[:count] = getattr(self, name)[:count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, entity: Any) -> bool:
+        return id(entity) in self.slots
+
+    def add(self, entity: Any, x: float, y: float, speed: float) -> None:
+        """Start moving an entity from (x, y); its waypoint is its own position until set_waypoint()."""
+        slot = self.slots.get(id(entity))
+        if slot is None:
+            if self.count == self.capacity:
+                self._allocate(self.capacity * 2)
+            slot = self.count
+            self.count += 1
+            self.entities.append(entity)
+            self.slots[id(entity)] = slot
+            self.facing[slot] = -1
+            self.carry[slot] = 0.0
+        self.position[slot] = (x, y)
+        self.waypoint[slot] = (x, y)
+        self.goal[slot] = np.nan
+        self.speed[slot] = speed
+
+    def remove(self, entity: Any) -> None:
+        """Stop moving an entity; the last row is moved into its slot to keep the arrays dense."""
+        slot = self.slots.pop(id(entity), None)
+        if slot is None:
+            return
+        last = self.count - 1
+        if slot != last:
+            moved = self.entities[last]
+            self.entities[slot] = moved
+            self.slots[id(moved)] = slot
+            for array in (self.position, self.waypoint, self.goal, self.speed, self.carry, self.facing):
+                array[slot] = array[last]
+        self.entities.pop()
+        self.count = last
+
+    def set_waypoint(self, entity: Any, x: float, y: float) -> None:
+        self.waypoint[self.slots[id(entity)]] = (x, y)
+
+    def set_goal(self, entity: Any, x: float, y: float) -> None:
+        """Final destination of the entity's order; steering slows down when approaching it."""
+        self.goal[self.slots[id(entity)]] = (x, y)
+
+    def get_position(self, entity: Any) -> Tuple[float, float]:
+        slot = self.slots[id(entity)]
+        return float(self.position[slot, 0]), float(self.position[slot, 1])
+
+    def step(self, dt: float) -> Tuple[List[Any], List[Tuple[Any, int]]]:
+        """
+        Advance every entity towards its waypoint.
+
+        Args:
+            dt: Time since the last step in seconds
+
+        Returns:
+            Tuple: Entities that reached their waypoint this step, and
+                   (entity, direction) for those whose sprite direction changed
+        """
+        count = self.count
+        if not count:
+            return [], []
+        position = self.position[:count]
+        waypoint = self.waypoint[:count]
+        carry = self.carry[:count]
+
+        delta = waypoint - position
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        if self.steering is not None:
+            return self._steer(dt, delta, distance)
+        travel = self.speed[:count] * np.float32(dt) + carry
+        arrived = distance <= travel
+
+        # Facing towards the waypoint, quantized through the shared lookup table
+        heading = distance > 0.0
+        turned = self._update_facing(delta, heading)
+
+        walking = ~arrived
+        scale = np.divide(travel, distance, out=np.zeros_like(distance), where=walking)
+        position += delta * scale[:, None]
+        position[arrived] = waypoint[arrived]
+        # Entities that reached their waypoint keep the rest of this step for the next one
+        reached = arrived & heading
+        carry[:] = np.where(reached, travel - distance, 0.0)
+
+        entities = self.entities
+        arrived_entities = [entities[i] for i in np.flatnonzero(reached)]
+        return arrived_entities, turned
+
+    def _update_facing(self, delta: np.ndarray, heading: np.ndarray) -> List[Tuple[Any, int]]:
+        """Face the waypoint through the shared lookup table; returns the entities that turned."""
+        facing = self.facing[:self.count]
+        new_facing = np.where(heading, nearest_directions(screen_angles(delta[:, 0], delta[:, 1]), self.directions), facing)
+        turned = np.flatnonzero(new_facing != facing)
+        facing[:] = new_facing
+        entities = self.entities
+        return [(entities[i], int(new_facing[i])) for i in turned]
+
+    def _steer(self, dt: float, delta: np.ndarray, distance: np.ndarray) -> Tuple[List[Any], List[Tuple[Any, int]]]:
+        """step() with the steering layer: positions come from Steering.move, arrival is radius based."""
+        count = self.count
+        position = self.position[:count]
+        waypoint = self.waypoint[:count]
+        heading = distance > STEERING['waypoint_radius']
+        turned = self._update_facing(delta, heading)
+
+        position[:] = self.steering.move(position, waypoint, self.goal[:count], self.speed[:count], dt)
+        remaining = waypoint - position
+        reached = (np.hypot(remaining[:, 0], remaining[:, 1]) <= STEERING['waypoint_radius']) & heading
+        entities = self.entities
+        return [entities[i] for i in np.flatnonzero(reached)], turned
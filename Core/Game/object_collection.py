@@ -1,14 +1,23 @@
 import os
 import pygame
 import json
+from Core.Utils import instrumentation
+from Core.Utils import memory_report
+from Core.Utils.asset_cache import AssetCache
 
 class ObjectCollection:
+    instance_count = 0  # Used to tell collections apart in the memory report
+
     def __init__(self):
         self.objects = {}  # Dictionary to store objects by type
         self.small_objects = {}  # Dictionary for 32x32 objects
         self.large_objects = {}  # Dictionary for 64x64 objects
         self.huge_objects = {}   # Dictionary for 128x128 objects
         self.object_metadata = {}  # Cache for object metadata (name, description)
+        ObjectCollection.instance_count += 1
+        for size_dict in ['small_objects', 'large_objects', 'huge_objects']:
+            memory_report.register(f"ObjectCollection#{ObjectCollection.instance_count}.{size_dict}",
+                                   self, size_dict, 'objects', str)
         self.load_objects()
 
     def load_object_metadata(self, obj_type, obj_id):
@@ -48,6 +57,7 @@ class ObjectCollection:
             return self.load_object_metadata(obj_type, obj_id)
         return self.object_metadata[cache_key]
 
+    @instrumentation.traced("ObjectCollection.load_objects", "assets")
     def load_objects(self):
         # Define the base path for objects using os.path.join for consistent separators
         base_path = os.path.join("Maps", "Common", "Objects")
@@ -91,7 +101,7 @@ class ObjectCollection:
                                 
                                 # Load the image and convert it for proper transparency
                                 image_path = os.path.join(type_path, filename)
-                                image = pygame.image.load(image_path).convert_alpha()
+                                image = AssetCache().get_image(image_path, alpha=True)
                                 
                                 # Load object metadata
                                 metadata = self.load_object_metadata(obj_type, number)
@@ -0,0 +1,234 @@
+"""
+Batched projectile flight and swept collision.
+
+Positions, headings, speeds and turn rates of all missiles in flight live in
+NumPy arrays and one step() per tick advances all of them. Homing missiles
+turn towards their target's current position by at most their turn rate per
+tick, so shots at moving units follow them instead of landing where the unit
+stood at launch.
+
+A missile hits whatever it actually flies through: the segment it travelled
+this tick is tested against the footprint boxes of the objects the
+SpatialIndex returns for the segment's bounding box, so the cost of a
+collision test depends on what is near the missile, not on the number of
+objects. Only the missile's target and objects hostile to its shooter can be
+hit. A missile that reaches its aim point without touching anything, or flies
+for COMBAT['projectile_lifetime'] ticks, lands on the ground.
+
+Positions are in world pixels.
+"""
+
+import math
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from Core.AI.pathfinding import footprint_radius
+from Core.Game.spatial_index import SpatialIndex
+from Core.Game.targeting import is_hostile
+from Core.Utils.directions import EIGHT_DIRECTIONS, nearest_directions, screen_angles
+from config import COMBAT
+
+# (missile, object hit or None for a ground impact, impact point in world pixels)
+Impact = Tuple[Any, Optional[Dict[str, Any]], Tuple[float, float]]
+
+
+def segment_hits_box(x0: float, y0: float, x1: float, y1: float,
+                     min_x: float, min_y: float, max_x: float, max_y: float) -> Optional[float]:
+    """
+    Where the segment (x0, y0) -> (x1, y1) enters an axis aligned box (slab test).
+
+    Returns:
+        float: Fraction of the segment at the entry point (0 if it starts inside), or None if it misses
+    """
+    enter, leave = 0.0, 1.0
+    for start, delta, low, high in ((x0, x1 - x0, min_x, max_x), (y0, y1 - y0, min_y, max_y)):
+        if delta == 0.0:
+            if start < low or start > high:
+                return None
+            continue
+        t0 = (low - start) / delta
+        t1 = (high - start) / delta
+        if t0 > t1:
+            t0, t1 = t1, t0
+        enter = max(enter, t0)
+        leave = min(leave, t1)
+        if enter > leave:
+            return None
+    return enter
+
+
+class ProjectileSystem:
+    """Dense arrays of missiles in flight, stepped together."""
+
+    def __init__(self, spatial_index: SpatialIndex, tile_size: int = 32, capacity: int = 64):
+        self.spatial_index = spatial_index
+        self.tile_size = tile_size
+        self.count = 0
+        self.missiles: List[Any] = []
+        self.slots: Dict[int, int] = {}  # id(missile) -> row in the arrays
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """(Re)allocate the arrays, keeping the rows in use."""
+        count = self.count
+        arrays = {
+            'position': np.zeros((capacity, 2), dtype=np.float64),
+            'heading': np.zeros(capacity, dtype=np.float64),  # Radians, x right and y down
+            'aim': np.zeros((capacity, 2), dtype=np.float64),  # Last known target position
+            'speed': np.zeros(capacity, dtype=np.float64),  # Pixels per tick
+            'turn_rate': np.zeros(capacity, dtype=np.float64),  # Radians per tick, 0 for straight flight
+            'age': np.zeros(capacity, dtype=np.int32),  # Ticks in flight
+        }
+        for name, array in arrays.items():
+            if count:
+                array[:count] = getattr(self, name)[:count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, missile: Any, homing: bool = False, turn_rate: float = 0.0) -> None:
+        """
+        Start flying a missile from its position towards its target position.
+
+        Args:
+            missile: Missile (position, target_position, speed, target, origin and orientation are used)
+            homing: Whether it follows its target
+            turn_rate: Degrees per tick a homing missile can turn
+        """
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        slot = self.count
+        self.count += 1
+        self.missiles.append(missile)
+        self.slots[id(missile)] = slot
+        x, y = missile.position
+        aim_x, aim_y = missile.target_position
+        self.position[slot] = (x, y)
+        self.aim[slot] = (aim_x, aim_y)
+        self.heading[slot] = math.atan2(aim_y - y, aim_x - x)
+        missile.angle = (math.degrees(math.atan2(y - aim_y, aim_x - x)) + 450.0) % 360.0  # Game.calculate_angle convention
+        self.speed[slot] = missile.speed
+        self.turn_rate[slot] = math.radians(turn_rate) if homing else 0.0
+        self.age[slot] = 0
+
+    def remove(self, missile: Any) -> None:
+        """Stop a missile; the last row is moved into its slot to keep the arrays dense."""
+        slot = self.slots.pop(id(missile), None)
+        if slot is None:
+            return
+        last = self.count - 1
+        if slot != last:
+            moved = self.missiles[last]
+            self.missiles[slot] = moved
+            self.slots[id(moved)] = slot
+            for array in (self.position, self.heading, self.aim, self.speed, self.turn_rate, self.age):
+                array[slot] = array[last]
+        self.missiles.pop()
+        self.count = last
+
+    def clear(self) -> None:
+        self.count = 0
+        self.missiles = []
+        self.slots = {}
+
+    def step(self, locate: Callable[[Dict[str, Any]], Tuple[float, float]]) -> List[Impact]:
+        """
+        Advance every missile by one tick and resolve collisions.
+
+        Args:
+            locate: Position of an object in tiles (fractional while it walks)
+
+        Returns:
+            list: Impacts of the missiles that finished this tick; they are removed
+                  from the system and marked finished
+        """
+        count = self.count
+        if not count:
+            return []
+        missiles = self.missiles
+        tile_size = self.tile_size
+        half_tile = tile_size / 2
+
+        # Homing missiles re-aim at their target while it lives
+        homing = np.flatnonzero(self.turn_rate[:count] > 0.0).tolist()
+        live = [slot for slot in homing if self._is_alive(missiles[slot].target)]
+        if live:
+            aims = np.fromiter(chain.from_iterable(locate(missiles[slot].target) for slot in live),
+                               dtype=np.float64, count=2 * len(live)).reshape(-1, 2)
+            self.aim[live] = aims * tile_size + half_tile
+
+        position = self.position[:count]
+        heading = self.heading[:count]
+        speed = self.speed[:count]
+        to_aim = self.aim[:count] - position
+        distance = np.hypot(to_aim[:, 0], to_aim[:, 1])
+
+        # Turn towards the aim point, at most turn_rate per tick
+        turn = (np.arctan2(to_aim[:, 1], to_aim[:, 0]) - heading + np.pi) % (2 * np.pi) - np.pi
+        heading += np.clip(turn, -self.turn_rate[:count], self.turn_rate[:count])
+        start = position.copy()
+        arrived = distance <= speed
+        travel = np.where(arrived, distance, speed)
+        position[:, 0] += np.cos(heading) * travel
+        position[:, 1] += np.sin(heading) * travel
+        # A missile that would overshoot its aim point stops on it
+        position[arrived] = self.aim[:count][arrived]
+        self.age[:count] += 1
+        expired = self.age[:count] >= COMBAT['projectile_lifetime']
+
+        # Sprite facing of the flight heading: exact angle, and the closest of the 8 exported directions
+        angles = screen_angles(np.cos(heading), np.sin(heading))
+        orientations = nearest_directions(angles, EIGHT_DIRECTIONS).tolist()
+        angles = angles.tolist()
+
+        impacts = []
+        start_list = start.tolist()
+        end_list = position.tolist()
+        finished = arrived | expired
+        for slot in range(count):
+            missile = missiles[slot]
+            missile.orientation = orientations[slot]
+            missile.angle = angles[slot]
+            x0, y0 = start_list[slot]
+            x1, y1 = end_list[slot]
+            missile.position = [x1, y1]
+            hit, fraction = self._sweep(missile, x0, y0, x1, y1, locate)
+            if hit is not None:
+                impacts.append((missile, hit, (x0 + (x1 - x0) * fraction, y0 + (y1 - y0) * fraction)))
+            elif finished[slot]:
+                impacts.append((missile, None, (x1, y1)))
+        for missile, _, point in impacts:
+            missile.position = list(point)
+            missile.finished = True
+            self.remove(missile)
+        return impacts
+
+    @staticmethod
+    def _is_alive(target: Optional[Dict[str, Any]]) -> bool:
+        return target is not None and (target['health'] > 0 or target.get('max_health', 100) == -1)
+
+    def _sweep(self, missile: Any, x0: float, y0: float, x1: float, y1: float,
+               locate: Callable[[Dict[str, Any]], Tuple[float, float]]) -> Tuple[Optional[Dict[str, Any]], float]:
+        """First hittable object the segment (x0, y0) -> (x1, y1) passes through, and where along it."""
+        tile_size = self.tile_size
+        target, source = missile.target, missile.origin
+        # One extra tile around the segment for walking units, which are indexed on their last tile
+        candidates = self.spatial_index.query_pixel_rect(
+            min(x0, x1) - tile_size, min(y0, y1) - tile_size, max(x0, x1) + tile_size, max(y0, y1) + tile_size)
+        best, best_fraction = None, 2.0
+        for obj in candidates:
+            if obj is source or not self._is_alive(obj):
+                continue
+            if obj is not target and (source is None or not is_hostile(source, obj)):
+                continue
+            tile_x, tile_y = locate(obj)
+            half = (footprint_radius(obj, tile_size) + 0.5) * tile_size
+            center_x = tile_x * tile_size + tile_size / 2
+            center_y = tile_y * tile_size + tile_size / 2
+            fraction = segment_hits_box(x0, y0, x1, y1, center_x - half, center_y - half,
+                                        center_x + half, center_y + half)
+            if fraction is not None and fraction < best_fraction:
+                best, best_fraction = obj, fraction
+        return best, best_fraction
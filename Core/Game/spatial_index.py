@@ -0,0 +1,246 @@
+"""
+Spatial index of the game objects.
+
+Objects are bucketed in square cells (Game.grid_cell_size pixels, 4 tiles by
+default). Each object is inserted into every cell its sprite overlaps, so big
+objects (64 and 128 px sprites drawn around their anchor tile) are found from
+any cell they cover, not only from the cell of their anchor tile.
+
+Coordinates are in tiles unless a name says otherwise; distances for radius
+and nearest queries are measured between anchor tiles (obj['x'], obj['y']),
+the same way attack ranges are.
+"""
+
+import heapq
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+Cell = Tuple[int, int]
+Bounds = Tuple[int, int, int, int]  # min_x, min_y, max_x, max_y in tiles, inclusive
+ObjectFilter = Optional[Callable[[Dict[str, Any]], bool]]
+
+
+class SpatialIndex:
+    """Uniform grid of object buckets with rect, radius, tile and nearest queries."""
+
+    def __init__(self, tile_size: int = 32, cell_size: int = 128):
+        self.tile_size = tile_size
+        self.cell_tiles = max(1, cell_size // tile_size)  # Cell size in tiles
+        self.cells: Dict[Cell, Dict[int, Dict[str, Any]]] = {}
+        self.entries: Dict[int, Tuple[Dict[str, Any], Bounds, Tuple[Cell, ...]]] = {}
+        self.extent: Optional[List[int]] = None  # Cells ever used: min_cx, min_cy, max_cx, max_cy
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, obj: Dict[str, Any]) -> bool:
+        return id(obj) in self.entries
+
+    def get_bounds(self, obj: Dict[str, Any]) -> Bounds:
+        """Tiles covered by the object's sprite, which is drawn centred on its anchor tile."""
+        tile_size = self.tile_size
+        width = obj['image'].get_width()
+        height = obj['image'].get_height()
+        shift = obj.get('offset', tile_size // 2) - tile_size // 2
+        left = obj['x'] * tile_size - shift
+        top = obj['y'] * tile_size - shift
+        return (left // tile_size, top // tile_size,
+                (left + width - 1) // tile_size, (top + height - 1) // tile_size)
+
+    def cell_of(self, tile_x: int, tile_y: int) -> Cell:
+        return tile_x // self.cell_tiles, tile_y // self.cell_tiles
+
+    def _cells_for(self, bounds: Bounds) -> Tuple[Cell, ...]:
+        min_cx, min_cy = self.cell_of(bounds[0], bounds[1])
+        max_cx, max_cy = self.cell_of(bounds[2], bounds[3])
+        return tuple((cx, cy) for cy in range(min_cy, max_cy + 1) for cx in range(min_cx, max_cx + 1))
+
+    def _grow_extent(self, cells: Tuple[Cell, ...]) -> None:
+        first, last = cells[0], cells[-1]
+        extent = self.extent
+        if extent is None:
+            self.extent = [first[0], first[1], last[0], last[1]]
+            return
+        if first[0] < extent[0]:
+            extent[0] = first[0]
+        if first[1] < extent[1]:
+            extent[1] = first[1]
+        if last[0] > extent[2]:
+            extent[2] = last[0]
+        if last[1] > extent[3]:
+            extent[3] = last[1]
+
+    # region Updates
+    def insert(self, obj: Dict[str, Any]) -> None:
+        """Add an object (or refresh it if it is already indexed)."""
+        if id(obj) in self.entries:
+            self.move(obj)
+            return
+        bounds = self.get_bounds(obj)
+        cells = self._cells_for(bounds)
+        key = id(obj)
+        for cell in cells:
+            bucket = self.cells.get(cell)
+            if bucket is None:
+                bucket = self.cells[cell] = {}
+            bucket[key] = obj
+        self.entries[key] = (obj, bounds, cells)
+        self._grow_extent(cells)
+
+    def remove(self, obj: Dict[str, Any]) -> None:
+        entry = self.entries.pop(id(obj), None)
+        if entry is None:
+            return
+        for cell in entry[2]:
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.pop(id(obj), None)
+                if not bucket:
+                    del self.cells[cell]
+
+    def move(self, obj: Dict[str, Any]) -> None:
+        """Update an object after its tile changed; buckets are only touched when it changes cells."""
+        entry = self.entries.get(id(obj))
+        if entry is None:
+            self.insert(obj)
+            return
+        bounds = self.get_bounds(obj)
+        cells = self._cells_for(bounds)
+        if cells == entry[2]:
+            self.entries[id(obj)] = (obj, bounds, cells)
+            return
+        self.remove(obj)
+        self.insert(obj)
+
+    def rebuild(self, objects: Iterable[Dict[str, Any]]) -> None:
+        """Replace the whole index in one pass (map load)."""
+        self.clear()
+        cells = self.cells
+        entries = self.entries
+        for obj in objects:
+            bounds = self.get_bounds(obj)
+            object_cells = self._cells_for(bounds)
+            key = id(obj)
+            for cell in object_cells:
+                bucket = cells.get(cell)
+                if bucket is None:
+                    bucket = cells[cell] = {}
+                bucket[key] = obj
+            entries[key] = (obj, bounds, object_cells)
+            self._grow_extent(object_cells)
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.entries.clear()
+        self.extent = None
+    # endregion
+
+    # region Queries
+    def query_rect(self, min_x: int, min_y: int, max_x: int, max_y: int,
+                   filter: ObjectFilter = None) -> List[Dict[str, Any]]:
+        """Objects whose sprite overlaps the tile rectangle (inclusive), each once."""
+        min_cx, min_cy = self.cell_of(min_x, min_y)
+        max_cx, max_cy = self.cell_of(max_x, max_y)
+        found: Dict[int, Dict[str, Any]] = {}
+        entries = self.entries
+        for cy in range(min_cy, max_cy + 1):
+            for cx in range(min_cx, max_cx + 1):
+                bucket = self.cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for key, obj in bucket.items():
+                    if key in found:
+                        continue
+                    bounds = entries[key][1]
+                    if bounds[0] <= max_x and bounds[2] >= min_x and bounds[1] <= max_y and bounds[3] >= min_y:
+                        if filter is None or filter(obj):
+                            found[key] = obj
+        return list(found.values())
+
+    def query_pixel_rect(self, left: float, top: float, right: float, bottom: float,
+                         filter: ObjectFilter = None) -> List[Dict[str, Any]]:
+        """query_rect for a rectangle in world pixels."""
+        tile_size = self.tile_size
+        return self.query_rect(int(left // tile_size), int(top // tile_size),
+                               int(right // tile_size), int(bottom // tile_size), filter)
+
+    def objects_at(self, tile_x: int, tile_y: int, filter: ObjectFilter = None) -> List[Dict[str, Any]]:
+        """Objects anchored on a tile."""
+        bucket = self.cells.get(self.cell_of(tile_x, tile_y))
+        if not bucket:
+            return []
+        return [obj for obj in bucket.values()
+                if obj['x'] == tile_x and obj['y'] == tile_y and (filter is None or filter(obj))]
+
+    def query_radius(self, x: float, y: float, radius: float,
+                     filter: ObjectFilter = None) -> List[Dict[str, Any]]:
+        """Objects whose anchor tile is within radius tiles of (x, y)."""
+        radius_squared = radius * radius
+        reach = int(radius) + 1
+        result = []
+        seen = set()
+        min_cx, min_cy = self.cell_of(int(x) - reach, int(y) - reach)
+        max_cx, max_cy = self.cell_of(int(x) + reach, int(y) + reach)
+        for cy in range(min_cy, max_cy + 1):
+            for cx in range(min_cx, max_cx + 1):
+                bucket = self.cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for key, obj in bucket.items():
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    dx = obj['x'] - x
+                    dy = obj['y'] - y
+                    if dx * dx + dy * dy <= radius_squared and (filter is None or filter(obj)):
+                        result.append(obj)
+        return result
+
+    def nearest(self, x: float, y: float, k: int = 1, filter: ObjectFilter = None,
+                max_distance: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        The k objects closest to (x, y), closest first.
+
+        Cells are searched in growing square rings and the search stops once no
+        unvisited cell can hold anything closer than the k-th best so far.
+        """
+        if not self.entries or k <= 0:
+            return []
+        center_cx, center_cy = self.cell_of(int(x), int(y))
+        min_cx, min_cy, max_cx, max_cy = self.extent
+        max_ring = max(abs(center_cx - min_cx), abs(center_cx - max_cx),
+                       abs(center_cy - min_cy), abs(center_cy - max_cy))
+        limit = max_distance * max_distance if max_distance is not None else float('inf')
+
+        best: List[Tuple[float, int, Dict[str, Any]]] = []  # Max-heap of (-distance², id, obj)
+        seen = set()
+        for ring in range(max_ring + 1):
+            if len(best) == k:
+                # Closest possible point of this ring, in tiles
+                gap = (ring - 1) * self.cell_tiles
+                if gap > 0 and gap * gap > -best[0][0]:
+                    break
+            if max_distance is not None and (ring - 1) * self.cell_tiles > max_distance:
+                break
+            for cy in range(center_cy - ring, center_cy + ring + 1):
+                step = 1 if cy in (center_cy - ring, center_cy + ring) else 2 * ring
+                for cx in range(center_cx - ring, center_cx + ring + 1, max(step, 1)):
+                    bucket = self.cells.get((cx, cy))
+                    if not bucket:
+                        continue
+                    for key, obj in bucket.items():
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        if filter is not None and not filter(obj):
+                            continue
+                        dx = obj['x'] - x
+                        dy = obj['y'] - y
+                        distance = dx * dx + dy * dy
+                        if distance > limit:
+                            continue
+                        if len(best) < k:
+                            heapq.heappush(best, (-distance, key, obj))
+                        elif distance < -best[0][0]:
+                            heapq.heapreplace(best, (-distance, key, obj))
+        return [obj for _, _, obj in sorted(best, key=lambda item: -item[0])]
+    # endregion
@@ -0,0 +1,183 @@
+"""
+Local steering for moving units.
+
+Paths keep units away from obstacles but not from each other: a group heading
+for the same tile would walk in single file and pile up on it. Each tick the
+steering layer turns every unit's straight line to its waypoint into a velocity
+made of:
+
+- seek: towards the waypoint, slowed down near the final goal (arrival)
+- separation: away from other moving units closer than
+  STEERING['separation_radius'], stronger the closer they are
+- obstacle avoidance: a move that would enter a blocked tile (terrain or a
+  building footprint) slides along the blocked axis, or is dropped
+
+Neighbours come from a uniform spatial hash rebuilt in bulk from the position
+array every tick, so a crowd costs O(n) per tick instead of O(n^2).
+"""
+
+from typing import Tuple
+import numpy as np
+from Core.AI.pathfinding import PassabilityGrid
+from config import STEERING
+
+# Half of the neighbour cells: with the cell itself, every pair of neighbouring cells is visited once
+_FORWARD_OFFSETS = [(0, 0), (0, 1), (1, -1), (1, 0), (1, 1)]
+_KEY_STRIDE = 1 << 21  # Cell y range per cell x in the hash keys
+
+
+class SpatialHash:
+    """Uniform grid over a set of points, built in one pass with a sort."""
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.order = np.zeros(0, dtype=np.int64)
+        self.sorted_keys = np.zeros(0, dtype=np.int64)
+
+    def _keys(self, cells: np.ndarray) -> np.ndarray:
+        return cells[:, 0] * _KEY_STRIDE + cells[:, 1]
+
+    def build(self, points: np.ndarray) -> None:
+        """Rebuild the hash for an (n, 2) array of points."""
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        self.keys = self._keys(cells)
+        self.order = np.argsort(self.keys, kind='stable')
+        self.sorted_keys = self.keys[self.order]
+
+    def pairs(self, points: np.ndarray, radius: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Every pair of points closer than radius (radius must not exceed the cell size).
+
+        Returns:
+            Tuple: Index arrays i and j (each pair once) and the distance of each pair
+        """
+        count = len(self.keys)
+        empty = np.zeros(0, dtype=np.int64)
+        if count < 2:
+            return empty, empty, np.zeros(0, dtype=points.dtype)
+
+        sorted_keys = self.sorted_keys
+        first, second = [], []
+        for dx, dy in _FORWARD_OFFSETS:
+            # Queries in sorted order make the binary searches cache friendly
+            neighbour_keys = sorted_keys + (dx * _KEY_STRIDE + dy)
+            low = np.searchsorted(sorted_keys, neighbour_keys, side='left')
+            high = np.searchsorted(sorted_keys, neighbour_keys, side='right')
+            counts = high - low
+            total = int(counts.sum())
+            if not total:
+                continue
+            # Expand each point's [low, high) range of the sorted order into pairs
+            owner = np.repeat(np.arange(count), counts)
+            other = np.repeat(low, counts) + (np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts))
+            if dx == 0 and dy == 0:
+                keep = owner < other  # Same cell: each pair once, and not the point with itself
+                owner, other = owner[keep], other[keep]
+            first.append(self.order[owner])
+            second.append(self.order[other])
+        if not first:
+            return empty, empty, np.zeros(0, dtype=points.dtype)
+
+        i = np.concatenate(first)
+        j = np.concatenate(second)
+        delta = points[i] - points[j]
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        close = distance < radius
+        return i[close], j[close], distance[close]
+
+
+class Steering:
+    """Seek, separation, arrival and obstacle avoidance for a MovementSystem."""
+
+    def __init__(self, grid: PassabilityGrid):
+        self.grid = grid
+        # Live view of the walkable cells: building and destroying footprints shows up immediately
+        self.passable = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.height, grid.width)
+        self.hash = SpatialHash(max(STEERING['hash_cell_size'], STEERING['separation_radius']))
+        self.last_pairs = 0  # Neighbour pairs found in the last tick, for metrics
+
+    def is_walkable(self, points: np.ndarray) -> np.ndarray:
+        """Whether the tile under each point (tile centres are at integer coordinates) is walkable."""
+        tiles = np.rint(points).astype(np.int64)
+        x, y = tiles[:, 0], tiles[:, 1]
+        inside = (x >= 0) & (x < self.grid.width) & (y >= 0) & (y < self.grid.height)
+        walkable = np.zeros(len(points), dtype=bool)
+        walkable[inside] = self.passable[y[inside], x[inside]] == 1
+        return walkable
+
+    def move(self, position: np.ndarray, waypoint: np.ndarray, goal: np.ndarray,
+             speed: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Steer every unit for one tick.
+
+        Args:
+            position: (n, 2) positions in tiles
+            waypoint: (n, 2) current waypoints
+            goal: (n, 2) final destinations (NaN when unknown: no arrival slowing)
+            speed: (n,) top speeds in tiles per second
+            dt: Tick length in seconds
+
+        Returns:
+            np.ndarray: (n, 2) new positions
+        """
+        delta = waypoint - position
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        direction = np.divide(delta, distance[:, None], out=np.zeros_like(delta), where=distance[:, None] > 0)
+
+        # Arrival: slow down inside the slowing radius of the final goal
+        to_goal = goal - position
+        goal_distance = np.nan_to_num(np.hypot(to_goal[:, 0], to_goal[:, 1]), nan=np.inf)
+        slowing = np.clip(goal_distance / STEERING['arrival_radius'], STEERING['min_arrival_speed'], 1.0)
+        top_speed = speed * slowing
+        velocity = direction * top_speed[:, None]
+
+        # Separation from neighbours
+        radius = STEERING['separation_radius']
+        self.hash.build(position)
+        i, j, pair_distance = self.hash.pairs(position, radius)
+        self.last_pairs = len(i)
+        if len(i):
+            away = position[i] - position[j]
+            # Units on the exact same spot get pushed apart along a fixed per-pair direction
+            stacked = pair_distance < 1e-4
+            if stacked.any():
+                angle = (i[stacked] * 2.399963).astype(position.dtype)  # Golden angle spreads them out
+                pair_distance = np.where(stacked, radius * 0.5, pair_distance)
+                away[stacked] = np.stack((np.cos(angle), np.sin(angle)), axis=1) * (radius * 0.5)
+            strength = (1.0 - pair_distance / radius) / pair_distance
+            push = away * strength[:, None]
+            count = len(position)
+            separation = np.column_stack((
+                np.bincount(i, push[:, 0], count) - np.bincount(j, push[:, 0], count),
+                np.bincount(i, push[:, 1], count) - np.bincount(j, push[:, 1], count),
+            )).astype(position.dtype)
+            # Fades out close to the goal, where units heading for the same tile have to meet;
+            # the owner then moves late arrivals to free tiles nearby
+            fade = np.clip(goal_distance / STEERING['arrival_radius'], 0.0, 1.0)
+            velocity += separation * (speed * fade * STEERING['separation_weight'])[:, None]
+
+            # Never faster than the unit can walk
+            magnitude = np.hypot(velocity[:, 0], velocity[:, 1])
+            too_fast = magnitude > top_speed
+            velocity[too_fast] *= (top_speed[too_fast] / magnitude[too_fast])[:, None]
+
+        # Step, without stepping past the waypoint
+        step = velocity * np.float32(dt)
+        step_length = np.hypot(step[:, 0], step[:, 1])
+        overshoot = (step_length > distance) & (distance > 0)
+        step[overshoot] = delta[overshoot]
+        moved = position + step
+
+        # Obstacle avoidance: slide along walls instead of entering them
+        blocked = ~self.is_walkable(moved)
+        if blocked.any():
+            slide_x = np.column_stack((moved[:, 0], position[:, 1]))
+            slide_y = np.column_stack((position[:, 0], moved[:, 1]))
+            use_x = blocked & self.is_walkable(slide_x)
+            use_y = blocked & ~use_x & self.is_walkable(slide_y)
+            stuck = blocked & ~use_x & ~use_y
+            moved[use_x] = slide_x[use_x]
+            moved[use_y] = slide_y[use_y]
+            moved[stuck] = position[stuck]
+        return moved
@@ -0,0 +1,138 @@
+"""
+Automatic target acquisition for defensive buildings.
+
+Objects whose metadata sets "auto_target" (the defense tower) engage hostile
+objects in their attack range on their own. A tower only searches while it is
+idle: once it has a target, the attack loop keeps firing at it until the
+target dies or leaves the range, and only then does the tower search again.
+
+Searches are radius queries on the game's SpatialIndex with squared distances,
+and the idle towers are spread over TARGETING['stagger_ticks'] ticks so that
+hundreds of them never all search in the same frame.
+
+Factions: every object has a 'faction'. Neutral objects (trees, resources)
+are never auto-targeted; any other faction is hostile to towers of a
+different faction.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from Core.Game.spatial_index import SpatialIndex
+from config import TARGETING
+
+Visibility = Optional[Callable[[Dict[str, Any], Dict[str, Any]], bool]]
+
+FACTION_NEUTRAL = 0
+FACTION_PLAYER = 1
+
+
+def default_faction(obj_type: str, metadata: Optional[Dict[str, Any]]) -> int:
+    """Faction of an object the map does not assign one to."""
+    faction = (metadata or {}).get('properties', {}).get('faction')
+    if faction is not None:
+        return int(faction)
+    return FACTION_PLAYER if obj_type in ('building', 'unit') else FACTION_NEUTRAL
+
+
+def is_hostile(obj: Dict[str, Any], other: Dict[str, Any]) -> bool:
+    """Whether obj treats other as an enemy."""
+    faction = other.get('faction', FACTION_NEUTRAL)
+    return faction != FACTION_NEUTRAL and faction != obj.get('faction', FACTION_NEUTRAL)
+
+
+class TargetingSystem:
+    """Registry of auto-targeting objects and their staggered target searches."""
+
+    def __init__(self, spatial_index: SpatialIndex):
+        self.spatial_index = spatial_index
+        self.towers: List[Dict[str, Any]] = []
+        self.ranges: Dict[int, int] = {}  # id(tower) -> attack range in tiles
+        self.cursor = 0
+        self.searches = 0  # Searches run in the last update, for metrics
+
+    def register(self, obj: Dict[str, Any], metadata: Optional[Dict[str, Any]]) -> None:
+        """Start auto-targeting for an object if its metadata asks for it."""
+        properties = (metadata or {}).get('properties', {})
+        attack_range = properties.get('attack_range', 0)
+        if not properties.get('auto_target') or attack_range <= 0 or id(obj) in self.ranges:
+            return
+        self.towers.append(obj)
+        self.ranges[id(obj)] = attack_range
+
+    def unregister(self, obj: Dict[str, Any]) -> None:
+        if self.ranges.pop(id(obj), None) is None:
+            return
+        index = self.towers.index(obj)
+        self.towers.pop(index)
+        if index < self.cursor:
+            self.cursor -= 1
+
+    def clear(self) -> None:
+        self.towers = []
+        self.ranges = {}
+        self.cursor = 0
+
+    def priority(self, target: Dict[str, Any]) -> int:
+        """Rank of a target in TARGETING['priorities'] (lower engages first)."""
+        rules = TARGETING['priorities']
+        for rank, rule in enumerate(rules):
+            if rule == 'attacking' and (target.get('is_attacking') or target.get('pending_attack') is not None):
+                return rank
+            if rule == 'unit' and target.get('is_unit'):
+                return rank
+            if rule == 'building' and target.get('type') == 'building':
+                return rank
+        return len(rules)
+
+    def find_target(self, tower: Dict[str, Any], can_see: Visibility = None) -> Optional[Dict[str, Any]]:
+        """
+        Best hostile target in range of a tower.
+
+        Ranked by priority rule, then by squared distance, then by remaining health;
+        with can_see, the best one the tower has a line of sight to.
+        """
+        x, y = tower['x'], tower['y']
+
+        def can_engage(obj):
+            return obj is not tower and obj['health'] > 0 and is_hostile(tower, obj)
+
+        candidates = self.spatial_index.query_radius(x, y, self.ranges[id(tower)], can_engage)
+        if not candidates:
+            return None
+        candidates.sort(key=lambda obj: (self.priority(obj), (obj['x'] - x) ** 2 + (obj['y'] - y) ** 2, obj['health']))
+        if can_see is None:
+            return candidates[0]
+        for target in candidates:
+            if can_see(tower, target):
+                return target
+        return None
+
+    def update(self, is_idle: Callable[[Dict[str, Any]], bool],
+               can_see: Visibility = None) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Search for targets for this tick's share of the towers.
+
+        Args:
+            is_idle: Whether a tower is free to pick a target (not attacking, not halted)
+            can_see: Line of sight check between a tower and a target, if any
+
+        Returns:
+            List: (tower, target) pairs to engage
+        """
+        self.searches = 0
+        count = len(self.towers)
+        if not count:
+            return []
+        share = -(-count // max(1, TARGETING['stagger_ticks']))  # Ceiling division
+        engagements = []
+        for _ in range(min(share, count)):
+            if self.cursor >= len(self.towers):
+                self.cursor = 0
+            tower = self.towers[self.cursor]
+            self.cursor += 1
+            if tower['health'] <= 0 or not is_idle(tower):
+                continue
+            self.searches += 1
+            target = self.find_target(tower, can_see)
+            if target is not None:
+                engagements.append((tower, target))
+        return engagements
@@ -0,0 +1,139 @@
+"""
+Turret rotation for every object with "has_turret".
+
+Current and wanted turret angles of all turrets live in NumPy arrays and one
+step() per simulation tick turns all of them towards their aim at their
+angular speed ("turret_speed" in the object's properties, else
+TURRETS['angular_speed'] degrees per second), whether they are on screen or
+not. The sprite direction each turret shows (obj['turret_direction']) is the
+closest of its sprite directions to its current angle, and the angle itself is
+kept in obj['turret_angle'] for sprites rotated at runtime; the renderer only
+reads them.
+"""
+
+from typing import Any, Dict, List, Optional
+import numpy as np
+from Core.Utils.directions import EIGHT_DIRECTIONS, nearest_directions
+from config import TURRETS
+
+
+class TurretSystem:
+    """Dense arrays of turrets, turned together."""
+
+    def __init__(self, capacity: int = 32):
+        self.count = 0
+        self.entities: List[Dict[str, Any]] = []
+        self.slots: Dict[int, int] = {}  # id(entity) -> row in the arrays
+        self.directions: List[tuple] = []  # Sprite directions of each row
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """(Re)allocate the arrays, keeping the rows in use."""
+        count = self.count
+        arrays = {
+            'angle': np.zeros(capacity, dtype=np.float64),  # Degrees, same convention as Game.calculate_angle
+            'aim_angle': np.zeros(capacity, dtype=np.float64),  # Angle the turret turns towards
+            'speed': np.zeros(capacity, dtype=np.float64),  # Degrees per second
+        }
+        for name, array in arrays.items():
+            if count:
+                array[:count] = getattr(self, name)[:count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, entity: Dict[str, Any]) -> bool:
+        return id(entity) in self.slots
+
+    def register(self, entity: Dict[str, Any], metadata: Optional[Dict[str, Any]]) -> None:
+        """Start turning an object's turret if it has one, from its current turret direction."""
+        if not entity.get('has_turret') or id(entity) in self.slots:
+            return
+        metadata = metadata or {}
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        slot = self.count
+        self.count += 1
+        self.entities.append(entity)
+        self.slots[id(entity)] = slot
+        self.directions.append(tuple(metadata.get('visuals', {}).get('directions', EIGHT_DIRECTIONS)))
+        self.angle[slot] = self.aim_angle[slot] = entity.get('turret_direction', 0)
+        entity['turret_angle'] = float(self.angle[slot])
+        self.speed[slot] = metadata.get('properties', {}).get('turret_speed', TURRETS['angular_speed'])
+
+    def unregister(self, entity: Dict[str, Any]) -> None:
+        """Stop turning a turret; the last row is moved into its slot to keep the arrays dense."""
+        slot = self.slots.pop(id(entity), None)
+        if slot is None:
+            return
+        last = self.count - 1
+        if slot != last:
+            moved = self.entities[last]
+            self.entities[slot] = moved
+            self.directions[slot] = self.directions[last]
+            self.slots[id(moved)] = slot
+            for array in (self.angle, self.aim_angle, self.speed):
+                array[slot] = array[last]
+        self.entities.pop()
+        self.directions.pop()
+        self.count = last
+
+    def clear(self) -> None:
+        self.count = 0
+        self.entities = []
+        self.slots = {}
+        self.directions = []
+
+    def aim(self, entity: Dict[str, Any], angle: float) -> None:
+        """Turn an entity's turret towards an angle in degrees (ignored for objects without a turret)."""
+        slot = self.slots.get(id(entity))
+        if slot is not None:
+            self.aim_angle[slot] = angle % 360.0
+
+    def is_aimed(self, entity: Dict[str, Any]) -> bool:
+        """Whether the turret finished turning to its aim."""
+        slot = self.slots.get(id(entity))
+        return slot is None or self.angle[slot] == self.aim_angle[slot]
+
+    def step(self, dt: float) -> List[Dict[str, Any]]:
+        """
+        Turn every turret towards its aim.
+
+        Args:
+            dt: Time since the last step in seconds
+
+        Returns:
+            list: Entities whose turret_direction changed this step
+        """
+        count = self.count
+        if not count:
+            return []
+        angle = self.angle[:count]
+        aim = self.aim_angle[:count]
+        # Shortest signed turn in (-180, 180]
+        turn = (aim - angle + 180.0) % 360.0 - 180.0
+        turning = np.flatnonzero(turn != 0.0)
+        if not len(turning):
+            return []
+        reach = self.speed[turning] * dt
+        done = np.abs(turn[turning]) <= reach
+        angle[turning] = np.where(done, aim[turning], (angle[turning] + np.clip(turn[turning], -reach, reach)) % 360.0)
+
+        # Sprite direction of the new angles, one table lookup per distinct direction list
+        turning = turning.tolist()
+        groups: Dict[tuple, List[int]] = {}
+        for slot in turning:
+            groups.setdefault(self.directions[slot], []).append(slot)
+        changed = []
+        entities = self.entities
+        angles = angle.tolist()
+        for directions, slots in groups.items():
+            for slot, direction in zip(slots, nearest_directions(angle[slots], directions).tolist()):
+                entity = entities[slot]
+                entity['turret_angle'] = angles[slot]
+                if direction != entity['turret_direction']:
+                    entity['turret_direction'] = direction
+                    changed.append(entity)
+        return changed
@@ -2,9 +2,15 @@ import pygame
 import math
 from typing import Optional, Tuple, Dict, Any
 from Core.Game.animation_manager import AnimationManager
+from Core.Utils.directions import nearest_direction
 
 class Unit:
-    """A class representing a game unit with movement, combat, and building capabilities."""
+    """A class representing a game unit with movement, combat, and building capabilities.
+
+    The game does not instantiate this class: units are object dicts, and
+    pathfinding, group moves and movement live in Game.move_unit and the
+    batched MovementSystem.
+    """
     
     def __init__(self, x: int, y: int, faction: str, unit_type: str, unit_id: int, 
                  metadata: Dict[str, Any], animation_manager: AnimationManager):
@@ -186,8 +192,8 @@ class Unit:
         self.target_x = x
         self.target_y = y
         self.state = "moving"
-        # TODO: Calculate path to target using A* pathfinding
-        self.path = [(x, y)]  # Temporary direct path
+        # Straight line: paths for the game's units are planned in Game.move_unit
+        self.path = [(x, y)]
         self.current_waypoint = 0
         
     def set_attack_target(self, target: Dict[str, Any]) -> None:
@@ -223,9 +229,8 @@ class Unit:
         Returns:
             Nearest available direction in degrees
         """
-        # Find the closest direction by comparing the absolute difference
-        return min(self.available_directions,
-                  key=lambda x: min(abs(x - angle), 360 - abs(x - angle)))
+        # Precomputed per direction list, shared with Game and the movement system
+        return nearest_direction(angle, self.available_directions)
         
     def get_position(self) -> Tuple[int, int]:
         """Get the unit's current position.
@@ -4,6 +4,8 @@ import math
 import sys
 from Core.UI.button import Button
 from Core.UI.cursor_manager import CursorManager
+from Core.Utils import memory_report
+from Core.Utils.asset_cache import AssetCache
 from config import VERTICAL_PANEL, COLORS, FONT_SIZES
 from typing import List, Optional, Tuple, Dict, Any
 
@@ -56,12 +58,12 @@ class VerticalPanel:
         pygame.mixer.init()
 
         # Load and scale the background image
-        self.background_image = pygame.image.load(os.path.join('Images', 'game_menu_vertical.png'))
+        self.background_image = AssetCache().get_image(os.path.join('Images', 'game_menu_vertical.png'))
         self.background_image = pygame.transform.scale(self.background_image, (self.width, self.height))
 
         # Load handle images
-        self.handle_open = pygame.image.load(os.path.join('Images', 'game_menu_vertical_handle_open.png'))
-        self.handle_close = pygame.image.load(os.path.join('Images', 'game_menu_vertical_handle_close.png'))
+        self.handle_open = AssetCache().get_image(os.path.join('Images', 'game_menu_vertical_handle_open.png'))
+        self.handle_close = AssetCache().get_image(os.path.join('Images', 'game_menu_vertical_handle_close.png'))
         
         # Scale handle images to match height
         self.handle_open = pygame.transform.scale(self.handle_open, (self.handle_width, self.height))
@@ -83,6 +85,8 @@ class VerticalPanel:
 
         # Create cached surfaces
         self.create_cached_surfaces()
+        memory_report.register('VerticalPanel.base_surface', self, 'base_surface', 'ui')
+        memory_report.register('VerticalPanel.button_states', self, 'button_states', 'ui')
 
     def _create_buttons(self) -> None:
         """Create and initialize the panel buttons."""
@@ -1,10 +1,12 @@
 import pygame
 import sys
-from Core.Credits.credits import CreditsScreen
-from Core.Game.game import Game
 from Core.UI.base_screen import BaseScreen
+from Core.Utils.asset_cache import AssetCache
 from ..UI.button import Button
 
+# Transition asking for a match built from scratch
+NEW_GAME = 'new_game'
+
 
 # Define the main menu class
 class MainMenu(BaseScreen):
@@ -20,30 +22,28 @@ class MainMenu(BaseScreen):
 
         # Initialize the mixer for playing music and sound effects
         pygame.mixer.init()  # Initialize the pygame mixer
-        self.music_file = "Music/672781__bertsz__cyberpunk_dump.flac"  # Path to the background music file
-        if pygame.mixer.music.get_busy():
-            current_song = pygame.mixer.music.get_pos()
-            if current_song != self.music_file:
-                pygame.mixer.music.stop()
-                pygame.mixer.music.load(self.music_file)
-                pygame.mixer.music.play(-1, 6.0)
-        else:
-            pygame.mixer.music.load(self.music_file)
-            pygame.mixer.music.play(-1, 6.0)
+        self.asset_cache = AssetCache()
+        self.music_file = "Music/672781__bertsz__cyberpunk_dump.flac"  # Path to the background music file, started in resume()
 
         # Load background image based on screen width
         if self.screen_width <= 1024:
-            self.background = pygame.image.load("Images/background_mainmenu.jpg")
+            self.background = self.asset_cache.get_image("Images/background_mainmenu.jpg")
         else:
-            self.background = pygame.image.load("Images/background_mainmenu_x4.jpg")
+            self.background = self.asset_cache.get_image("Images/background_mainmenu_x4.jpg")
 
         # Load hover sound effect
-        self.hover_sound = pygame.mixer.Sound("Sounds/hover.wav")  # Replace with your hover sound file
+        self.hover_sound = self.asset_cache.get_sound("Sounds/hover.wav")  # Replace with your hover sound file
         self.hovered_button = None  # Initialize hovered_button to track mouse hover
 
     # endregion
 
     # region Methods
+    def resume(self):
+        super().resume()
+        self.hovered_button = None
+        # Keeps playing if the menu track is already on (e.g. coming back from the credits)
+        self.asset_cache.play_music(self.music_file, 6.0)
+
     def create_buttons(self):
         # Create buttons for the menu
         button_width = 200
@@ -91,7 +91,7 @@ class MainMenu(BaseScreen):
 
     def start_game(self):
         print("Starting Game...")
-        return Game(self.screen)  # Return the game screen to switch to it
+        return NEW_GAME  # Build a new game screen, even if a suspended match exists
 
     def options(self):
         print("Opening Options...")
@@ -100,7 +100,7 @@ class MainMenu(BaseScreen):
 
     def credits(self):
         print("Opening Credits...")
-        return CreditsScreen(self.screen)  # Return the credits screen to switch to it
+        return "credits"  # Return the credits screen name to switch to it
 
     def exit_game(self):
         print("Exiting Game...")
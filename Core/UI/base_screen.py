@@ -49,12 +49,26 @@ class BaseScreen:
                 if self.back_button.rect.collidepoint(event.pos):
                     self.set_cursor('hover')
     
+    def suspend(self) -> None:
+        """
+        Called by the screen manager when another screen becomes current.
+        The instance is kept alive with its assets so it can be resumed later.
+        """
+        pass
+
+    def resume(self) -> None:
+        """
+        Called by the screen manager when the screen becomes current,
+        including the first time it is shown.
+        """
+        self.set_cursor('normal')
+
     def update(self) -> Optional[Any]:
         """
         Update the screen state.
         
         Returns:
-            Optional[Any]: The next screen to switch to, or None if no change
+            Optional[Any]: The name of the next screen to switch to, or None if no change
         """
         if self.next_action:
             next_screen = self.next_action()
@@ -1,6 +1,7 @@
 import pygame
 import math
 from typing import Tuple
+from Core.Utils.asset_cache import AssetCache
 
 class Button:
     def __init__(self, x, y, number, spacing, width, height, text, action=None, image_path=None, glow_image_path=None, glow_behind=False):
@@ -17,17 +18,16 @@ class Button:
         self.is_hovered = False
         self.clicked_state = False
         
-        # Load the button image if provided
+        # Load the button image if provided (scaled copies are shared between buttons of the same size)
+        asset_cache = AssetCache()
         if self.image_path:
-            self.image = pygame.image.load(self.image_path)
-            self.image = pygame.transform.scale(self.image, (self.rect.width, self.rect.height))  # Scale image to button size
+            self.image = asset_cache.get_scaled_image(self.image_path, (self.rect.width, self.rect.height))
         else:
             self.image = None
 
         # Load the glow image if provided
         if self.glow_image_path:
-            self.glow_image = pygame.image.load(self.glow_image_path)
-            self.glow_image = pygame.transform.scale(self.glow_image, (self.rect.width, self.rect.height))  # Scale glow image to button size
+            self.glow_image = asset_cache.get_scaled_image(self.glow_image_path, (self.rect.width, self.rect.height))
         else:
             self.glow_image = None
 
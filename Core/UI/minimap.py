@@ -1,4 +1,5 @@
 import pygame
+from Core.Utils import memory_report
 
 class Minimap:
     def __init__(self, screen_width, screen_height):
@@ -13,6 +14,8 @@ class Minimap:
         self.map_surface = None  # Will store the scaled map surface
         self.is_dragging = False
         self.last_mouse_pos = None
+        memory_report.register('Minimap.surface', self, 'surface', 'minimap')
+        memory_report.register('Minimap.map_surface', self, 'map_surface', 'minimap')
 
     def set_map(self, map_surface, map_width, map_height):
         """Set the map surface and calculate the scale"""
@@ -63,8 +66,8 @@ class Minimap:
         
         return world_x, world_y
 
-    def render(self, screen, camera_x, camera_y, camera_width, camera_height):
-        """Render the minimap on the screen"""
+    def render(self, screen, camera_x, camera_y, camera_width, camera_height, fog=None):
+        """Render the minimap on the screen, darkened by the fog of war if given"""
         # Clear the minimap surface
         self.surface.fill((0, 0, 0))
         
@@ -75,6 +78,8 @@ class Minimap:
             
             # Draw the minimap
             self.surface.blit(self.map_surface, (minimap_x, minimap_y))
+            if fog is not None:
+                self.surface.blit(fog.get_minimap_overlay(self.map_surface.get_size()), (minimap_x, minimap_y))
             
             # Draw the viewport rectangle
             viewport_rect = pygame.Rect(
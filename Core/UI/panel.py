@@ -2,6 +2,9 @@ import pygame
 import os
 from Core.UI.button import Button
 from Core.UI.cursor_manager import CursorManager
+from Core.Utils import memory_report
+from Core.Utils.asset_cache import AssetCache
+from Core.Game.event_scheduler import get_charge
 from config import PANEL, COLORS, FONT_SIZES
 from typing import Optional
 
@@ -29,13 +32,13 @@ class Panel:
         self.cursor_manager = CursorManager()
 
         # Load life bar images
-        self.life_bar_left = pygame.image.load("Images/life_bar_left.png").convert_alpha()
-        self.life_bar_right = pygame.image.load("Images/life_bar_right.png").convert_alpha()
-        self.life_bar_energy_stretch = pygame.image.load("Images/life_bar_energy_stretch.png").convert_alpha()
-        self.life_bar_energy_tip = pygame.image.load("Images/life_bar_energy_tip.png").convert_alpha()
+        self.life_bar_left = AssetCache().get_image("Images/life_bar_left.png", alpha=True)
+        self.life_bar_right = AssetCache().get_image("Images/life_bar_right.png", alpha=True)
+        self.life_bar_energy_stretch = AssetCache().get_image("Images/life_bar_energy_stretch.png", alpha=True)
+        self.life_bar_energy_tip = AssetCache().get_image("Images/life_bar_energy_tip.png", alpha=True)
         # Load charge bar images
-        self.life_bar_charge_stretch = pygame.image.load("Images/life_bar_charge_stretch.png").convert_alpha()
-        self.life_bar_charge_tip = pygame.image.load("Images/life_bar_charge_tip.png").convert_alpha()
+        self.life_bar_charge_stretch = AssetCache().get_image("Images/life_bar_charge_stretch.png", alpha=True)
+        self.life_bar_charge_tip = AssetCache().get_image("Images/life_bar_charge_tip.png", alpha=True)
 
         # Create font for life bar percentage
         self.life_bar_font = pygame.font.Font(None, FONT_SIZES['small'])
@@ -69,15 +72,15 @@ class Panel:
         self.middle_area_width = self.width - (self.left_area_size + self.right_area_width + (self.margin * 4))
 
         # Create surfaces for each area
-        self.left_area = pygame.image.load(os.path.join('Images', 'game_menu_horizontal_left_area.png'))
+        self.left_area = AssetCache().get_image(os.path.join('Images', 'game_menu_horizontal_left_area.png'))
         self.left_area = pygame.transform.scale(self.left_area, (self.left_area_size, self.area_height))
         self.middle_area = pygame.Surface((self.middle_area_width, self.area_height), pygame.SRCALPHA)
         self.right_area = pygame.Surface((self.right_area_width, self.area_height))
         self.right_area.fill(COLORS['black'])
 
         # Load panel images for selected object display
-        self.horizontal_left_area = pygame.image.load("Images/game_menu_horizontal_left_area.png").convert_alpha()
-        self.default_selection = pygame.image.load("Images/default_selection.png").convert_alpha()
+        self.horizontal_left_area = AssetCache().get_image("Images/game_menu_horizontal_left_area.png", alpha=True)
+        self.default_selection = AssetCache().get_image("Images/default_selection.png", alpha=True)
         self.selected_object_image = None  # Will store the selected object's image
 
         # Calculate area positions
@@ -89,23 +92,23 @@ class Panel:
         self.create_middle_area_buttons()
 
         # Load cap and middle images for panel
-        self.left_cap = pygame.image.load(os.path.join('Images', 'left_horizontal_menu_cap.png'))
+        self.left_cap = AssetCache().get_image(os.path.join('Images', 'left_horizontal_menu_cap.png'))
         self.left_cap = pygame.transform.scale(self.left_cap, (self.cap_width, self.height))
-        self.right_cap = pygame.image.load(os.path.join('Images', 'right_horizontal_menu_cap.png'))
+        self.right_cap = AssetCache().get_image(os.path.join('Images', 'right_horizontal_menu_cap.png'))
         self.right_cap = pygame.transform.scale(self.right_cap, (self.cap_width, self.height))
-        self.middle = pygame.image.load(os.path.join('Images', 'middle_horizontal_menu.png'))
+        self.middle = AssetCache().get_image(os.path.join('Images', 'middle_horizontal_menu.png'))
         self.middle = pygame.transform.scale(self.middle, (1, self.height))
 
         # Load handle images
-        self.handle_left_cap = pygame.image.load(os.path.join('Images', 'left_horizontal_handle_cap.png'))
+        self.handle_left_cap = AssetCache().get_image(os.path.join('Images', 'left_horizontal_handle_cap.png'))
         self.handle_left_cap = pygame.transform.scale(self.handle_left_cap, (self.cap_width, self.handle_height))
-        self.handle_right_cap = pygame.image.load(os.path.join('Images', 'right_horizontal_handle_cap.png'))
+        self.handle_right_cap = AssetCache().get_image(os.path.join('Images', 'right_horizontal_handle_cap.png'))
         self.handle_right_cap = pygame.transform.scale(self.handle_right_cap, (self.cap_width, self.handle_height))
-        self.handle_middle = pygame.image.load(os.path.join('Images', 'middle_horizontal_handle.png'))
+        self.handle_middle = AssetCache().get_image(os.path.join('Images', 'middle_horizontal_handle.png'))
         self.handle_middle = pygame.transform.scale(self.handle_middle, (1, self.handle_height))
-        self.handle_arrow_open = pygame.image.load(os.path.join('Images', 'middle_horizontal_handle_open.png'))
+        self.handle_arrow_open = AssetCache().get_image(os.path.join('Images', 'middle_horizontal_handle_open.png'))
         self.handle_arrow_open = pygame.transform.scale(self.handle_arrow_open, (self.arrow_width, self.handle_height))
-        self.handle_arrow_close = pygame.image.load(os.path.join('Images', 'middle_horizontal_handle_close.png'))
+        self.handle_arrow_close = AssetCache().get_image(os.path.join('Images', 'middle_horizontal_handle_close.png'))
         self.handle_arrow_close = pygame.transform.scale(self.handle_arrow_close, (self.arrow_width, self.handle_height))
 
         # Tooltip properties
@@ -120,6 +123,9 @@ class Panel:
 
         # Create cached surfaces
         self.create_cached_surfaces()
+        for attribute in ['base_surface', 'handle_open_surface', 'handle_close_surface',
+                          'left_area', 'middle_area', 'right_area', 'selected_object_image']:
+            memory_report.register(f"Panel.{attribute}", self, attribute, 'ui')
 
     def create_middle_area_buttons(self):
         """Create buttons for the middle area of the panel"""
@@ -484,8 +490,9 @@ class Panel:
             if not self.selected_object:
                 return
                 
-            # Set health to 0 to trigger destruction
+            # Set health to 0 and queue the object for removal at the next lifecycle batch
             self.selected_object['health'] = 0
+            self.game.queue_despawn(self.selected_object)
             # Clear selection since object will be destroyed
             self.selected_object = None
             self.selected_object_image = None
@@ -495,6 +502,8 @@ class Panel:
                 return
             # Ensure the 'is_attacking' flag is set to False on the selected object.
             self.selected_object['is_attacking'] = False
+            # Towers stay halted instead of picking a new target on their own
+            self.selected_object['hold_fire'] = True
 
     def cancel_targeting(self):
         """Cancel targeting mode"""
@@ -519,8 +528,8 @@ class Panel:
             properties = metadata.get('properties', {}) if metadata else {}
             attack_range = properties.get('attack_range', 0)
             
-            if distance <= attack_range:
-                # Target is in range, start attack
+            if distance <= attack_range and self.game.has_line_of_sight(self.attacker, target_object):
+                # Target is in range and in sight, start attack
                 result = {
                     'action': 'attack',
                     'attacker': self.attacker,
@@ -531,9 +540,10 @@ class Panel:
                 self.cancel_targeting()
                 return result
             else:
-                # Target is out of range
+                # Target is out of range or out of sight
                 if metadata and metadata.get('is_unit', False):
-                    # TODO: Handle unit movement towards target
+                    # Game walks the unit towards the target and attacks once in range
+                    # (pending_attack, see Game.start_pending_attack)
                     return {
                         'action': 'attack',
                         'attacker': self.attacker,
@@ -573,7 +583,7 @@ class Panel:
             try:
                 image_path = os.path.join("Images", f"{obj['type']}{obj['id']:05d}.png")
                 if os.path.exists(image_path):
-                    self.selected_object_image = pygame.image.load(image_path).convert_alpha()
+                    self.selected_object_image = AssetCache().get_image(image_path, alpha=True)
                 else:
                     self.selected_object_image = self.default_selection
             except:
@@ -608,8 +618,8 @@ class Panel:
         current_health = obj['health']  # Current health value
         max_health = obj['max_health']  # Maximum health value
         
-        # Get charge value (default to 0 if not present)
-        charge_percent = obj.get('charge_percent', 0)
+        # Get charge value, computed from the object's cooldown start and duration
+        charge_percent = get_charge(obj, pygame.time.get_ticks())
         
         # Check if object has infinite health
         if max_health == -1:  # -1 represents infinite health
@@ -0,0 +1,96 @@
+import time
+import pygame
+from typing import Optional
+from Core.Utils.frame_profiler import FrameProfiler
+from config import PROFILER, FONT_SIZES
+
+
+class ProfilerOverlay:
+    """
+    Toggleable HUD that shows rolling per-stage frame timings and object counts.
+    The overlay drives FrameProfiler: recording only happens while it is visible.
+    """
+
+    def __init__(self):
+        self.profiler = FrameProfiler()
+        self.visible = False
+        self.font = pygame.font.Font(None, FONT_SIZES['medium'])
+        self.line_height = self.font.get_linesize()
+        self.toggle_key = pygame.key.key_code(PROFILER['toggle_key'])
+        self.dump_key = pygame.key.key_code(PROFILER['dump_key'])
+
+        # The text is re-rendered a few times per second, not every frame
+        self.refresh_interval = 250  # milliseconds
+        self.last_refresh = 0
+        self.cached_surface: Optional[pygame.Surface] = None
+
+    def toggle(self) -> None:
+        """Show or hide the overlay (and start or stop recording)."""
+        self.visible = not self.visible
+        self.profiler.set_enabled(self.visible)
+        self.cached_surface = None
+
+    def handle_events(self, event: pygame.event.Event) -> bool:
+        """
+        Handle the profiler hotkeys.
+
+        Args:
+            event: The pygame event to handle
+
+        Returns:
+            bool: True if the event was consumed by the overlay
+        """
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == self.toggle_key:
+            self.toggle()
+            return True
+        if event.key == self.dump_key and self.profiler.get_recorded_frames():
+            self.dump_csv()
+            return True
+        return False
+
+    def dump_csv(self) -> str:
+        """Dump the ring buffers to a timestamped CSV file in the working directory."""
+        file_path = f"{PROFILER['csv_prefix']}_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+        frames = self.profiler.dump_csv(file_path)
+        print(f"Frame profile saved to {file_path} ({frames} frames)")
+        return file_path
+
+    def build_surface(self) -> pygame.Surface:
+        """Render the statistics table into a translucent surface."""
+        profiler = self.profiler
+        avg_frame, max_frame = profiler.get_frame_stats()
+        fps = 1000.0 / avg_frame if avg_frame > 0 else 0.0
+
+        lines = [(f"Frame {avg_frame:6.2f} ms  max {max_frame:6.2f}  ({fps:5.1f} FPS)", PROFILER['header_color'])]
+        lines.append((f"{'stage':<24}{'avg':>8}{'max':>8}", PROFILER['header_color']))
+        for stage in profiler.STAGES:
+            avg_ms, max_ms = profiler.get_stage_stats(stage)
+            lines.append((f"{stage:<24}{avg_ms:8.2f}{max_ms:8.2f}", PROFILER['text_color']))
+        counts = "  ".join(f"{name} {profiler.get_latest_count(name)}" for name in profiler.COUNTERS)
+        lines.append((counts, PROFILER['header_color']))
+        lines.append((f"{PROFILER['dump_key'].upper()}: dump CSV", PROFILER['text_color']))
+
+        rendered = [self.font.render(text, True, color) for text, color in lines]
+        padding = PROFILER['padding']
+        width = max(surface.get_width() for surface in rendered) + padding * 2
+        height = self.line_height * len(rendered) + padding * 2
+
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill(PROFILER['bg_color'])
+        for i, text_surface in enumerate(rendered):
+            surface.blit(text_surface, (padding, padding + i * self.line_height))
+        return surface
+
+    def render(self, screen: pygame.Surface) -> None:
+        """Draw the overlay on the top-left corner of the screen."""
+        if not self.visible:
+            return
+        current_time = pygame.time.get_ticks()
+        if self.cached_surface is None or current_time - self.last_refresh >= self.refresh_interval:
+            self.cached_surface = self.build_surface()
+            self.last_refresh = current_time
+        margin = PROFILER['margin']
+        # Keep clear of the credit counter drawn at the top-left of the game screen
+        screen.blit(self.cached_surface, (margin, margin + 40))
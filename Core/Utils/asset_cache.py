@@ -0,0 +1,98 @@
+import pygame
+from typing import Dict, Optional, Tuple
+from Core.Utils import memory_report
+
+
+class AssetCache:
+    """
+    Process-wide cache for images, sounds and the current music track.
+
+    Screens that are rebuilt (or several screens sharing the same button art and
+    hover sound) get the already loaded surfaces instead of reading the files again.
+    Every actual read from disk is counted in disk_loads.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AssetCache, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.images: Dict[Tuple[str, bool], pygame.Surface] = {}
+        self.scaled_images: Dict[Tuple[str, int, int], pygame.Surface] = {}
+        self.sounds: Dict[str, pygame.mixer.Sound] = {}
+        self.music_file: Optional[str] = None
+        self.disk_loads = 0
+
+        memory_report.register('AssetCache.images', self, 'images', 'ui', shared=True)
+        memory_report.register('AssetCache.scaled_images', self, 'scaled_images', 'ui', shared=True)
+
+        self._initialized = True
+
+    def get_image(self, path: str, alpha: bool = False) -> pygame.Surface:
+        """
+        Get an image, loading it on first use.
+
+        Args:
+            path: Image file path
+            alpha: Convert with convert_alpha() (requires a display mode)
+
+        Returns:
+            pygame.Surface: The shared surface (callers must not draw on it)
+        """
+        key = (path, alpha)
+        image = self.images.get(key)
+        if image is None:
+            image = pygame.image.load(path)
+            self.disk_loads += 1
+            if alpha:
+                image = image.convert_alpha()
+            self.images[key] = image
+        return image
+
+    def get_scaled_image(self, path: str, size: Tuple[int, int]) -> pygame.Surface:
+        """Get an image scaled to size; the scaled copy is cached as well."""
+        key = (path, size[0], size[1])
+        image = self.scaled_images.get(key)
+        if image is None:
+            image = pygame.transform.scale(self.get_image(path), size)
+            self.scaled_images[key] = image
+        return image
+
+    def get_sound(self, path: str) -> pygame.mixer.Sound:
+        """Get a sound effect, loading it on first use."""
+        sound = self.sounds.get(path)
+        if sound is None:
+            sound = pygame.mixer.Sound(path)
+            self.disk_loads += 1
+            self.sounds[path] = sound
+        return sound
+
+    def play_music(self, path: str, start: float = 0.0) -> None:
+        """
+        Loop a music track. Nothing happens if the track is already playing.
+
+        Args:
+            path: Music file path
+            start: Position in seconds to start from
+        """
+        if self.music_file == path and pygame.mixer.music.get_busy():
+            return
+        if pygame.mixer.music.get_busy():
+            pygame.mixer.music.stop()
+        # Music is streamed by the mixer, so switching tracks always reopens the file
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.play(-1, start)
+        except pygame.error as e:
+            # Missing or unplayable track: carry on without music
+            print(f"Error playing music {path}: {e}")
+            return
+        self.disk_loads += 1
+        self.music_file = path
@@ -0,0 +1,66 @@
+"""
+Angle to sprite direction lookup tables.
+
+Sprites exist for a handful of directions (e.g. [0, 45, ..., 315]). Picking
+the closest one used to be a min() over a lambda for every call; instead every
+direction list gets a table, built once, with the closest direction for each
+tenth of a degree. The same tables serve Game.get_nearest_direction, unit
+facing, turrets and the vectorized movement system.
+"""
+
+from typing import Dict, Sequence, Tuple
+import numpy as np
+
+STEPS_PER_DEGREE = 10
+TABLE_SIZE = 360 * STEPS_PER_DEGREE
+
+EIGHT_DIRECTIONS = (0, 45, 90, 135, 180, 225, 270, 315)
+
+_tables: Dict[Tuple[int, ...], np.ndarray] = {}
+_lists: Dict[Tuple[int, ...], list] = {}
+
+
+def direction_table(directions: Sequence[int]) -> np.ndarray:
+    """
+    Closest direction for every tenth of a degree, as an int16 array of TABLE_SIZE entries.
+
+    Ties go to the direction listed first, like the min() this replaces.
+    """
+    key = tuple(directions)
+    table = _tables.get(key)
+    if table is None:
+        angles = np.arange(TABLE_SIZE, dtype=np.float64) / STEPS_PER_DEGREE
+        options = np.array(key, dtype=np.float64)
+        difference = np.abs(options[:, None] - angles[None, :])
+        difference = np.minimum(difference, 360.0 - difference)
+        table = options[np.argmin(difference, axis=0)].astype(np.int16)
+        _tables[key] = table
+        _lists[key] = table.tolist()
+    return table
+
+
+def nearest_direction(angle: float, directions: Sequence[int]) -> int:
+    """Closest available direction for an angle in degrees."""
+    key = tuple(directions)
+    table = _lists.get(key)
+    if table is None:
+        direction_table(key)
+        table = _lists[key]
+    return table[int(round(angle * STEPS_PER_DEGREE)) % TABLE_SIZE]
+
+
+def screen_angles(dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Game.calculate_angle: degrees in [0, 360) with 0 pointing down the screen.
+
+    Args:
+        dx: Target x minus start x
+        dy: Target y minus start y
+    """
+    return (np.degrees(np.arctan2(-dy, dx)) + 450.0) % 360.0
+
+
+def nearest_directions(angles: np.ndarray, directions: Sequence[int]) -> np.ndarray:
+    """Vectorized nearest_direction for an array of angles in degrees."""
+    index = np.rint(angles * STEPS_PER_DEGREE).astype(np.int64) % TABLE_SIZE
+    return direction_table(directions)[index]
@@ -0,0 +1,194 @@
+import csv
+import time
+from array import array
+from typing import Dict, List, Optional
+from config import PROFILER
+
+
+class FrameProfiler:
+    """
+    Collects per-frame stage timings and object counts in fixed-size ring buffers.
+
+    The profiler is a singleton so the main loop, the game screen and the UI can all
+    report into the same buffers. While disabled, start() returns 0 and stop() returns
+    immediately, so the instrumentation left in the frame costs a couple of calls.
+    """
+
+    _instance = None
+
+    # Stages in the order they happen inside a frame (also the HUD/CSV column order)
+    STAGES = [
+        'events',
+        'update.scheduled',
+        'update.turrets',
+        'update.attacks',
+        'update.targeting',
+        'update.pathing',
+        'update.movement',
+        'update.missiles',
+        'update.damage',
+        'update.explosions',
+        'update.lifecycle',
+        'update_visible_objects',
+        'render.terrain',
+        'render.objects',
+        'render.rings',
+        'render.projectiles',
+        'render.fog',
+        'render.upscale',
+        'render.minimap',
+        'render.panels',
+        'render.cursor',
+        'display.update',
+    ]
+
+    COUNTERS = ['visible', 'missiles', 'particles', 'explosions', 'path_queue', 'path_wait_ms']
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(FrameProfiler, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.enabled = False
+        self.size = PROFILER['buffer_frames']
+        self.frame_index = 0  # Total number of frames recorded
+        self.position = 0  # Next slot to write in the ring buffers
+
+        # Ring buffers: one slot per frame, milliseconds for stages and raw values for counters
+        self.stage_buffers: Dict[str, array] = {stage: array('d', [0.0] * self.size) for stage in self.STAGES}
+        self.counter_buffers: Dict[str, array] = {name: array('l', [0] * self.size) for name in self.COUNTERS}
+        self.frame_buffer = array('d', [0.0] * self.size)
+
+        # Accumulators for the frame in progress (a stage can run several times per frame)
+        self.current_stages: Dict[str, float] = dict.fromkeys(self.STAGES, 0.0)
+        self.current_counters: Dict[str, int] = dict.fromkeys(self.COUNTERS, 0)
+        self.frame_start = time.perf_counter()
+
+        self._initialized = True
+
+    def set_enabled(self, enabled: bool) -> None:
+        """Start or stop recording. Buffers are kept so they can still be dumped."""
+        self.enabled = enabled
+        self.frame_start = time.perf_counter()
+        for stage in self.STAGES:
+            self.current_stages[stage] = 0.0
+
+    def start(self) -> float:
+        """
+        Return a start timestamp for a stage, or 0 when profiling is disabled.
+
+        Returns:
+            float: The value to pass back to stop()
+        """
+        if not self.enabled:
+            return 0.0
+        return time.perf_counter()
+
+    def stop(self, stage: str, start_time: float) -> None:
+        """
+        Add the time elapsed since start_time to the given stage of the current frame.
+
+        Args:
+            stage: One of STAGES
+            start_time: Value returned by start()
+        """
+        if not self.enabled or not start_time:
+            return
+        self.current_stages[stage] += (time.perf_counter() - start_time) * 1000.0
+
+    def set_count(self, name: str, value: int) -> None:
+        """Record an object count for the current frame."""
+        if self.enabled:
+            self.current_counters[name] = value
+
+    def end_frame(self) -> None:
+        """Commit the current frame into the ring buffers and start a new one."""
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        position = self.position
+        self.frame_buffer[position] = (now - self.frame_start) * 1000.0
+        self.frame_start = now
+
+        for stage, value in self.current_stages.items():
+            self.stage_buffers[stage][position] = value
+            self.current_stages[stage] = 0.0
+        for name, value in self.current_counters.items():
+            self.counter_buffers[name][position] = value
+
+        self.position = (position + 1) % self.size
+        self.frame_index += 1
+
+    def get_recorded_frames(self) -> int:
+        """Number of valid slots in the ring buffers."""
+        return min(self.frame_index, self.size)
+
+    def _ordered_slots(self) -> List[int]:
+        """Ring buffer slots from oldest to newest."""
+        count = self.get_recorded_frames()
+        start = (self.position - count) % self.size
+        return [(start + i) % self.size for i in range(count)]
+
+    def get_stage_stats(self, stage: str, window: Optional[int] = None) -> tuple:
+        """
+        Get rolling statistics for a stage.
+
+        Args:
+            stage: Stage name
+            window: Number of most recent frames to include (defaults to the HUD window)
+
+        Returns:
+            tuple: (average_ms, max_ms) over the window
+        """
+        return self._stats(self.stage_buffers[stage], window)
+
+    def get_frame_stats(self, window: Optional[int] = None) -> tuple:
+        """Rolling (average_ms, max_ms) of whole frames."""
+        return self._stats(self.frame_buffer, window)
+
+    def get_latest_count(self, name: str) -> int:
+        """Most recently recorded value of a counter."""
+        if not self.frame_index:
+            return 0
+        return self.counter_buffers[name][(self.position - 1) % self.size]
+
+    def _stats(self, buffer: array, window: Optional[int]) -> tuple:
+        count = min(window or PROFILER['hud_window'], self.get_recorded_frames())
+        if count == 0:
+            return 0.0, 0.0
+        total = 0.0
+        peak = 0.0
+        for i in range(1, count + 1):
+            value = buffer[(self.position - i) % self.size]
+            total += value
+            if value > peak:
+                peak = value
+        return total / count, peak
+
+    def dump_csv(self, file_path: str) -> int:
+        """
+        Write every recorded frame to a CSV file, oldest first.
+
+        Args:
+            file_path: Destination path
+
+        Returns:
+            int: Number of frames written
+        """
+        slots = self._ordered_slots()
+        first_frame = self.frame_index - len(slots)
+        with open(file_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'frame_ms'] + [f"{stage}_ms" for stage in self.STAGES] + self.COUNTERS)
+            for i, slot in enumerate(slots):
+                row = [first_frame + i, f"{self.frame_buffer[slot]:.4f}"]
+                row.extend(f"{self.stage_buffers[stage][slot]:.4f}" for stage in self.STAGES)
+                row.extend(self.counter_buffers[name][slot] for name in self.COUNTERS)
+                writer.writerow(row)
+        return len(slots)
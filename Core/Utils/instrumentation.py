@@ -0,0 +1,246 @@
+"""
+Lightweight instrumentation: named spans, counters and Chrome trace export.
+
+Spans and counters are no-ops until a recording is started. When
+INSTRUMENTATION['available'] is False in config.py the decorators return the
+original function untouched, so instrumented code runs with zero overhead.
+
+Usage:
+    from Core.Utils import instrumentation
+
+    @instrumentation.traced("Game.load_map")
+    def load_map(self, file_path): ...
+
+    with instrumentation.span("Game.remove_destroyed"):
+        ...
+
+    instrumentation.counter("missiles", len(self.missiles))
+
+Recordings are saved in the Chrome trace_event format and can be opened in
+chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from config import INSTRUMENTATION
+
+_available = INSTRUMENTATION['available']
+_enabled = False
+_events: List[Dict[str, Any]] = []
+_frames_left = 0
+_frame_number = 0
+_output_path: Optional[str] = None
+_origin = time.perf_counter()
+_pid = os.getpid()
+
+
+def _now_us() -> float:
+    """Microseconds since the module was imported (trace timestamps)."""
+    return (time.perf_counter() - _origin) * 1_000_000.0
+
+
+class _NullSpan:
+    """Shared context manager used while recording is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Context manager that records a complete ('X') trace event."""
+
+    __slots__ = ('name', 'category', 'args', 'start')
+
+    def __init__(self, name: str, category: str, args: Optional[Dict[str, Any]]):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if _enabled:
+            event = {
+                'name': self.name,
+                'cat': self.category,
+                'ph': 'X',
+                'ts': self.start,
+                'dur': _now_us() - self.start,
+                'pid': _pid,
+                'tid': threading.get_ident()
+            }
+            if self.args:
+                event['args'] = self.args
+            _events.append(event)
+        return False
+
+
+def is_recording() -> bool:
+    """Check whether a trace is currently being recorded."""
+    return _enabled
+
+
+def span(name: str, category: str = 'game', args: Optional[Dict[str, Any]] = None):
+    """
+    Create a scoped timer for a with-block.
+
+    Args:
+        name: Span name shown in the trace viewer
+        category: Trace category used for filtering
+        args: Optional values attached to the event
+
+    Returns:
+        A context manager (a shared no-op one when not recording)
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, category, args)
+
+
+def traced(name: str, category: str = 'game') -> Callable:
+    """
+    Decorator that wraps every call of a function in a span.
+
+    Args:
+        name: Span name shown in the trace viewer
+        category: Trace category used for filtering
+    """
+    def decorator(func: Callable) -> Callable:
+        if not _available:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name, category, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def counter(name: str, value: float, category: str = 'game') -> None:
+    """
+    Record the value of a counter (drawn as a graph in the trace viewer).
+
+    Args:
+        name: Counter name
+        value: Current value
+        category: Trace category used for filtering
+    """
+    if not _enabled:
+        return
+    _events.append({
+        'name': name,
+        'cat': category,
+        'ph': 'C',
+        'ts': _now_us(),
+        'pid': _pid,
+        'args': {name: value}
+    })
+
+
+def instant(name: str, category: str = 'game') -> None:
+    """Record a zero-length marker (e.g. a building being destroyed)."""
+    if not _enabled:
+        return
+    _events.append({
+        'name': name,
+        'cat': category,
+        'ph': 'i',
+        's': 'p',
+        'ts': _now_us(),
+        'pid': _pid,
+        'tid': threading.get_ident()
+    })
+
+
+def start_recording(frames: Optional[int] = None, output_path: Optional[str] = None) -> bool:
+    """
+    Start recording spans and counters for a number of frames.
+
+    Args:
+        frames: Number of frames to record (defaults to INSTRUMENTATION['trace_frames'])
+        output_path: Destination JSON file (defaults to a timestamped file)
+
+    Returns:
+        bool: True if recording started, False if instrumentation is compiled out
+              or a recording is already running
+    """
+    global _enabled, _frames_left, _frame_number, _output_path
+    if not _available or _enabled:
+        return False
+
+    _events.clear()
+    _frames_left = frames or INSTRUMENTATION['trace_frames']
+    _frame_number = 0
+    _output_path = output_path or f"{INSTRUMENTATION['trace_prefix']}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    _enabled = True
+    print(f"Recording trace for {_frames_left} frames...")
+    return True
+
+
+def end_frame() -> None:
+    """Mark the end of a frame; saves the trace once the requested frames are recorded."""
+    global _frames_left, _frame_number
+    if not _enabled:
+        return
+
+    _events.append({
+        'name': 'frame',
+        'cat': 'frame',
+        'ph': 'i',
+        's': 'g',
+        'ts': _now_us(),
+        'pid': _pid,
+        'tid': threading.get_ident(),
+        'args': {'frame': _frame_number}
+    })
+    _frame_number += 1
+    _frames_left -= 1
+    if _frames_left <= 0:
+        stop_recording()
+
+
+def stop_recording() -> Optional[str]:
+    """
+    Stop the current recording and write it to disk.
+
+    Returns:
+        Optional[str]: Path of the saved trace, or None if nothing was recording
+    """
+    global _enabled
+    if not _enabled:
+        return None
+    _enabled = False
+
+    trace = {
+        'traceEvents': list(_events),
+        'displayTimeUnit': 'ms',
+        'otherData': {'frames': _frame_number}
+    }
+    try:
+        with open(_output_path, 'w') as f:
+            json.dump(trace, f)
+        print(f"Trace saved to {_output_path} ({len(_events)} events, {_frame_number} frames)")
+    except OSError as e:
+        print(f"Error saving trace: {e}")
+        return None
+    finally:
+        _events.clear()
+    return _output_path
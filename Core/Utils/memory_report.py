@@ -0,0 +1,165 @@
+"""
+Memory accounting for pixel surfaces and asset caches.
+
+Subsystems register the attributes that hold their surfaces; the report walks
+every registered attribute (dicts, lists, tuples and nested object entries),
+sums the pixel memory of each surface and groups the result per cache, per
+asset type and per object type. Owners are held through weak references, so
+registering a cache never keeps a screen or collection alive.
+
+Surfaces reachable from several caches (e.g. a tile both in the tile cache and
+in the tile list) are only counted once, by the first cache that reaches them.
+Shared caches (the process-wide AssetCache) are walked after all others, so an
+image they hand out is counted under the cache that uses it, with its asset and
+object type, and only images nothing else holds are left to them.
+Subsurfaces share their parent's pixels and are counted as zero bytes.
+"""
+
+import weakref
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+import pygame
+from config import MEMORY_REPORT
+
+_registry: List[Dict[str, Any]] = []
+
+
+def register(cache_name: str, owner: Any, attribute: str, asset_type: str,
+             type_of: Optional[Callable[[Any], str]] = None, shared: bool = False) -> None:
+    """
+    Register an attribute holding surfaces so it shows up in the report.
+
+    Args:
+        cache_name: Name shown in the report (e.g. 'Game.map_surface')
+        owner: Object holding the attribute
+        attribute: Attribute name on the owner
+        asset_type: Group used for the per-asset-type totals and budgets
+        type_of: Optional function mapping a top-level dict key to an object type
+        shared: The attribute hands its surfaces out to other caches (walked last)
+    """
+    _registry.append({
+        'name': cache_name,
+        'owner': weakref.ref(owner),
+        'attribute': attribute,
+        'asset_type': asset_type,
+        'type_of': type_of,
+        'shared': shared
+    })
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """Pixel memory owned by a surface (0 for subsurfaces)."""
+    if surface.get_parent() is not None:
+        return 0
+    return surface.get_pitch() * surface.get_height()
+
+
+def _walk(value: Any, object_type: str, seen: set, totals: Dict[str, List[int]]) -> None:
+    """Accumulate [bytes, surface_count] per object type for everything reachable from value."""
+    if isinstance(value, pygame.Surface):
+        if id(value) in seen:
+            return
+        seen.add(id(value))
+        entry = totals[object_type]
+        entry[0] += surface_bytes(value)
+        entry[1] += 1
+    elif isinstance(value, dict):
+        for item in value.values():
+            _walk(item, object_type, seen, totals)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            _walk(item, object_type, seen, totals)
+
+
+def animation_object_type(cache_key: str) -> str:
+    """Object type of an AnimationManager cache key ('building3_<uid>_fire_90' -> 'building')."""
+    return cache_key.split('_')[0].rstrip('0123456789') or '-'
+
+
+def collect() -> Dict[str, Any]:
+    """
+    Walk all live registrations.
+
+    Returns:
+        dict: {'caches': [...], 'asset_types': {...}, 'object_types': {...}, 'total': bytes}
+    """
+    seen = set()
+    caches = []
+    asset_types = defaultdict(lambda: [0, 0])
+    object_types = defaultdict(lambda: [0, 0])
+
+    # Drop registrations whose owner has been garbage collected
+    _registry[:] = [entry for entry in _registry if entry['owner']() is not None]
+
+    # Stable sort: owner caches in registration order, then the shared ones
+    for entry in sorted(_registry, key=lambda entry: entry['shared']):
+        owner = entry['owner']()
+        value = getattr(owner, entry['attribute'], None)
+        totals = defaultdict(lambda: [0, 0])
+
+        if entry['type_of'] and isinstance(value, dict):
+            for key, item in value.items():
+                _walk(item, entry['type_of'](key), seen, totals)
+        else:
+            _walk(value, '-', seen, totals)
+
+        cache_bytes = sum(t[0] for t in totals.values())
+        cache_count = sum(t[1] for t in totals.values())
+        caches.append({
+            'name': entry['name'],
+            'asset_type': entry['asset_type'],
+            'bytes': cache_bytes,
+            'surfaces': cache_count
+        })
+        asset_types[entry['asset_type']][0] += cache_bytes
+        asset_types[entry['asset_type']][1] += cache_count
+        for object_type, (type_bytes, type_count) in totals.items():
+            if object_type != '-':
+                object_types[object_type][0] += type_bytes
+                object_types[object_type][1] += type_count
+
+    return {
+        'caches': caches,
+        'asset_types': dict(asset_types),
+        'object_types': dict(object_types),
+        'total': sum(cache['bytes'] for cache in caches)
+    }
+
+
+def _mb(value: int) -> str:
+    return f"{value / (1024 * 1024):9.2f} MB"
+
+
+def format_report(report: Optional[Dict[str, Any]] = None) -> str:
+    """Build a printable report, flagging asset types over their configured budget."""
+    report = report or collect()
+    budgets = MEMORY_REPORT['budgets_mb']
+    lines = ["=== Surface memory report ==="]
+
+    lines.append(f"{'cache':<36}{'type':<12}{'surfaces':>9}{'size':>13}")
+    for cache in sorted(report['caches'], key=lambda c: c['bytes'], reverse=True):
+        lines.append(f"{cache['name']:<36}{cache['asset_type']:<12}{cache['surfaces']:>9}{_mb(cache['bytes']):>13}")
+
+    lines.append("")
+    lines.append(f"{'asset type':<48}{'surfaces':>9}{'size':>13}  budget")
+    for asset_type, (type_bytes, count) in sorted(report['asset_types'].items(), key=lambda t: t[1][0], reverse=True):
+        budget = budgets.get(asset_type)
+        status = ""
+        if budget is not None:
+            status = f"{budget:6.1f} MB" + ("  OVER BUDGET" if type_bytes > budget * 1024 * 1024 else "")
+        lines.append(f"{asset_type:<48}{count:>9}{_mb(type_bytes):>13}  {status}")
+
+    if report['object_types']:
+        lines.append("")
+        lines.append(f"{'object type':<48}{'surfaces':>9}{'size':>13}")
+        for object_type, (type_bytes, count) in sorted(report['object_types'].items(), key=lambda t: t[1][0], reverse=True):
+            lines.append(f"{object_type:<48}{count:>9}{_mb(type_bytes):>13}")
+
+    lines.append("")
+    lines.append(f"{'total':<57}{_mb(report['total']):>13}")
+    return "\n".join(lines)
+
+
+def print_report() -> None:
+    """Print the current report to the console."""
+    print(format_report())
@@ -0,0 +1,95 @@
+import pygame
+from collections import OrderedDict
+from typing import Any, Hashable, Tuple
+from Core.Utils import memory_report
+from config import ROTATION_CACHE
+
+
+class RotationCache:
+    """
+    Process-wide store of rotated sprite variants.
+
+    Instead of exporting and loading one image per direction, a sprite facing
+    direction 0 (down the screen) is rotated with pygame.transform.rotozoom into
+    N evenly spaced directions (16, 32, 64...), each variant built the first
+    time it is drawn or up front with prebuild(). Variants are kept in LRU order
+    and the least recently used ones are dropped once they take more than
+    ROTATION_CACHE['budget_mb'].
+
+    Angles use the sprite convention of Game.calculate_angle (0 points down,
+    90 right), which is pygame's counter-clockwise rotation of the 0 sprite.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(RotationCache, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.frames: 'OrderedDict[Tuple[Any, int, int], pygame.Surface]' = OrderedDict()
+        self.bytes = 0  # Pixel memory of the variants held
+        self.budget = int(ROTATION_CACHE['budget_mb'] * 1024 * 1024)
+        self.builds = 0  # Variants rotated so far
+        self.evictions = 0
+
+        memory_report.register('RotationCache.frames', self, 'frames', 'rotations')
+
+        self._initialized = True
+
+    @staticmethod
+    def step_of(angle: float, steps: int) -> int:
+        """Index of the variant closest to an angle, out of steps evenly spaced directions."""
+        return int(round(angle * steps / 360.0)) % steps
+
+    def get(self, key: Hashable, source: pygame.Surface, angle: float, steps: int) -> pygame.Surface:
+        """
+        Get the variant of a sprite closest to an angle.
+
+        Args:
+            key: Identifies the source sprite (same key, same image)
+            source: The sprite facing direction 0
+            angle: Wanted facing in degrees
+            steps: Number of directions the variants are spaced at
+
+        Returns:
+            pygame.Surface: The shared variant (callers must not draw on it)
+        """
+        step = self.step_of(angle, steps)
+        if step == 0:
+            return source
+        cache_key = (key, steps, step)
+        frame = self.frames.get(cache_key)
+        if frame is not None:
+            self.frames.move_to_end(cache_key)
+            return frame
+        return self._build(cache_key, source, step * 360.0 / steps)
+
+    def prebuild(self, key: Hashable, source: pygame.Surface, steps: int) -> None:
+        """Build every variant of a sprite now (at load) instead of on first use."""
+        for step in range(1, steps):
+            cache_key = (key, steps, step)
+            if cache_key not in self.frames:
+                self._build(cache_key, source, step * 360.0 / steps)
+
+    def _build(self, cache_key: Tuple[Any, int, int], source: pygame.Surface, angle: float) -> pygame.Surface:
+        frame = pygame.transform.rotozoom(source, angle, 1.0)
+        self.frames[cache_key] = frame
+        self.bytes += memory_report.surface_bytes(frame)
+        self.builds += 1
+        # Drop the least recently used variants over the budget (never the one just built)
+        while self.bytes > self.budget and len(self.frames) > 1:
+            _, evicted = self.frames.popitem(last=False)
+            self.bytes -= memory_report.surface_bytes(evicted)
+            self.evictions += 1
+        return frame
+
+    def clear(self) -> None:
+        """Drop every variant"""
+        self.frames.clear()
+        self.bytes = 0
@@ -0,0 +1,80 @@
+"""
+Startup helpers: time-to-first-menu-frame measurement and background preloading.
+
+Only the modules the main menu needs are imported before the first frame. The
+game stack (Core.Game.game and everything it pulls in) is imported on a
+background thread once the menu is on screen, so "New Game" does not pay the
+import cost either.
+"""
+
+import importlib
+import sys
+import threading
+import time
+from typing import Iterable, List, Optional
+from config import STARTUP
+
+_preload_thread: Optional[threading.Thread] = None
+
+
+def elapsed_ms(start_time: float) -> float:
+    """Milliseconds since a time.perf_counter() timestamp."""
+    return (time.perf_counter() - start_time) * 1000.0
+
+
+def get_eager_modules(modules: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    List the deferred modules that have already been imported.
+
+    Args:
+        modules: Module names to check (defaults to STARTUP['deferred_modules'])
+
+    Returns:
+        List[str]: Names of deferred modules found in sys.modules
+    """
+    modules = STARTUP['deferred_modules'] if modules is None else modules
+    return [name for name in modules if name in sys.modules]
+
+
+def _import_all(modules: List[str]) -> None:
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            # A failed preload is not fatal; the import is retried on first use
+            print(f"Error preloading {name}: {e}")
+
+
+def preload_in_background(modules: Optional[Iterable[str]] = None) -> None:
+    """
+    Import modules on a daemon thread. Only the first call starts a thread.
+
+    Args:
+        modules: Module names to import (defaults to STARTUP['preload_modules'])
+    """
+    global _preload_thread
+    if _preload_thread is not None:
+        return
+    modules = list(STARTUP['preload_modules'] if modules is None else modules)
+    _preload_thread = threading.Thread(target=_import_all, args=(modules,), name="preload", daemon=True)
+    _preload_thread.start()
+
+
+def check_budget(first_frame_ms: float, eager_modules: List[str]) -> bool:
+    """
+    Print the startup measurement and compare it with the configured budget.
+
+    Args:
+        first_frame_ms: Time from process start to the first presented menu frame
+        eager_modules: Deferred modules that were imported before the first frame
+
+    Returns:
+        bool: True if the startup is within budget and nothing was imported eagerly
+    """
+    budget = STARTUP['menu_frame_budget_ms']
+    within_budget = first_frame_ms <= budget
+    print(f"Time to first menu frame: {first_frame_ms:.1f} ms (budget {budget:.0f} ms)"
+          + ("" if within_budget else " - OVER BUDGET"))
+    if eager_modules:
+        print("Imported before the first frame but should be deferred: " + ", ".join(eager_modules))
+    return within_budget and not eager_modules
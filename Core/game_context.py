@@ -1,19 +1,65 @@
 import pygame
-from Core.Menu.main_menu import MainMenu
+from Core.Menu.main_menu import MainMenu, NEW_GAME
+from Core.screen_manager import ScreenManager
+from Core.UI.profiler_overlay import ProfilerOverlay
+from Core.Utils import instrumentation
+from Core.Utils import memory_report
+from config import INSTRUMENTATION, MEMORY_REPORT
+
+
+def create_credits(screen):
+    from Core.Credits.credits import CreditsScreen
+    return CreditsScreen(screen)
+
+
+def create_game(screen):
+    # Imported here so the game stack is not loaded before the first menu frame
+    from Core.Game.game import Game
+    return Game(screen)
 
 
 class GameContext:
     def __init__(self, screen):
         self.screen = screen
-        self.current_state_screen = MainMenu(screen)
+        # Screens are kept warm once built and suspended/resumed on every transition
+        self.screen_manager = ScreenManager(screen)
+        self.screen_manager.register('main_menu', MainMenu)
+        self.screen_manager.register('credits', create_credits)
+        self.screen_manager.register('game', create_game)
+        self.current_state_screen = self.screen_manager.switch('main_menu')
+        self.profiler_overlay = ProfilerOverlay()
+        self.trace_key = pygame.key.key_code(INSTRUMENTATION['trace_key'])
+        self.memory_report_key = pygame.key.key_code(MEMORY_REPORT['key'])
+        self.report_memory_on_transition = False  # Set by the --memory-report command line option
 
     def handle_events(self, event):
+        if self.profiler_overlay.handle_events(event):
+            return
+        if event.type == pygame.KEYDOWN and event.key == self.trace_key:
+            instrumentation.start_recording()
+            return
+        if event.type == pygame.KEYDOWN and event.key == self.memory_report_key:
+            memory_report.print_report()
+            return
         self.current_state_screen.handle_events(event)
 
+    @instrumentation.traced("GameContext.update")
     def update(self):
         next_screen = self.current_state_screen.update()
+        if next_screen == NEW_GAME:
+            # Matches are dropped when left (below), so this always builds a new one;
+            # the AssetCache still spares it the disk reads
+            next_screen = 'game'
         if next_screen:
-            self.current_state_screen = next_screen
+            left_game = self.screen_manager.current_name == 'game'
+            self.current_state_screen = self.screen_manager.switch(next_screen)
+            if left_game:
+                # Nothing resumes a match, so free it instead of keeping it suspended behind the menu
+                self.screen_manager.discard('game')
+            if self.report_memory_on_transition:
+                memory_report.print_report()
 
+    @instrumentation.traced("GameContext.render")
     def render(self):
-        self.current_state_screen.render()
\ No newline at end of file
+        self.current_state_screen.render()
+        self.profiler_overlay.render(self.screen)
@@ -0,0 +1,67 @@
+from typing import Any, Callable, Dict, Optional
+import pygame
+
+
+class ScreenManager:
+    """
+    Keeps one warm instance per named screen.
+
+    Screens return a screen name from update() to request a transition. The
+    current screen is suspended (not destroyed) and the target is resumed if it
+    already exists, or created through its registered factory on first use.
+    """
+
+    def __init__(self, screen: pygame.Surface):
+        self.screen = screen
+        self.factories: Dict[str, Callable[[pygame.Surface], Any]] = {}
+        self.screens: Dict[str, Any] = {}
+        self.current_name: Optional[str] = None
+        self.current: Optional[Any] = None
+
+    def register(self, name: str, factory: Callable[[pygame.Surface], Any]) -> None:
+        """
+        Register how to build a screen.
+
+        Args:
+            name: Name screens return to switch to it
+            factory: Callable taking the display surface and returning the screen
+        """
+        self.factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        """Get the instance of a screen, creating it on first use."""
+        instance = self.screens.get(name)
+        if instance is None:
+            instance = self.factories[name](self.screen)
+            self.screens[name] = instance
+        return instance
+
+    def switch(self, target: Any) -> Any:
+        """
+        Suspend the current screen and resume the target.
+
+        Args:
+            target: A registered screen name, or a screen instance (kept unnamed)
+
+        Returns:
+            The screen that is now current
+        """
+        if isinstance(target, str):
+            name, instance = target, self.get(target)
+        else:
+            name, instance = None, target
+
+        if instance is self.current:
+            return instance
+        if self.current is not None and hasattr(self.current, 'suspend'):
+            self.current.suspend()
+        self.current_name = name
+        self.current = instance
+        if hasattr(instance, 'resume'):
+            instance.resume()
+        return instance
+
+    def discard(self, name: str) -> None:
+        """Drop a suspended screen so the next switch builds it again."""
+        if name != self.current_name:
+            self.screens.pop(name, None)
@@ -4,11 +4,10 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import pygame
-import tkinter as tk
-from tkinter import filedialog
 import random
 from Core.Game.object_collection import ObjectCollection
-import tkinter.messagebox as messagebox
+from Core.Utils import instrumentation
+from config import INSTRUMENTATION
 import json
 
 # Main class for the map editor
@@ -804,6 +803,7 @@ class Editor:
                 all_surrounded = False  # Edge counts as accessible
         return all_surrounded
 
+    @instrumentation.traced("Editor.autotile", "editor")
     def update_map_area(self, map_x, map_y):
         # Find all connected water tiles and ensure they are surrounded by shores
         water_tiles = self.find_water_region(map_x, map_y)
@@ -1053,6 +1053,9 @@ class Editor:
     
     # --- File Operations ---
     def save_map(self):
+        # tkinter is only needed for the file dialogs, so it is imported on first use
+        import tkinter as tk
+        from tkinter import filedialog
         root = tk.Tk()
         root.withdraw()
         file_path = filedialog.asksaveasfilename(
@@ -1073,9 +1076,12 @@ class Editor:
                         f.write(line + '\n')
                     
                     # Write objects section
-                    f.write("#Objects: on format [x][y][type][id][health][z-index][damage]\n")
+                    f.write("#Objects: on format [x][y][type][id][health][z-index][damage], optionally followed by [faction]\n")
                     for obj in self.objects:
-                        f.write(f"[{obj['x']}][{obj['y']}][{obj['type']}][{obj['id']}][{obj['health']}][{obj['z_index']}][{obj['damage']}]\n")
+                        line = f"[{obj['x']}][{obj['y']}][{obj['type']}][{obj['id']}][{obj['health']}][{obj['z_index']}][{obj['damage']}]"
+                        if obj.get('faction') is not None:
+                            line += f"[{obj['faction']}]"
+                        f.write(line + "\n")
                         
                 print(f"Map saved successfully to {file_path}")
             except Exception as e:
@@ -1083,6 +1089,8 @@ class Editor:
         root.destroy()
 
     def load_map(self):
+        import tkinter as tk
+        from tkinter import filedialog
         root = tk.Tk()
         root.withdraw()
         file_path = filedialog.askopenfilename(
@@ -1167,6 +1175,7 @@ class Editor:
                         health = int(obj_data[4])
                         z_index = int(obj_data[5])
                         damage = int(obj_data[6]) if len(obj_data) > 6 else 0  # Default to 0 if damage not present
+                        faction = int(obj_data[7]) if len(obj_data) > 7 else None  # Kept as is when saving
                         
                         if 0 <= x < width and 0 <= y < height:
                             # Try to get the object in all sizes
@@ -1211,6 +1220,7 @@ class Editor:
                                     'offset': offset,
                                     'damage': damage,
                                     'name': metadata['name'],
+                                    'faction': faction,
                                     'charge_percent': 0  # Initialize charge percentage to 0
                                 })
                             else:
@@ -1487,12 +1497,16 @@ if __name__ == "__main__":
     pygame.display.set_caption("Map Editor")
     editor = Editor(screen)
     clock = pygame.time.Clock()
+    trace_key = pygame.key.key_code(INSTRUMENTATION['trace_key'])
     running = True
     
     while running:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.KEYDOWN and event.key == trace_key:
+                # Record the next frames (including auto-tiling spans) to a Chrome trace
+                instrumentation.start_recording()
             elif event.type == pygame.VIDEORESIZE:
                 # Handle window resize
                 screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
@@ -1501,6 +1515,7 @@ if __name__ == "__main__":
         editor.update()
         editor.render()
         pygame.display.flip()
+        instrumentation.end_frame()
         clock.tick(60)
     
     pygame.quit()
\ No newline at end of file
@@ -1,7 +1,43 @@
+import time
+startup_time = time.perf_counter()  # Taken before any other import for the time-to-first-frame measurement
+
 import pygame
 import sys
 import os
+import argparse
 from Core.game_context import GameContext
+from Core.Utils.frame_profiler import FrameProfiler
+from Core.Utils import instrumentation
+from Core.Utils import memory_report
+from Core.Utils import startup
+from config import RENDER_SCALE
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Beyond the Rings")
+    parser.add_argument("--trace", type=int, metavar="FRAMES",
+                        help="record the first FRAMES frames to a Chrome trace_event JSON file")
+    parser.add_argument("--trace-file", metavar="PATH",
+                        help="output path for --trace (default: timestamped file in the working directory)")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="print a surface memory report after every screen change and on exit")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print the time to the first menu frame")
+    parser.add_argument("--check-startup", action="store_true",
+                        help="exit after the first menu frame with status 1 if startup is over budget")
+    parser.add_argument("--render-scale", type=float, metavar="SCALE",
+                        help="render at SCALE times the display resolution and upscale (default: config.RENDER_SCALE)")
+    parser.add_argument("--render-mode", choices=["explicit", "scaled"],
+                        help="explicit: upscale the world only, UI at native resolution; "
+                             "scaled: upscale the whole frame with pygame.SCALED")
+    return parser.parse_args()
+
+args = parse_args()
+if args.render_scale is not None:
+    RENDER_SCALE['scale'] = min(1.0, max(0.1, args.render_scale))
+if args.render_mode:
+    RENDER_SCALE['mode'] = args.render_mode
 
 
 # Initialize Pygame
@@ -12,28 +48,54 @@ def is_debug_mode():
     # Check if a debugger is attached (will be True when running with debugger)
     return sys.gettrace() is not None
 
+def scaled_display_size(size):
+    """Internal resolution for the 'scaled' render mode, or None to render at native resolution"""
+    scale = RENDER_SCALE['scale']
+    if RENDER_SCALE['mode'] != 'scaled' or scale >= 1.0:
+        return None
+    return max(1, int(size[0] * scale)), max(1, int(size[1] * scale))
+
 # Screen configuration
 if is_debug_mode():
     # Windowed mode for debug
-    screen = pygame.display.set_mode((1024, 768))
+    internal_size = scaled_display_size((1024, 768))
+    if internal_size:
+        screen = pygame.display.set_mode(internal_size, pygame.SCALED)
+    else:
+        screen = pygame.display.set_mode((1024, 768))
     pygame.display.set_caption("Beyond the Rings (Debug Mode)")
 else:
     # Fullscreen for release
-    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    internal_size = scaled_display_size(pygame.display.get_desktop_sizes()[0])
+    if internal_size:
+        # SDL upscales the whole frame and maps mouse positions back to the internal resolution
+        screen = pygame.display.set_mode(internal_size, pygame.FULLSCREEN | pygame.SCALED)
+    else:
+        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
     pygame.display.set_caption("Beyond the Rings")
 
 game_context = GameContext(screen)
+profiler = FrameProfiler()
+
+if args.trace:
+    instrumentation.start_recording(args.trace, args.trace_file)
+if args.memory_report:
+    game_context.report_memory_on_transition = True
+    memory_report.print_report()
 
 # Main game function
 def main():
     # Main game loop
     running = True
+    first_frame = True
     while running:
         # Handle events
+        start_time = profiler.start()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             game_context.handle_events(event)
+        profiler.stop('events', start_time)
         
         # Update game state
         game_context.update()
@@ -42,9 +104,31 @@ def main():
         game_context.render()
         
         # Update the display
+        start_time = profiler.start()
         pygame.display.flip()
+        profiler.stop('display.update', start_time)
+
+        # Close the frame in the profiler ring buffers
+        profiler.end_frame()
+        instrumentation.end_frame()
+
+        if first_frame:
+            first_frame = False
+            first_frame_ms = startup.elapsed_ms(startup_time)
+            eager_modules = startup.get_eager_modules()
+            if args.check_startup:
+                within_budget = startup.check_budget(first_frame_ms, eager_modules)
+                pygame.quit()
+                sys.exit(0 if within_budget else 1)
+            if args.startup_report:
+                startup.check_budget(first_frame_ms, eager_modules)
+            # The menu is on screen: import the game stack while the player reads it
+            startup.preload_in_background()
     
     # Clean up
+    instrumentation.stop_recording()  # Save a partial trace if the game was closed early
+    if args.memory_report:
+        memory_report.print_report()
     pygame.quit()
     sys.exit()
 
@@ -65,6 +65,147 @@ VERTICAL_PANEL = {
     }
 }
 
+# Pathfinding settings
+PATHFINDING = {
+    'blocked_tiles': list(range(4, 20)),  # Water (4-5) and shore (6-19) tiles cannot be walked on
+    'max_expansions': 20000,  # A* gives up after expanding this many nodes
+    'unit_speed': 4.0,  # Tiles per second for units without a 'speed' property
+    'cluster_size': 16,  # Tiles per side of a hierarchical pathfinding cluster
+    'large_map_cluster_size': 32,  # Used instead on maps wider or taller than large_map_tiles
+    'large_map_tiles': 768,
+    'entrance_split': 6,  # Border openings at least this wide get two entrances instead of one
+    'heuristic_weight': 1.5,  # Abstract plans trade up to this factor of path length for fewer expansions
+    'flow_field_cache_size': 8,  # Flow fields kept for recent group move goals
+    'flow_field_max_passes': 4096,  # Upper bound on wavefront passes per flow field
+    'flow_field_min_group': 4,  # Groups at least this large move with a flow field instead of one search each
+    'request_budget_us': 2000,  # Time the path request scheduler may spend per tick
+    'request_metrics_window': 120  # Answered requests kept for the wait time metrics
+}
+
+# Steering settings (distances in tiles)
+STEERING = {
+    'separation_radius': 0.8,  # Moving units closer than this push each other apart
+    'separation_weight': 1.5,
+    'arrival_radius': 2.0,  # Units slow down within this distance of their goal
+    'min_arrival_speed': 0.35,  # Fraction of the top speed kept when arriving
+    'waypoint_radius': 0.3,  # A waypoint counts as reached within this distance
+    'hash_cell_size': 1.0,  # Cell size of the neighbour hash
+    'free_tile_radius': 3  # How far a unit arriving on an occupied tile looks for a free one
+}
+
+# Line of sight settings
+LINE_OF_SIGHT = {
+    'enabled': True,  # Attacks need a clear line between attacker and target
+    'opaque_tiles': [],  # Tile indices that block sight (water and shore only block movement)
+    'opaque_types': ['tree', 'building'],  # Object types whose footprints block sight
+    'cache_size': 65536  # Cached (source tile, target tile) results before the cache is dropped
+}
+
+# Fog of war settings (distances in tiles)
+FOG_OF_WAR = {
+    'enabled': True,
+    'unit_sight': 6,  # Sight radius of units without a "sight_range" property
+    'building_sight': 5,  # Same for buildings; never less than an object's attack range
+    'hidden_alpha': 255,  # Overlay opacity over tiles never seen
+    'explored_alpha': 150,  # Overlay opacity over explored tiles out of sight
+    'chunk_tiles': 8,  # Tiles per side of a cached overlay chunk
+    'cached_chunks': 48  # Overlay chunks kept (256 KB each with 32 px tiles)
+}
+
+# Combat settings (defaults for weapons whose properties leave them out)
+COMBAT = {
+    'cooldown': 1000,  # Milliseconds between shots
+    'damage': 1,
+    'projectile_speed': 10,  # Pixels per tick
+    'turn_rate': 8,  # Degrees per tick a homing projectile can turn ("turn_rate" property)
+    'projectile_lifetime': 240,  # Ticks before a projectile that hit nothing falls to the ground
+    'splash_falloff': 1.0,  # Splash damage fades from full at the impact to this much less at the edge
+    'splash_friendly_fire': False  # Splash hurts only objects hostile to the attacker
+}
+
+# Turret settings
+TURRETS = {
+    'angular_speed': 900  # Degrees per second turrets turn without a "turret_speed" property
+}
+
+# Rotated sprite cache settings
+ROTATION_CACHE = {
+    'budget_mb': 16.0,  # Rotated variants kept before the least recently used are dropped
+    'missile_directions': 32  # Missile facings rotated from the single direction 0 sprite
+}
+
+# Render scale settings (--render-scale and --render-mode override them)
+RENDER_SCALE = {
+    'scale': 1.0,  # Internal resolution as a fraction of the display resolution (1.0 renders at native)
+    # 'explicit': the world is drawn on an internal surface upscaled once per frame, the UI at native resolution
+    # 'scaled': the whole frame is drawn at the internal resolution and pygame.SCALED upscales it
+    'mode': 'explicit',
+    'smooth': False  # Bilinear upscale (smoothscale, several times slower) instead of nearest neighbour in explicit mode
+}
+
+# Economy settings
+ECONOMY = {
+    'income_period_ms': 1000,  # Ore processors pay their profit rate once per period
+    'history_ticks': 300  # Income ticks kept per faction for the UI and AI players
+}
+
+# Automatic targeting settings (buildings with "auto_target" in their properties)
+TARGETING = {
+    'stagger_ticks': 6,  # Idle towers are spread over this many ticks when searching for targets
+    # Target rules, highest priority first: 'attacking' (units and buildings firing or
+    # walking to attack), 'unit', 'building'. Ties go to the closest, then the weakest target
+    'priorities': ['attacking', 'unit', 'building']
+}
+
+# Startup settings
+STARTUP = {
+    'menu_frame_budget_ms': 1500,  # Budget from process start to the first main menu frame
+    # Modules that must not be imported before the first menu frame
+    'deferred_modules': ['Core.Game.game', 'Core.UI.panel', 'Core.UI.minimap',
+                         'Core.Game.unit', 'Core.Game.animation_manager', 'Core.Game.vertical_panel'],
+    # Modules imported on a background thread once the menu is on screen
+    'preload_modules': ['Core.Game.game']
+}
+
+# Frame profiler settings
+PROFILER = {
+    'buffer_frames': 600,  # Ring buffer length (10 seconds at 60 FPS)
+    'hud_window': 60,  # Frames averaged for the on-screen numbers
+    'toggle_key': 'f3',
+    'dump_key': 'f4',
+    'csv_prefix': 'frame_profile',
+    'bg_color': (0, 0, 0, 170),
+    'text_color': (230, 230, 230),
+    'header_color': (255, 220, 90),
+    'margin': 10,
+    'padding': 6
+}
+
+# Instrumentation settings (Chrome trace export)
+INSTRUMENTATION = {
+    'available': True,  # False removes the span wrappers entirely
+    'trace_frames': 300,  # Frames recorded by the hotkey when no count is given
+    'trace_key': 'f5',
+    'trace_prefix': 'trace'
+}
+
+# Memory report settings
+MEMORY_REPORT = {
+    'key': 'f6',
+    # Per asset type budgets in megabytes; types without an entry are reported without a budget
+    'budgets_mb': {
+        'terrain': 64.0,
+        'tiles': 1.0,
+        'minimap': 1.0,
+        'animations': 32.0,
+        'objects': 16.0,
+        'projectiles': 1.0,
+        'fog': 16.0,
+        'rotations': 16.0,
+        'ui': 32.0
+    }
+}
+
 # Cursor settings
 CURSOR_SIZE = 32
 CURSOR_TYPES = {
@@ -0,0 +1,162 @@
+from Core.Game.combat import CombatSystem, ENDED_NO_LINE_OF_SIGHT, ENDED_OUT_OF_RANGE
+from Core.Game.spatial_index import SpatialIndex
+
+
+class Sprite:
+    """Stand-in for an object image: the index only uses its size."""
+
+    def __init__(self, size):
+        self.size = size
+
+    def get_width(self):
+        return self.size
+
+    def get_height(self):
+        return self.size
+
+
+def make_object(x, y, faction, health=100):
+    return {'x': x, 'y': y, 'faction': faction, 'health': health, 'max_health': 100,
+            'turret_direction': 0, 'image': Sprite(32)}
+
+
+def make_combat(*objects):
+    index = SpatialIndex()
+    index.rebuild(objects)
+    return CombatSystem(index)
+
+
+def armed(combat, obj, **properties):
+    properties.setdefault('attack_range', 5)
+    properties.setdefault('cooldown', 1000)
+    properties.setdefault('damage', 10)
+    return combat.register(obj, {'properties': properties})
+
+
+def test_target_in_range_and_sight_gets_a_shot():
+    attacker, target = make_object(0, 0, 1), make_object(3, 4, 2)  # Exactly 5 tiles away
+    combat = make_combat(attacker, target)
+    weapon = armed(combat, attacker)
+    assert combat.engage(attacker, target, now=0)
+
+    ended, shots = combat.update(0, can_see=lambda a, b: True)
+    assert ended == []
+    assert shots == [(attacker, target, weapon)]
+
+    # Still cooling down after firing
+    combat.fired(attacker, 0)
+    assert combat.update(500, can_see=lambda a, b: True) == ([], [])
+    assert combat.update(1000, can_see=lambda a, b: True)[1] == [(attacker, target, weapon)]
+
+
+def test_target_out_of_range_ends_the_engagement():
+    attacker, target = make_object(0, 0, 1), make_object(4, 4, 2)  # sqrt(32) > 5 tiles
+    combat = make_combat(attacker, target)
+    armed(combat, attacker)
+    combat.engage(attacker, target, now=0)
+
+    ended, shots = combat.update(0)
+    assert ended == [(attacker, target, ENDED_OUT_OF_RANGE)]
+    assert shots == []
+    assert not combat.is_engaged(attacker)
+    assert len(combat) == 0
+
+
+def test_target_out_of_sight_ends_the_engagement():
+    attacker, target = make_object(0, 0, 1), make_object(2, 0, 2)
+    combat = make_combat(attacker, target)
+    armed(combat, attacker)
+    combat.engage(attacker, target, now=0)
+    checked = []
+
+    def blocked(a, b):
+        checked.append((a, b))
+        return False
+
+    ended, shots = combat.update(0, can_see=blocked)
+    assert checked == [(attacker, target)]
+    assert ended == [(attacker, target, ENDED_NO_LINE_OF_SIGHT)]
+    assert shots == []
+    assert not combat.is_engaged(attacker)
+
+
+def test_sight_is_only_checked_for_ready_shots():
+    attacker, target = make_object(0, 0, 1), make_object(2, 0, 2)
+    combat = make_combat(attacker, target)
+    armed(combat, attacker)
+    combat.engage(attacker, target, now=0)
+    combat.fired(attacker, 0)
+
+    def unexpected(a, b):
+        raise AssertionError("line of sight checked while cooling down")
+
+    assert combat.update(100, can_see=unexpected) == ([], [])
+    assert combat.is_engaged(attacker)
+
+
+def test_ending_one_engagement_keeps_the_others():
+    attackers = [make_object(0, y, 1) for y in range(3)]
+    targets = [make_object(2, 0, 2), make_object(9, 1, 2), make_object(2, 2, 2)]
+    combat = make_combat(*attackers, *targets)
+    for attacker, target in zip(attackers, targets):
+        armed(combat, attacker)
+        combat.engage(attacker, target, now=0)
+
+    ended, shots = combat.update(0)
+    assert ended == [(attackers[1], targets[1], ENDED_OUT_OF_RANGE)]
+    assert [(attacker, target) for attacker, target, _ in shots] == [(attackers[0], targets[0]),
+                                                                     (attackers[2], targets[2])]
+    # The last row was moved into the freed slot
+    assert combat.target_of(attackers[2]) is targets[2]
+    assert combat.target_of(attackers[1]) is None
+
+
+def impact_point(obj, tile_size=32):
+    """World pixel centre of an object's tile."""
+    return obj['x'] * tile_size + tile_size / 2, obj['y'] * tile_size + tile_size / 2
+
+
+def test_splash_falls_off_with_distance():
+    attacker, target = make_object(0, 5, 1), make_object(5, 5, 2)
+    near, far, outside = make_object(6, 5, 2), make_object(5, 7, 2), make_object(8, 5, 2)
+    combat = make_combat(attacker, target, near, far, outside)
+    weapon = armed(combat, attacker, attack_range=6, damage=20, splash_radius=2, splash_falloff=0.5)
+
+    combat.queue_impact(impact_point(target), 32, weapon, target, attacker)
+    combat.apply_damage()
+
+    assert target['health'] == 80  # Full damage
+    assert near['health'] == 85  # 1 tile away: 20 * (1 - 0.5 / 2)
+    assert far['health'] == 90  # At the edge: 20 * (1 - 0.5)
+    assert outside['health'] == 100
+    assert attacker['health'] == 100
+
+
+def test_splash_spares_friendly_and_indestructible_objects():
+    attacker, target = make_object(0, 5, 1), make_object(5, 5, 2)
+    friend, wall = make_object(6, 5, 1), make_object(5, 6, 2)
+    wall['max_health'] = -1
+    combat = make_combat(attacker, target, friend, wall)
+    weapon = armed(combat, attacker, attack_range=6, damage=20, splash_radius=2)
+
+    combat.queue_impact(impact_point(target), 32, weapon, target, attacker)
+    assert [hit for hit, _, _ in combat.damage_queue] == [target]
+    combat.apply_damage()
+    assert friend['health'] == 100
+    assert wall['health'] == 100
+
+
+def test_splash_and_direct_hits_kill_once():
+    attacker, first, second = make_object(0, 5, 1), make_object(5, 5, 2, health=30), make_object(6, 5, 2, health=15)
+    combat = make_combat(attacker, first, second)
+    weapon = armed(combat, attacker, attack_range=6, damage=20, splash_radius=2, splash_falloff=0.5)
+
+    # Two missiles land on the first target in the same tick; the second unit takes both splashes
+    combat.queue_impact(impact_point(first), 32, weapon, first, attacker)
+    combat.queue_impact(impact_point(first), 32, weapon, first, attacker)
+    killed = combat.apply_damage()
+
+    assert first['health'] == -10
+    assert second['health'] == -15
+    assert killed == [(first, attacker), (second, attacker)]
+    assert combat.apply_damage() == []
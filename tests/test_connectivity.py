@@ -0,0 +1,63 @@
+import random
+
+import numpy as np
+import pytest
+
+from Core.AI.connectivity import ConnectivityMap, NO_REGION, label_regions
+from Core.AI.pathfinding import PassabilityGrid
+
+
+class Sprite:
+    """Stand-in for an object image: footprints only use its width."""
+
+    def __init__(self, width):
+        self.width = width
+
+    def get_width(self):
+        return self.width
+
+
+def random_grid(size, density, rng):
+    map_data = [[4 if rng.random() < density else 0 for _ in range(size)] for _ in range(size)]
+    return PassabilityGrid.from_map(map_data)
+
+
+def assert_matches_fresh_labels(connectivity, grid):
+    """The map's regions must be exactly the regions labelled from scratch (ids may differ)."""
+    passable = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.height, grid.width).astype(bool)
+    expected, _ = label_regions(passable)
+    labels = connectivity.labels
+    assert np.array_equal(labels == NO_REGION, expected == NO_REGION)
+    pairs = np.unique(np.stack([labels[passable], expected[passable]]), axis=1)
+    # One to one: every region maps to exactly one fresh region and back
+    assert len(np.unique(pairs[0])) == len(np.unique(pairs[1])) == pairs.shape[1]
+
+
+@pytest.mark.parametrize('size, density', [(20, 0.35), (40, 0.4)])
+@pytest.mark.parametrize('seed', range(40))
+def test_footprint_changes_keep_regions_exact(size, density, seed):
+    rng = random.Random(seed)
+    grid = random_grid(size, density, rng)
+    connectivity = ConnectivityMap(grid)
+    objects = []
+    for _ in range(150):
+        if objects and rng.random() < 0.4:
+            grid.remove_footprint(objects.pop(rng.randrange(len(objects))))
+        else:
+            obj = {'x': rng.randrange(size), 'y': rng.randrange(size),
+                   'image': Sprite(rng.choice((32, 64, 128))), 'is_unit': False}
+            objects.append(obj)
+            grid.add_footprint(obj)
+        assert_matches_fresh_labels(connectivity, grid)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_terrain_changes_keep_regions_exact(seed):
+    rng = random.Random(seed)
+    size = 30
+    grid = random_grid(size, 0.35, rng)
+    connectivity = ConnectivityMap(grid)
+    for _ in range(200):
+        x, y = rng.randrange(size), rng.randrange(size)
+        grid.set_terrain(x, y, 0 if grid.terrain[y * size + x] == 0 else 4)
+        assert_matches_fresh_labels(connectivity, grid)
@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from Core.Game.economy import Economy, get_profit_rate
+
+FACTIONS = (0, 1, 2, 3)
+
+METADATA = {
+    'gold': {'properties': {'is_ore_gold': True, 'profit_rate': 5}},
+    'iron': {'properties': {'is_ore_iron': True, 'profit_rate': 3}},
+    'barracks': {'properties': {}},
+    'free': {'properties': {'is_ore_gold': True}},  # No profit rate
+}
+
+
+def make_object(rng):
+    kind = rng.choice(list(METADATA))
+    return {'type': rng.choice(('building', 'building', 'unit')), 'kind': kind,
+            'faction': rng.choice(FACTIONS), 'health': 100}
+
+
+def recomputed_income(objects):
+    """Income of every faction summed from scratch over the objects in the game."""
+    income = {faction: 0 for faction in FACTIONS}
+    for obj in objects:
+        if obj['health'] > 0:
+            income[obj['faction']] += get_profit_rate(obj, METADATA[obj['kind']])
+    return income
+
+
+def test_profit_rate():
+    building = {'type': 'building'}
+    assert get_profit_rate(building, METADATA['gold']) == 5
+    assert get_profit_rate(building, METADATA['iron']) == 3
+    assert get_profit_rate(building, METADATA['barracks']) == 0
+    assert get_profit_rate(building, None) == 0
+    assert get_profit_rate({'type': 'unit'}, METADATA['gold']) == 0
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_income_matches_recomputation_after_spawns_despawns_and_ownership_changes(seed):
+    rng = random.Random(seed)
+    economy = Economy(history_ticks=10)
+    objects = []
+    for _ in range(300):
+        action = rng.random()
+        if action < 0.4 or not objects:
+            obj = make_object(rng)
+            objects.append(obj)
+            economy.register(obj, METADATA[obj['kind']])
+        elif action < 0.65:
+            obj = objects.pop(rng.randrange(len(objects)))
+            obj['health'] = 0
+            economy.unregister(obj)
+            if rng.random() < 0.3:
+                economy.unregister(obj)  # Destroyed and converted in the same tick
+        else:
+            economy.set_faction(rng.choice(objects), rng.choice(FACTIONS))
+        expected = recomputed_income(objects)
+        assert {faction: economy.get_income(faction) for faction in FACTIONS} == expected
+
+    income = economy.tick()
+    assert {faction: income.get(faction, 0) for faction in FACTIONS} == recomputed_income(objects)
+
+
+def test_registering_twice_or_dead_objects_counts_nothing_extra():
+    economy = Economy()
+    mine = {'type': 'building', 'faction': 1, 'health': 100}
+    wreck = {'type': 'building', 'faction': 1, 'health': 0}
+    economy.register(mine, METADATA['gold'])
+    economy.register(mine, METADATA['gold'])
+    economy.register(wreck, METADATA['gold'])
+    assert economy.get_income(1) == 5
+
+
+def test_set_faction_moves_income():
+    economy = Economy()
+    mine = {'type': 'building', 'faction': 1, 'health': 100}
+    barracks = {'type': 'building', 'faction': 1, 'health': 100}
+    economy.register(mine, METADATA['iron'])
+    economy.register(barracks, METADATA['barracks'])
+
+    economy.set_faction(mine, 2)
+    economy.set_faction(barracks, 2)
+    assert mine['faction'] == barracks['faction'] == 2
+    assert (economy.get_income(1), economy.get_income(2)) == (0, 3)
+    economy.unregister(mine)
+    assert economy.get_income(2) == 0
+
+
+def test_history_keeps_the_last_ticks():
+    economy = Economy(history_ticks=3)
+    mine = {'type': 'building', 'faction': 1, 'health': 100}
+    economy.register(mine, METADATA['gold'])
+    for _ in range(2):
+        economy.tick()
+    economy.set_faction(mine, 2)
+    for _ in range(2):
+        economy.tick()
+    assert economy.get_history(1) == [5, 0, 0]
+    assert economy.get_history(2) == [5, 5]
+    assert economy.get_history(3) == []
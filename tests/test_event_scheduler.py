@@ -0,0 +1,99 @@
+from Core.Game.event_scheduler import EventScheduler, clear_cooldown, get_charge, start_cooldown
+
+
+def recorder():
+    log = []
+    return log, lambda *args: log.append(args)
+
+
+def test_events_run_in_due_order_then_scheduling_order():
+    scheduler = EventScheduler()
+    log, record = recorder()
+    scheduler.schedule(300, record, 'c')
+    scheduler.schedule(100, record, 'a')
+    scheduler.schedule(200, record, 'b1')
+    scheduler.schedule(200, record, 'b2')
+    scheduler.schedule(500, record, 'later')
+
+    assert scheduler.run_due(50) == 0
+    assert scheduler.run_due(300) == 4
+    assert log == [('a',), ('b1',), ('b2',), ('c',)]
+    assert scheduler.last_run == 4
+    assert len(scheduler) == 1
+
+
+def test_cancelled_events_never_run():
+    scheduler = EventScheduler()
+    log, record = recorder()
+    kept = scheduler.schedule(100, record, 'kept')
+    dropped = scheduler.schedule(100, record, 'dropped')
+    repeating = scheduler.schedule_every(100, 100, record, 'repeating')
+    dropped.cancel()
+
+    assert scheduler.run_due(100) == 2
+    repeating.cancel()
+    assert scheduler.run_due(1000) == 0
+    assert log == [('kept',), ('repeating',)]
+    assert not kept.cancelled
+    assert len(scheduler) == 0
+
+
+def test_callback_can_cancel_a_later_event():
+    scheduler = EventScheduler()
+    log, record = recorder()
+    later = scheduler.schedule(200, record, 'later')
+    scheduler.schedule(100, later.cancel)
+
+    assert scheduler.run_due(300) == 1
+    assert log == []
+
+
+def test_repeating_event_is_rescheduled_every_period():
+    scheduler = EventScheduler()
+    log, record = recorder()
+    event = scheduler.schedule_every(1000, 1000, record, 'income')
+
+    for now in (999, 1000, 1500, 2000, 2999, 3000):
+        scheduler.run_due(now)
+    assert len(log) == 3
+    assert event.due == 4000
+
+
+def test_repeating_event_that_fell_behind_runs_once_and_restarts_from_now():
+    scheduler = EventScheduler()
+    log, record = recorder()
+    event = scheduler.schedule_every(1000, 1000, record, 'income')
+
+    # Paused for several periods: one catch-up run, then a period from now
+    assert scheduler.run_due(5500) == 1
+    assert event.due == 6500
+    assert scheduler.run_due(6499) == 0
+    assert scheduler.run_due(6500) == 1
+    assert len(log) == 2
+
+
+def test_events_scheduled_by_a_callback_run_when_due():
+    scheduler = EventScheduler()
+    log, record = recorder()
+
+    def chain(now):
+        record('first')
+        scheduler.schedule(now, record, 'same tick')
+        scheduler.schedule(now + 100, record, 'next')
+
+    scheduler.schedule(100, chain, 100)
+    assert scheduler.run_due(100) == 2
+    assert log == [('first',), ('same tick',)]
+    scheduler.run_due(200)
+    assert log[-1] == ('next',)
+
+
+def test_cooldown_charge():
+    obj = {}
+    assert get_charge(obj, 0) == 1.0
+    start_cooldown(obj, 1000, 400)
+    assert get_charge(obj, 1000) == 0.0
+    assert get_charge(obj, 1100) == 0.25
+    assert get_charge(obj, 5000) == 1.0
+    clear_cooldown(obj)
+    assert get_charge(obj, 1100) == 1.0
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from Core.AI.hierarchical_pathfinding import HierarchicalPathFinder
+from Core.AI.pathfinding import PassabilityGrid
+
+
+def random_grid(size, density, rng):
+    map_data = [[4 if rng.random() < density else 0 for _ in range(size)] for _ in range(size)]
+    return PassabilityGrid.from_map(map_data)
+
+
+def walk(grid, plan, start):
+    """Follow a plan hop by hop, checking every step like a walking unit would."""
+    x, y = start
+    while not plan.is_finished():
+        steps = plan.next_steps()
+        assert steps is not None
+        for nx, ny in steps:
+            assert grid.is_passable(nx, ny)
+            assert max(abs(nx - x), abs(ny - y)) == 1
+            if nx != x and ny != y:
+                # No squeezing diagonally between two blocked tiles
+                assert grid.is_passable(nx, y) and grid.is_passable(x, ny)
+            x, y = nx, ny
+    return x, y
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_refined_plans_never_cut_corners(seed):
+    rng = random.Random(seed)
+    size = 64
+    grid = random_grid(size, 0.25, rng)
+    finder = HierarchicalPathFinder(grid, cluster_size=16)
+    walkable = [(x, y) for y in range(size) for x in range(size) if grid.is_passable(x, y)]
+    for _ in range(60):
+        start, goal = rng.choice(walkable), rng.choice(walkable)
+        plan = finder.find_path(start, goal)
+        if plan is not None:
+            assert walk(grid, plan, start) == plan.goal
+
+
+def test_same_cluster_plan_keeps_its_search():
+    grid = PassabilityGrid(32, 32)
+    finder = HierarchicalPathFinder(grid, cluster_size=16)
+    plan = finder.find_path((1, 1), (6, 3))
+    assert plan.waypoints == [(1, 1), (6, 3)]
+    assert plan.first_steps is not None
+    assert walk(grid, plan, (1, 1)) == (6, 3)
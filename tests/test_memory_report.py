@@ -0,0 +1,74 @@
+import pygame
+import pytest
+
+from Core.Utils import memory_report
+
+
+class Holder:
+    """Owner of registered attributes (registrations keep only a weak reference to it)."""
+
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+def surface(size):
+    return pygame.Surface((size, size), pygame.SRCALPHA)
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    monkeypatch.setattr(memory_report, '_registry', [])
+
+
+def test_bytes_per_cache_asset_type_and_object_type():
+    tree, unit, tile, button = surface(32), surface(64), surface(16), surface(8)
+    shared = Holder(images={'tree.png': tree, 'button.png': button})
+    objects = Holder(sprites={'tree_1': tree, 'unit_0': unit})
+    tiles = Holder(tiles=[tile, tile, tile.subsurface((0, 0, 8, 8))])
+
+    # The shared cache is registered first but must only keep what no owner cache holds
+    memory_report.register('Assets.images', shared, 'images', 'ui', shared=True)
+    memory_report.register('Objects.sprites', objects, 'sprites', 'objects',
+                           type_of=lambda key: key.split('_')[0])
+    memory_report.register('Game.tiles', tiles, 'tiles', 'tiles')
+    report = memory_report.collect()
+
+    # Totals are [bytes, surfaces]
+    caches = {cache['name']: (cache['surfaces'], cache['bytes']) for cache in report['caches']}
+    tree_bytes, unit_bytes = memory_report.surface_bytes(tree), memory_report.surface_bytes(unit)
+    tile_bytes, button_bytes = memory_report.surface_bytes(tile), memory_report.surface_bytes(button)
+    assert tree_bytes == 32 * 32 * 4
+    assert caches['Objects.sprites'] == (2, tree_bytes + unit_bytes)
+    # Same tile twice counts once; the subsurface shares its parent's pixels
+    assert caches['Game.tiles'] == (2, tile_bytes)
+    assert caches['Assets.images'] == (1, button_bytes)
+
+    assert report['asset_types'] == {'objects': [tree_bytes + unit_bytes, 2], 'tiles': [tile_bytes, 2],
+                                     'ui': [button_bytes, 1]}
+    assert report['object_types'] == {'tree': [tree_bytes, 1], 'unit': [unit_bytes, 1]}
+    assert report['total'] == tree_bytes + unit_bytes + tile_bytes + button_bytes
+
+
+def test_shared_surface_counted_once_under_its_owner_type():
+    sprite = surface(64)
+    first = Holder(frames={'building3_a_static_0': [sprite]})
+    second = Holder(frames={'building3_b_static_0': [sprite]})
+    assets = Holder(images={'x': sprite})
+    memory_report.register('Assets.images', assets, 'images', 'ui', shared=True)
+    memory_report.register('First.frames', first, 'frames', 'animations',
+                           type_of=memory_report.animation_object_type)
+    memory_report.register('Second.frames', second, 'frames', 'animations',
+                           type_of=memory_report.animation_object_type)
+    report = memory_report.collect()
+
+    sprite_bytes = memory_report.surface_bytes(sprite)
+    assert report['asset_types'] == {'animations': [sprite_bytes, 1], 'ui': [0, 0]}
+    assert report['object_types'] == {'building': [sprite_bytes, 1]}
+    assert report['total'] == sprite_bytes
+
+
+def test_collected_owners_are_dropped():
+    memory_report.register('Gone.images', Holder(images=[surface(32)]), 'images', 'ui')
+    report = memory_report.collect()
+    assert report['caches'] == []
+    assert report['total'] == 0
@@ -0,0 +1,120 @@
+import pytest
+
+from Core.Game.projectiles import ProjectileSystem, segment_hits_box
+from Core.Game.spatial_index import SpatialIndex
+
+
+class Sprite:
+    """Stand-in for an object image: the index and footprints only use its size."""
+
+    def __init__(self, size):
+        self.size = size
+
+    def get_width(self):
+        return self.size
+
+    def get_height(self):
+        return self.size
+
+
+class Missile:
+    """The attributes ProjectileSystem reads and writes on a missile."""
+
+    def __init__(self, position, target_position, speed, target=None, origin=None):
+        self.position = list(position)
+        self.target_position = target_position
+        self.speed = speed
+        self.target = target
+        self.origin = origin
+        self.angle = 0.0
+        self.orientation = 0
+        self.finished = False
+
+
+def make_object(x, y, faction, health=100):
+    return {'x': x, 'y': y, 'faction': faction, 'health': health, 'max_health': 100, 'image': Sprite(32)}
+
+
+def make_system(*objects):
+    index = SpatialIndex()
+    index.rebuild(objects)
+    return ProjectileSystem(index)
+
+
+def locate(obj):
+    return obj['x'], obj['y']
+
+
+def centre(x, y):
+    return x * 32 + 16, y * 32 + 16
+
+
+def test_segment_hits_box():
+    assert segment_hits_box(0, 0, 100, 0, 40, -5, 60, 5) == pytest.approx(0.4)
+    assert segment_hits_box(50, 0, 100, 0, 40, -5, 60, 5) == 0.0  # Starts inside
+    assert segment_hits_box(0, 10, 100, 10, 40, -5, 60, 5) is None
+    assert segment_hits_box(0, 0, 30, 0, 40, -5, 60, 5) is None  # Stops short
+
+
+def test_fast_missile_hits_a_target_it_crosses_between_ticks():
+    shooter, target = make_object(0, 0, 1), make_object(4, 0, 2)
+    system = make_system(shooter, target)
+    # 200 px per tick: the missile is at x=16 before the tick and x=216 after it, both clear of
+    # the target's box (128-160), and its aim point lies beyond the target
+    missile = Missile(centre(0, 0), centre(20, 0), 200, target, shooter)
+    system.add(missile)
+
+    impacts = system.step(locate)
+    assert len(impacts) == 1
+    hit_missile, hit, point = impacts[0]
+    assert hit_missile is missile and hit is target
+    assert point == pytest.approx((128, 16))
+    assert missile.finished
+    assert missile.position == pytest.approx([128, 16])
+    assert len(system) == 0
+
+
+def test_missile_hits_the_first_hostile_object_on_its_way():
+    shooter, target = make_object(0, 0, 1), make_object(8, 0, 2)
+    friend, enemy = make_object(2, 0, 1), make_object(5, 0, 2)
+    system = make_system(shooter, target, friend, enemy)
+    missile = Missile(centre(0, 0), centre(8, 0), 300, target, shooter)
+    system.add(missile)
+
+    # The friendly unit is flown through, the hostile one in front of the target is hit
+    (_, hit, point), = system.step(locate)
+    assert hit is enemy
+    assert point == pytest.approx((160, 16))
+
+
+def test_missile_that_misses_lands_on_its_aim_point():
+    shooter, target = make_object(0, 0, 1), make_object(4, 0, 2)
+    system = make_system(shooter, target)
+    missile = Missile(centre(0, 0), centre(4, 2), 50, target, shooter)
+    system.add(missile)
+    target['x'], target['y'] = 9, 9  # Walked away; a straight missile keeps its aim point
+    system.spatial_index.move(target)
+
+    impacts = []
+    for _ in range(10):
+        impacts += system.step(locate)
+    assert impacts == [(missile, None, pytest.approx(centre(4, 2)))]
+    assert len(system) == 0
+
+
+def test_homing_missile_follows_its_target():
+    shooter, target = make_object(0, 0, 1), make_object(6, 0, 2)
+    system = make_system(shooter, target)
+    missile = Missile(centre(0, 0), centre(6, 0), 16, target, shooter)
+    system.add(missile, homing=True, turn_rate=45)
+    system.step(locate)
+    target['y'] = 3
+    system.spatial_index.move(target)
+
+    for _ in range(40):
+        impacts = system.step(locate)
+        if impacts:
+            break
+    (hit_missile, hit, (x, y)), = impacts
+    assert hit_missile is missile and hit is target
+    assert 6 * 32 <= x <= 7 * 32 and 3 * 32 <= y <= 4 * 32
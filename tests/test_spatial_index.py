@@ -0,0 +1,112 @@
+import random
+
+import pytest
+
+from Core.Game.spatial_index import SpatialIndex
+
+TILE_SIZE = 32
+MAP_TILES = 60
+
+
+class Sprite:
+    """Stand-in for an object image: the index only uses its size."""
+
+    def __init__(self, size):
+        self.size = size
+
+    def get_width(self):
+        return self.size
+
+    def get_height(self):
+        return self.size
+
+
+def make_object(rng):
+    size = rng.choice((32, 64, 128))
+    # Same offsets as the objects the game loads from a map
+    return {'x': rng.randrange(MAP_TILES), 'y': rng.randrange(MAP_TILES), 'image': Sprite(size),
+            'offset': 64 if size == 128 else 32, 'faction': rng.randrange(3)}
+
+
+def sprite_tiles(obj):
+    """Tiles covered by an object's sprite, worked out from its pixel rectangle."""
+    size = obj['image'].size
+    left = obj['x'] * TILE_SIZE + TILE_SIZE // 2 - obj['offset']
+    top = obj['y'] * TILE_SIZE + TILE_SIZE // 2 - obj['offset']
+    return left // TILE_SIZE, top // TILE_SIZE, (left + size - 1) // TILE_SIZE, (top + size - 1) // TILE_SIZE
+
+
+def overlaps(tiles, rect):
+    return tiles[0] <= rect[2] and tiles[2] >= rect[0] and tiles[1] <= rect[3] and tiles[3] >= rect[1]
+
+
+def distance_sq(obj, x, y):
+    return (obj['x'] - x) ** 2 + (obj['y'] - y) ** 2
+
+
+def ids(objects):
+    return sorted(id(obj) for obj in objects)
+
+
+def random_index(seed):
+    """An index built from random objects, then changed by random moves, removals and inserts."""
+    rng = random.Random(seed)
+    objects = [make_object(rng) for _ in range(150)]
+    index = SpatialIndex(TILE_SIZE, 128)
+    index.rebuild(objects)
+    for _ in range(100):
+        action = rng.random()
+        if action < 0.6:
+            obj = rng.choice(objects)
+            obj['x'] = min(MAP_TILES - 1, max(0, obj['x'] + rng.randint(-6, 6)))
+            obj['y'] = min(MAP_TILES - 1, max(0, obj['y'] + rng.randint(-6, 6)))
+            index.move(obj)
+        elif action < 0.8:
+            obj = objects.pop(rng.randrange(len(objects)))
+            index.remove(obj)
+        else:
+            obj = make_object(rng)
+            objects.append(obj)
+            index.insert(obj)
+    assert len(index) == len(objects)
+    return index, objects, rng
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_query_rect_matches_brute_force(seed):
+    index, objects, rng = random_index(seed)
+    for _ in range(50):
+        min_x, min_y = rng.randrange(-4, MAP_TILES), rng.randrange(-4, MAP_TILES)
+        max_x, max_y = min_x + rng.randrange(12), min_y + rng.randrange(12)
+        expected = [obj for obj in objects if overlaps(sprite_tiles(obj), (min_x, min_y, max_x, max_y))]
+        assert ids(index.query_rect(min_x, min_y, max_x, max_y)) == ids(expected)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_query_radius_matches_brute_force(seed):
+    index, objects, rng = random_index(seed)
+    for _ in range(50):
+        x, y = rng.uniform(-2, MAP_TILES + 2), rng.uniform(-2, MAP_TILES + 2)
+        radius = rng.uniform(0, 15)
+        expected = [obj for obj in objects if distance_sq(obj, x, y) <= radius * radius]
+        assert ids(index.query_radius(x, y, radius)) == ids(expected)
+        filtered = [obj for obj in expected if obj['faction'] == 1]
+        assert ids(index.query_radius(x, y, radius, lambda obj: obj['faction'] == 1)) == ids(filtered)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_nearest_matches_brute_force(seed):
+    index, objects, rng = random_index(seed)
+    for _ in range(50):
+        x, y = rng.uniform(-10, MAP_TILES + 10), rng.uniform(-10, MAP_TILES + 10)
+        k = rng.choice((1, 3, 8, 40))
+        found = index.nearest(x, y, k)
+        expected = sorted(distance_sq(obj, x, y) for obj in objects)[:k]
+        # Ties may come out in any order, so compare distances
+        assert [distance_sq(obj, x, y) for obj in found] == expected
+        assert len(set(map(id, found))) == len(found)
+
+        max_distance = rng.uniform(1, 10)
+        found = index.nearest(x, y, k, max_distance=max_distance)
+        assert [distance_sq(obj, x, y) for obj in found] == [
+            distance for distance in expected if distance <= max_distance * max_distance]
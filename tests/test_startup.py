@@ -0,0 +1,22 @@
+import os
+import re
+import subprocess
+import sys
+
+from config import STARTUP
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_first_menu_frame_within_budget():
+    # A fresh interpreter: what is imported before the first frame is process-wide state
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy')
+    result = subprocess.run([sys.executable, 'beyond_the_rings.py', '--check-startup'], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=120)
+    output = result.stdout + result.stderr
+
+    match = re.search(r"Time to first menu frame: ([\d.]+) ms", output)
+    assert match, output
+    assert float(match.group(1)) <= STARTUP['menu_frame_budget_ms'], output
+    assert "should be deferred" not in output, output
+    assert result.returncode == 0, output